@@ -0,0 +1 @@
+# Leere __init__.py-Datei für das benchmarks-Modul
@@ -0,0 +1,123 @@
+"""
+Benchmark für die Inaktivitätsprüfung
+
+Vergleicht den früheren 10-Sekunden-Scan über alle Kanäle mit dem Fristen-Heap
+(core.deadline_scheduler). Der Scan kostet pro Durchlauf O(Kanäle), unabhängig davon,
+ob irgendeine Frist abläuft; der Heap kostet pro Nachricht einen Dict-Zugriff und
+pro abgelaufener Frist O(log Kanäle). Hochgerechnet wird auf eine Stunde Laufzeit.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python -m benchmarks.bench_inactivity_scheduler --channels 10000 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from core.channel_state import ChannelState
+from core.deadline_scheduler import DeadlineScheduler
+
+SCAN_INTERVAL = 10  # Sekunden, Intervall des früheren Scans
+
+def build_states(count: int, rng: random.Random, now: float) -> Dict[int, ChannelState]:
+    """Erzeugt Kanäle mit gemischtem Status; Online-Kanäle hatten zuletzt vor bis zu 5 Minuten Aktivität"""
+    statuses = [BotStatus.ONLINE] * 8 + [BotStatus.PROBLEM, BotStatus.OFFLINE]
+    states = {}
+    for index in range(count):
+        state = ChannelState(rng.choice(statuses))
+        state.last_message_time = now - rng.uniform(0, 300)
+        states[10 ** 17 + index] = state
+    return states
+
+def scan_once(guild_channels: Dict[str, Dict[str, str]], states: Dict[int, ChannelState],
+              excluded: set, now: float) -> int:
+    """Nachbildung des früheren Scans (ohne Status-Updates): gibt die Anzahl fälliger Kanäle zurück"""
+    due = 0
+    for channels in guild_channels.values():
+        for log_channel_id in channels:
+            if log_channel_id in excluded:
+                continue
+            state = states.get(int(log_channel_id))
+            if not state or not state.status or state.status == BotStatus.OFFLINE:
+                continue
+            if state.status == BotStatus.PROBLEM:
+                if state.last_message_time and now - state.last_message_time < BotConstants.ACTIVITY_CHECK_THRESHOLD:
+                    if state.activity_start and now - state.activity_start >= BotConstants.ACTIVITY_CHECK_THRESHOLD:
+                        due += 1
+            elif state.last_message_time and now - state.last_message_time >= BotConstants.INACTIVITY_THRESHOLD:
+                due += 1
+    return due
+
+def bench(count: int, rate: float, seed: int):
+    rng = random.Random(seed)
+    now = time.time()
+    states = build_states(count, rng, now)
+    ids = list(states)
+    # 50 Kanäle pro Guild, wie guild_channels.json sie speichert
+    guild_channels = {}
+    for index, channel_id in enumerate(ids):
+        guild_channels.setdefault(str(index // 50), {})[str(channel_id)] = str(channel_id + 1)
+
+    # Früherer Scan
+    ticks = 20
+    start = time.perf_counter()
+    for _ in range(ticks):
+        scan_once(guild_channels, states, set(), now)
+    scan_tick = (time.perf_counter() - start) / ticks
+    scan_hour = scan_tick * 3600 / SCAN_INTERVAL
+
+    # Fristen-Heap: initiales Planen
+    scheduler = DeadlineScheduler(callback=None)
+    online = [channel_id for channel_id in ids if states[channel_id].status == BotStatus.ONLINE]
+    start = time.perf_counter()
+    for channel_id in online:
+        scheduler.schedule(channel_id, states[channel_id].last_message_time + BotConstants.INACTIVITY_THRESHOLD)
+    arm_duration = time.perf_counter() - start
+
+    # Re-Arm bei Nachrichteneingang (Frist liegt später als die geplante)
+    samples = [rng.choice(online) for _ in range(200000)]
+    start = time.perf_counter()
+    for channel_id in samples:
+        scheduler.schedule(channel_id, now + BotConstants.INACTIVITY_THRESHOLD)
+    rearm_per_message = (time.perf_counter() - start) / len(samples)
+
+    # Ablauf aller Fristen inkl. Neuplanung (so verhält sich der Callback bei weiter aktiven Kanälen)
+    expire_at = now + BotConstants.INACTIVITY_THRESHOLD
+    start = time.perf_counter()
+    due = scheduler.pop_due(expire_at)
+    for channel_id in due:
+        scheduler.schedule(channel_id, expire_at + BotConstants.INACTIVITY_THRESHOLD)
+    expire_per_deadline = (time.perf_counter() - start) / max(1, len(due))
+
+    messages_per_hour = len(online) * rate * 60
+    # Aktive Kanäle: höchstens eine Frist pro Schwelle und Kanal
+    expiries_per_hour = len(online) * 3600 / BotConstants.INACTIVITY_THRESHOLD
+    heap_hour = messages_per_hour * rearm_per_message + expiries_per_hour * expire_per_deadline
+
+    print(f"Kanäle: {count} ({len(online)} online), {rate:g} Nachricht(en)/Minute pro Online-Kanal")
+    print(f"  Scan alle {SCAN_INTERVAL}s:      {scan_tick * 1000:8.2f} ms/Durchlauf  "
+          f"{scan_hour:8.2f} s CPU/Stunde  Verzögerung bis {SCAN_INTERVAL}s")
+    print(f"  Fristen-Heap:         {arm_duration * 1000:8.2f} ms initial     "
+          f"{heap_hour:8.2f} s CPU/Stunde  Verzögerung ~0s")
+    print(f"    Re-Arm pro Nachricht {rearm_per_message * 1e9:6.0f} ns, "
+          f"Ablauf pro Frist {expire_per_deadline * 1e6:6.2f} µs, Heap-Einträge {len(scheduler._heap)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Inaktivitätsprüfung")
+    parser.add_argument("--channels", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--rate", type=float, default=1.0, help="Nachrichten pro Minute und Online-Kanal")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for count in args.channels:
+        bench(count, args.rate, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark für die Nachrichten-Normalisierung
+
+Misst, wie viele Bytes die Mustererkennung pro Nachricht durchsucht, mit und
+ohne vorgeschaltete Normalisierung, auf synthetischen Discord-Log-Nachrichten
+(ANSI-Farben, Code-Blöcke, Zeitstempel, Markdown). Bots wiederholen dieselben
+Zeilen ständig, nur mit neuem Zeitstempel; die Zeilen werden daher aus einem
+begrenzten Vorrat gezogen und die Trefferquote des Zeilen-Caches mitgemessen.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python -m benchmarks.bench_message_normalizer --messages 100000
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.constants import BotConstants
+from utils.message_normalizer import MessageNormalizer
+from utils.status_patterns import StatusPatterns
+from benchmarks.bench_status_patterns import build_corpus
+
+ANSI_COLORS = ["\x1b[32m", "\x1b[33m", "\x1b[31m", "\x1b[1;34m"]
+ANSI_RESET = "\x1b[0m"
+
+def wrap_message(rng: random.Random, lines: List[str]) -> str:
+    """Verpackt Log-Zeilen so, wie Bots sie typischerweise in Discord posten"""
+    rendered = []
+    for line in lines:
+        timestamp = f"2024-06-01 12:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d}"
+        color = rng.choice(ANSI_COLORS)
+        if rng.random() < 0.5:
+            rendered.append(f"{color}{timestamp}{ANSI_RESET} {line}")
+        else:
+            rendered.append(f"[{timestamp[11:19]}] **{line}**")
+    body = "\n".join(rendered)
+    return f"```ansi\n{body}\n```" if rng.random() < 0.7 else f"> {body}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Nachrichten-Normalisierung")
+    parser.add_argument("--messages", type=int, default=100000, help="Anzahl synthetischer Nachrichten")
+    parser.add_argument("--hit-rate", type=float, default=0.05, help="Anteil der Zeilen mit Statusmuster")
+    parser.add_argument("--distinct", type=int, default=2000, help="Anzahl unterschiedlicher Log-Zeilen")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(args.seed)
+    patterns = StatusPatterns()
+    pool = build_corpus(patterns, args.distinct, args.hit_rate, args.seed)
+    messages = [wrap_message(rng, rng.sample(pool, rng.randint(1, 3))) for _ in range(args.messages)]
+    normalizer = MessageNormalizer(BotConstants.MESSAGE_MAX_LENGTH)
+
+    raw_bytes = sum(len(message.strip().lower().encode("utf-8")) for message in messages)
+    normalized = [normalizer.normalize(message) for message in messages]
+    normalized_bytes = sum(len(text.encode("utf-8")) for text in normalized)
+
+    print(f"Nachrichten: {len(messages)}")
+    print(f"Bytes pro Nachricht ohne Normalisierung: {raw_bytes / len(messages):8.1f}")
+    print(f"Bytes pro Nachricht mit Normalisierung:  {normalized_bytes / len(messages):8.1f} "
+          f"({1 - normalized_bytes / raw_bytes:.0%} weniger)")
+
+    # Frische Matcher mit Standard-Cachegröße
+    raw_matcher = StatusPatterns()
+    start = time.perf_counter()
+    raw_results = [raw_matcher.check_patterns(message) for message in messages]
+    raw_duration = time.perf_counter() - start
+
+    normalized_matcher = StatusPatterns()
+    start = time.perf_counter()
+    normalized_results = [
+        normalized_matcher.check_patterns(normalizer.normalize(message), normalized=True)
+        for message in messages
+    ]
+    normalized_duration = time.perf_counter() - start
+
+    mismatches = sum(1 for raw, norm in zip(raw_results, normalized_results) if raw != norm)
+    for label, duration, matcher in (
+        ("Ohne Normalisierung", raw_duration, raw_matcher),
+        ("Normalisierung + Matcher", normalized_duration, normalized_matcher),
+    ):
+        info = matcher.cache_info()
+        hit_rate = info["hits"] / (info["hits"] + info["misses"])
+        print(f"{label:<28} {duration:8.3f}s  {duration / len(messages) * 1e6:7.2f} µs/Nachricht  "
+              f"Zeilen-Cache {hit_rate:.0%}")
+    print(f"Abweichende Klassifizierungen: {mismatches}")
+
+if __name__ == "__main__":
+    main()
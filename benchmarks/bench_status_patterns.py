@@ -0,0 +1,113 @@
+"""
+Benchmark für die Statusmuster-Erkennung
+
+Vergleicht die ursprüngliche Schleife (ein re.search pro Muster) mit dem
+kompilierten StatusPatterns-Matcher samt Literal-Vorfilter auf einem
+synthetischen Log-Korpus.
+
+Zusätzlich wird die Stapelklassifizierung (classify_many) gemessen, wie sie
+für Backfill und das Nachspielen exportierter Logs verwendet wird.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python -m benchmarks.bench_status_patterns --lines 200000 --hit-rate 0.05
+    python -m benchmarks.bench_status_patterns --lines 500000 --channels 200 --processes 4
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bot_status import BotStatus
+from utils.status_patterns import StatusPatterns
+
+FILLER_WORDS = [
+    "Trade", "code", "queue", "position", "user", "Pokemon", "Raid", "Den", "Link",
+    "waiting", "for", "trainer", "sending", "offer", "received", "Shiny", "Level",
+    "Ball", "OT", "TID", "SID", "Nickname", "ready", "searching", "seed", "frame",
+]
+PREFIXES = ["[INFO]", "[DEBUG]", "[SysBot]", "[RaidBot]", "2024-06-01 12:00:00"]
+
+def legacy_check_patterns(patterns: StatusPatterns, content: str) -> Optional[BotStatus]:
+    """Ursprüngliche Implementierung: jedes Muster einzeln per re.search"""
+    if not content:
+        return None
+    content = content.lower()
+    for pattern in patterns.offline:
+        if re.search(pattern.lower(), content, re.IGNORECASE):
+            return BotStatus.OFFLINE
+    for pattern in patterns.error:
+        if re.search(pattern.lower(), content, re.IGNORECASE):
+            return BotStatus.PROBLEM
+    for pattern in patterns.online:
+        if re.search(pattern.lower(), content, re.IGNORECASE):
+            return BotStatus.ONLINE
+    return None
+
+def build_corpus(patterns: StatusPatterns, lines: int, hit_rate: float, seed: int) -> List[str]:
+    """Erzeugt Log-Zeilen, von denen etwa hit_rate ein Statusmuster enthalten"""
+    rng = random.Random(seed)
+    keywords = [p.replace(r'\b', '') for p in patterns.offline + patterns.error + patterns.online]
+    corpus = []
+    for _ in range(lines):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(4, 20))]
+        if rng.random() < hit_rate:
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        corpus.append(f"{rng.choice(PREFIXES)} {' '.join(words)}")
+    return corpus
+
+def measure(label: str, func, corpus: List[str]) -> float:
+    start = time.perf_counter()
+    for line in corpus:
+        func(line)
+    duration = time.perf_counter() - start
+    print(f"{label:<28} {duration:8.3f}s  {duration / len(corpus) * 1e6:7.2f} µs/Zeile")
+    return duration
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Statusmuster-Erkennung")
+    parser.add_argument("--lines", type=int, default=200000, help="Anzahl synthetischer Log-Zeilen")
+    parser.add_argument("--hit-rate", type=float, default=0.05, help="Anteil der Zeilen mit Statusmuster")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--channels", type=int, default=50, help="Anzahl Channels für die Stapelklassifizierung")
+    parser.add_argument("--processes", type=int, default=None, help="Worker-Prozesse für die Stapelklassifizierung")
+    args = parser.parse_args()
+
+    # Treffer-Logs würden die Messung dominieren
+    logging.disable(logging.CRITICAL)
+
+    patterns = StatusPatterns()
+    corpus = build_corpus(patterns, args.lines, args.hit_rate, args.seed)
+
+    mismatches = sum(1 for line in corpus if legacy_check_patterns(patterns, line) != patterns.check_patterns(line))
+    print(f"Korpus: {len(corpus)} Zeilen, Trefferquote {args.hit_rate:.0%}, Abweichungen: {mismatches}")
+    print(f"Vorfilter-Verfahren: {patterns._prefilter.backend}")
+
+    legacy = measure("Schleife (re.search)", lambda line: legacy_check_patterns(patterns, line), corpus)
+    compiled = measure("Vorfilter + Matcher", patterns.check_patterns, corpus)
+    print(f"Beschleunigung: {legacy / compiled:.1f}x")
+
+    # Stapelklassifizierung mit frischem Matcher (ohne vorbefüllten Zeilen-Cache)
+    rng = random.Random(args.seed)
+    messages = [(rng.randrange(args.channels), line) for line in corpus]
+    expected = {}
+    for channel, line in messages:
+        status = legacy_check_patterns(patterns, line)
+        if status is not None:
+            expected[channel] = status
+
+    start = time.perf_counter()
+    results = StatusPatterns().classify_many(messages, processes=args.processes)
+    duration = time.perf_counter() - start
+    print(f"{'classify_many':<28} {duration:8.3f}s  {len(messages) / duration:,.0f} Zeilen/s "
+          f"({len(results)} von {args.channels} Channels mit Status, Abweichungen: "
+          f"{sum(1 for channel in expected if results.get(channel) != expected[channel])})")
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,26 @@ class AdminCommands(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(name="setassetchannel")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def set_asset_channel(self, interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None):
+        """Setzt den Channel, in den die Status-GIFs einmalig hochgeladen werden (ohne Channel: deaktivieren)"""
+        try:
+            self.bot.message_manager.assets.set_channel(channel.id if channel else None)
+
+            if channel:
+                message = f"✅ Status-GIFs werden nun einmalig in {channel.mention} hochgeladen und per URL eingebunden"
+            else:
+                message = "✅ Asset-Channel entfernt, Status-GIFs werden wieder direkt angehängt"
+            await interaction.response.send_message(message, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error setting asset channel: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Es gab einen Fehler beim Setzen des Asset Channels",
+                ephemeral=True
+            )
+
     @app_commands.command(name="toggle")
     @app_commands.checks.has_permissions(administrator=True)
     @app_commands.choices(status=[
@@ -69,6 +89,8 @@ class AdminCommands(commands.Cog):
                     new_status = BotStatus[status.value.upper()]
                     
                 reason = f"Manueller Toggle durch {interaction.user.name} ({interaction.user.id})"
+                # Manuelle Wechsel umgehen die Flap-Dämpfung und ersetzen einen zurückgehaltenen Status
+                self.bot.status_manager.cancel_deferred(int(log_channel_id))
                 await self.bot.status_manager.update_status(log_channel_id, new_status, reason)
                 await interaction.followup.send(
                     f"✅ Status erfolgreich auf `{new_status.value}` geändert.",
@@ -151,6 +173,47 @@ class AdminCommands(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(name="transitionstats")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def transition_stats(self, interaction: discord.Interaction):
+        """Zeigt die Laufzeiten der Status-Updates an"""
+        try:
+            stats = self.bot.status_manager.transition_stats
+            wall, serial = stats.averages()
+
+            embed = discord.Embed(
+                title="⏱️ Status-Update-Latenz",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            embed.add_field(
+                name="Übergänge",
+                value=f"**Anzahl:** {stats.transitions}\n"
+                      f"**Ø parallel:** {wall:.2f}s\n"
+                      f"**Ø seriell (Summe):** {serial:.2f}s\n"
+                      f"**Max:** {stats.max_wall_seconds:.2f}s",
+                inline=False
+            )
+
+            lines = [
+                f"`{name}` Ø {seconds:.2f}s, {runs}x" + (f", {timeouts} Timeouts" if timeouts else "") + (f", {errors} Fehler" if errors else "")
+                for name, runs, seconds, timeouts, errors in stats.effect_summary()
+            ]
+            embed.add_field(
+                name="Schritte",
+                value="\n".join(lines) if lines else "Noch keine Status-Updates erfasst",
+                inline=False
+            )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error in transition stats command: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Fehler beim Abrufen der Status-Update-Statistik.",
+                ephemeral=True
+            )
+
     @app_commands.command(name="logstats", description="Zeigt Log-Datei-Statistiken an")
     @app_commands.describe()
     async def log_stats(self, interaction: discord.Interaction):
@@ -4,6 +4,7 @@ from typing import Optional
 import logging
 from discord.ext import commands
 from bot_status import BotStatus
+from config.constants import BotConstants
 
 logger = logging.getLogger('StatusBot')
 
@@ -68,9 +69,7 @@ class ChannelCommands(commands.Cog):
             update_channel_id = self.bot.channel_manager.remove_channel_pair(guild_id, str(log_channel.id))
             
             if update_channel_id:
-                if str(log_channel.id) in self.bot.status_manager.last_known_status:
-                    del self.bot.status_manager.last_known_status[str(log_channel.id)]
-                    self.bot.data_manager.save_json(self.bot.status_manager.last_known_status, "last_known_status.json")
+                self.bot.status_manager.remove_channel(log_channel.id)
                 
                 await interaction.response.send_message(
                     f"✅ Kanäle entfernt:\nLog-Kanal: {log_channel.mention}\nUpdate-Kanal: <#{update_channel_id}>"
@@ -82,6 +81,50 @@ class ChannelCommands(commands.Cog):
             logger.error(f"Error removing channels: {e}", exc_info=True)
             await interaction.response.send_message("❌ Es gab einen Fehler beim Entfernen der Kanäle.")
 
+    @app_commands.command(name="backfill")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def backfill(
+        self,
+        interaction: discord.Interaction,
+        log_channel: discord.TextChannel,
+        limit: Optional[int] = 1000
+    ):
+        """
+        Ermittelt den Status eines Log-Kanals aus dem Nachrichtenverlauf neu
+
+        Parameters
+        ----------
+        log_channel : Der zu prüfende Log-Kanal
+        limit : Anzahl der zu lesenden Nachrichten (Standard: 1000)
+        """
+        try:
+            guild_id = str(interaction.guild_id)
+            if not self.bot.channel_manager.get_update_channel(guild_id, str(log_channel.id)):
+                await interaction.response.send_message(f"⚠️ Keine Konfiguration für {log_channel.mention} gefunden.")
+                return
+
+            # Das Lesen des Verlaufs kann einige Sekunden dauern
+            await interaction.response.defer()
+
+            limit = max(1, min(limit or 1000, BotConstants.BACKFILL_MAX_MESSAGES))
+            status = await self.bot.status_manager.backfill_status(guild_id, log_channel, limit)
+
+            if status:
+                await interaction.followup.send(
+                    f"✅ Status von {log_channel.mention} aus den letzten {limit} Nachrichten ermittelt: **{status.value}**"
+                )
+            else:
+                await interaction.followup.send(
+                    f"ℹ️ In den letzten {limit} Nachrichten von {log_channel.mention} wurde kein Statusmuster gefunden."
+                )
+
+        except Exception as e:
+            logger.error(f"Error during backfill: {e}", exc_info=True)
+            if interaction.response.is_done():
+                await interaction.followup.send("❌ Es gab einen Fehler beim Auswerten des Verlaufs.")
+            else:
+                await interaction.response.send_message("❌ Es gab einen Fehler beim Auswerten des Verlaufs.")
+
     @app_commands.command(name="exclude")
     @app_commands.checks.has_permissions(administrator=True)
     async def exclude_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
@@ -110,6 +153,52 @@ class ChannelCommands(commands.Cog):
             logger.error(f"Error including channel: {e}", exc_info=True)
             await interaction.response.send_message("❌ Fehler beim Hinzufügen des Kanals.")
 
+    @app_commands.command(name="setthresholds")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def set_thresholds(
+        self,
+        interaction: discord.Interaction,
+        log_channel: discord.TextChannel,
+        inactivity: Optional[int] = None,
+        recovery: Optional[int] = None
+    ):
+        """
+        Setzt die Inaktivitäts- und Erholungsschwelle eines Log-Kanals
+
+        Parameters
+        ----------
+        log_channel : Der Log-Kanal
+        inactivity : Sekunden ohne Nachricht bis zum Problem-Status (0 = Standard)
+        recovery : Sekunden kontinuierlicher Aktivität bis zum Online-Status (0 = Standard)
+        """
+        try:
+            guild_id = str(interaction.guild_id)
+            log_channel_id = str(log_channel.id)
+            if not self.bot.channel_manager.get_update_channel(guild_id, log_channel_id):
+                await interaction.response.send_message(
+                    f"⚠️ Keine Konfiguration für {log_channel.mention} gefunden.",
+                    ephemeral=True
+                )
+                return
+
+            if any(value is not None and value < 0 for value in (inactivity, recovery)):
+                await interaction.response.send_message("⚠️ Schwellen dürfen nicht negativ sein.", ephemeral=True)
+                return
+
+            inactivity_threshold, recovery_threshold = self.bot.channel_manager.set_channel_thresholds(
+                guild_id, log_channel_id, inactivity, recovery
+            )
+            await interaction.response.send_message(
+                f"✅ Schwellen für {log_channel.mention}:\n"
+                f"Inaktivität: {inactivity_threshold}s\n"
+                f"Erholung: {recovery_threshold}s",
+                ephemeral=True
+            )
+
+        except Exception as e:
+            logger.error(f"Error setting thresholds: {e}", exc_info=True)
+            await interaction.response.send_message("❌ Fehler beim Setzen der Schwellen.", ephemeral=True)
+
     @app_commands.command(name="listchannels")
     @app_commands.checks.has_permissions(administrator=True)
     async def list_channels(self, interaction: discord.Interaction):
@@ -128,10 +217,19 @@ class ChannelCommands(commands.Cog):
             for pair in channel_pairs:
                 log_id = pair['log_channel']
                 update_id = pair['update_channel']
-                status = self.bot.status_manager.last_known_status.get(log_id, "unbekannt")
+                known_status = self.bot.status_manager.get_status(int(log_id))
+                status = known_status.value if known_status else "unbekannt"
                 owner_id = self.bot.channel_manager.get_channel_owner(guild_id, log_id)
                 owner_info = f" (Owner: <@{owner_id}>)" if owner_id else ""
-                status_info += f"Log: <#{log_id}> → Update: <#{update_id}> (Status: {status}){owner_info}\n"
+                threshold_info = ""
+                learned = self.bot.status_manager.learned_threshold(int(log_id))
+                if self.bot.channel_manager.has_custom_thresholds(guild_id, log_id) or learned is not None:
+                    inactivity = self.bot.status_manager.get_inactivity_threshold(int(log_id))
+                    _, recovery = self.bot.channel_manager.get_thresholds(int(log_id))
+                    learned_info = "" if self.bot.channel_manager.get_inactivity_override(int(log_id)) or learned is None else " gelernt"
+                    threshold_info = f" [Schwellen: {inactivity:.0f}s{learned_info}/{recovery}s]"
+                flapping_info = " ⚠️ instabil" if self.bot.status_manager.is_flapping(int(log_id)) else ""
+                status_info += f"Log: <#{log_id}> → Update: <#{update_id}> (Status: {status}{flapping_info}){owner_info}{threshold_info}\n"
             
             embed.add_field(
                 name="Eingerichtete Kanalpaare",
@@ -0,0 +1,244 @@
+import discord
+from discord import app_commands
+from typing import Optional
+import logging
+from discord.ext import commands
+from config.constants import BotConstants
+from utils.pattern_safety import admit_pattern
+
+logger = logging.getLogger('StatusBot')
+
+CATEGORY_CHOICES = [
+    app_commands.Choice(name="Offline", value="offline"),
+    app_commands.Choice(name="Fehler", value="error"),
+    app_commands.Choice(name="Online", value="online")
+]
+
+CATEGORY_LABELS = {
+    "offline": "❌ Offline",
+    "error": "❗ Fehler",
+    "online": "✅ Online"
+}
+
+class PatternCommands(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    def _scope_text(self, log_channel: Optional[discord.TextChannel]) -> str:
+        return f"Log-Kanal {log_channel.mention}" if log_channel else "diesen Server"
+
+    @app_commands.command(name="addpattern")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.choices(category=CATEGORY_CHOICES)
+    async def add_pattern(
+        self,
+        interaction: discord.Interaction,
+        category: app_commands.Choice[str],
+        pattern: str,
+        log_channel: Optional[discord.TextChannel] = None
+    ):
+        """
+        Fügt ein Statusmuster für den Server oder einen Log-Kanal hinzu
+
+        Parameters
+        ----------
+        category : Status, der bei einem Treffer gesetzt wird
+        pattern : Regulärer Ausdruck (Groß-/Kleinschreibung wird ignoriert, wird vor der Aktivierung auf Backtracking geprüft)
+        log_channel : Nur für diesen Log-Kanal (optional, sonst für den ganzen Server)
+        """
+        try:
+            # Die Prüfung startet einen eigenen Prozess und kann etwas dauern
+            await interaction.response.defer(ephemeral=True)
+
+            problem = await admit_pattern(
+                pattern,
+                BotConstants.PATTERN_MAX_LENGTH,
+                BotConstants.PATTERN_BENCHMARK_INPUT_LENGTH,
+                BotConstants.PATTERN_ADMISSION_BUDGET_MS / 1000,
+                BotConstants.PATTERN_ADMISSION_TIMEOUT
+            )
+            if problem:
+                await interaction.followup.send(f"⚠️ Muster `{pattern}` abgelehnt: {problem}", ephemeral=True)
+                return
+
+            guild_id = str(interaction.guild_id)
+            channel_id = str(log_channel.id) if log_channel else None
+
+            if self.bot.pattern_manager.add_pattern(guild_id, category.value, pattern, channel_id):
+                await interaction.followup.send(
+                    f"✅ Muster `{pattern}` ({category.name}) für {self._scope_text(log_channel)} hinzugefügt.",
+                    ephemeral=True
+                )
+            else:
+                await interaction.followup.send(
+                    f"ℹ️ Das Muster `{pattern}` ist für {self._scope_text(log_channel)} bereits aktiv.",
+                    ephemeral=True
+                )
+
+        except Exception as e:
+            logger.error(f"Error adding pattern: {e}", exc_info=True)
+            await interaction.followup.send(
+                "❌ Es gab einen Fehler beim Hinzufügen des Musters.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="removepattern")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.choices(category=CATEGORY_CHOICES)
+    async def remove_pattern(
+        self,
+        interaction: discord.Interaction,
+        category: app_commands.Choice[str],
+        pattern: str,
+        log_channel: Optional[discord.TextChannel] = None
+    ):
+        """Entfernt ein Statusmuster für den Server oder einen Log-Kanal"""
+        try:
+            guild_id = str(interaction.guild_id)
+            channel_id = str(log_channel.id) if log_channel else None
+
+            if self.bot.pattern_manager.remove_pattern(guild_id, category.value, pattern, channel_id):
+                await interaction.response.send_message(
+                    f"✅ Muster `{pattern}` ({category.name}) für {self._scope_text(log_channel)} entfernt.",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    f"ℹ️ Das Muster `{pattern}` ist für {self._scope_text(log_channel)} nicht aktiv.",
+                    ephemeral=True
+                )
+
+        except Exception as e:
+            logger.error(f"Error removing pattern: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Es gab einen Fehler beim Entfernen des Musters.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="resetpatterns")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def reset_patterns(self, interaction: discord.Interaction, log_channel: Optional[discord.TextChannel] = None):
+        """Setzt die Statusmuster des Servers oder eines Log-Kanals auf die geerbten Muster zurück"""
+        try:
+            guild_id = str(interaction.guild_id)
+            channel_id = str(log_channel.id) if log_channel else None
+
+            if self.bot.pattern_manager.reset_patterns(guild_id, channel_id):
+                await interaction.response.send_message(
+                    f"✅ Eigene Muster für {self._scope_text(log_channel)} entfernt.",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    f"ℹ️ Für {self._scope_text(log_channel)} sind keine eigenen Muster konfiguriert.",
+                    ephemeral=True
+                )
+
+        except Exception as e:
+            logger.error(f"Error resetting patterns: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Es gab einen Fehler beim Zurücksetzen der Muster.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="listpatterns")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def list_patterns(self, interaction: discord.Interaction, log_channel: Optional[discord.TextChannel] = None):
+        """Zeigt die aktiven Statusmuster des Servers oder eines Log-Kanals an"""
+        try:
+            guild_id = str(interaction.guild_id)
+            channel_id = str(log_channel.id) if log_channel else None
+            resolved = self.bot.pattern_manager.resolve(guild_id, channel_id)
+
+            embed = discord.Embed(
+                title="🔍 Aktive Statusmuster",
+                description=f"Muster für {self._scope_text(log_channel)}",
+                color=discord.Color.blue()
+            )
+
+            for category, patterns in resolved.items():
+                value = "\n".join(f"• `{pattern}`" for pattern in patterns) or "Keine Muster"
+                embed.add_field(name=CATEGORY_LABELS[category], value=value[:1024], inline=False)
+
+            if channel_id and self.bot.pattern_manager.is_quarantined(guild_id, channel_id):
+                embed.add_field(
+                    name="⚠️ Deaktiviert",
+                    value="Dieses Musterset hat sein Zeitbudget überschritten, es gelten die Standard-Muster. "
+                          "Entferne das problematische Muster oder nutze `/resetpatterns`.",
+                    inline=False
+                )
+
+            cache_info = self.bot.pattern_manager.get_cache_info()
+            lookups = cache_info["line_hits"] + cache_info["line_misses"]
+            hit_rate = cache_info["line_hits"] / lookups if lookups else 0.0
+            embed.set_footer(
+                text=f"Zeilen-Cache: {cache_info['line_hits']} Treffer / {cache_info['line_misses']} Fehlzugriffe "
+                     f"({hit_rate:.1%}) • Kompilierte Mustersets: {cache_info['compiled']}/{cache_info['max_size']} "
+                     f"• Standard-Muster Version {cache_info['version']}"
+            )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error listing patterns: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Es gab einen Fehler beim Auflisten der Muster.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="patternstats")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def pattern_stats(self, interaction: discord.Interaction):
+        """Zeigt Trefferzahlen und mittlere Auswertungskosten der Statusmuster an"""
+        try:
+            pattern_manager = self.bot.pattern_manager
+            top_patterns = pattern_manager.stats.top(15)
+
+            embed = discord.Embed(
+                title="📊 Muster-Statistik",
+                description="Häufigste Statusmuster seit Beginn der Aufzeichnung",
+                color=discord.Color.blue(),
+                timestamp=discord.utils.utcnow()
+            )
+
+            if top_patterns:
+                lines = []
+                for key, hits, mean_cost in top_patterns:
+                    status, pattern = key.split(":", 1)
+                    lines.append(f"`{pattern}` ({status}): **{hits}** Treffer, Ø {mean_cost * 1e6:.1f} µs")
+                embed.add_field(name="Muster", value="\n".join(lines)[:1024], inline=False)
+            else:
+                embed.add_field(name="Muster", value="Noch keine Treffer erfasst", inline=False)
+
+            cache_info = pattern_manager.get_cache_info()
+            lookups = cache_info["line_hits"] + cache_info["line_misses"]
+            hit_rate = cache_info["line_hits"] / lookups if lookups else 0.0
+            embed.add_field(
+                name="Zeilen-Cache",
+                value=f"**{cache_info['line_hits']}** Treffer / **{cache_info['line_misses']}** Fehlzugriffe ({hit_rate:.1%})",
+                inline=True
+            )
+            embed.add_field(
+                name="Mustersets",
+                value=f"**{cache_info['compiled']}**/{cache_info['max_size']} kompiliert",
+                inline=True
+            )
+            embed.add_field(
+                name="Nachrichten",
+                value=f"**{self.bot.accepted_messages}** aus Log-Kanälen ausgewertet / "
+                      f"**{self.bot.dropped_messages}** verworfen",
+                inline=False
+            )
+            embed.set_footer(text="Die Reihenfolge innerhalb jeder Prioritätsstufe folgt der Trefferhäufigkeit")
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error showing pattern stats: {e}", exc_info=True)
+            await interaction.response.send_message(
+                "❌ Es gab einen Fehler beim Abrufen der Muster-Statistik.",
+                ephemeral=True
+            )
+
+async def setup(bot):
+    await bot.add_cog(PatternCommands(bot))
@@ -26,13 +26,17 @@ class HelpCommands(commands.Cog):
         
         admin_commands = (
             "• `/sethistory #channel` - Setzt den Kanal für Status-Verlauf\n"
+            "• `/setassetchannel [#channel]` - Setzt den Kanal, in den Status-GIFs einmalig hochgeladen werden\n"
             "• `/toggle <status>` - Ändert den Bot-Status manuell (online/offline/problem/wartung)\n"
             "• `/addchannels #log_channel #update_channel [@owner]` - Fügt Log- und Update-Kanal hinzu\n"
             "• `/removechannels #log_channel` - Entfernt Log- und zugehörigen Update-Kanal\n"
+            "• `/backfill #log_channel [limit]` - Ermittelt den Status aus dem Nachrichtenverlauf neu\n"
             "• `/exclude #channel` - Schließt einen Kanal vom Inaktivitäts-Check aus\n"
             "• `/include #channel` - Fügt einen Kanal wieder zum Inaktivitäts-Check hinzu\n"
+            "• `/setthresholds #log_channel [inactivity] [recovery]` - Setzt eigene Inaktivitäts-/Erholungsschwellen\n"
             "• `/listchannels` - Listet alle konfigurierten und ausgeschlossenen Kanäle auf\n"
             "• `/balancerstatus` - Zeigt den aktuellen Status des Token-Balancers an\n"
+            "• `/transitionstats` - Zeigt die Laufzeiten der Status-Updates an\n"
         )
         embed.add_field(name="Administrator Befehle", value=admin_commands, inline=False)
         
@@ -43,6 +47,15 @@ class HelpCommands(commands.Cog):
         )
         embed.add_field(name="Channel-Lock Befehle", value=lock_commands, inline=False)
         
+        pattern_commands = (
+            "• `/addpattern <kategorie> <muster> [#log_channel]` - Fügt ein Statusmuster hinzu\n"
+            "• `/removepattern <kategorie> <muster> [#log_channel]` - Entfernt ein Statusmuster\n"
+            "• `/resetpatterns [#log_channel]` - Setzt eigene Muster auf die geerbten zurück\n"
+            "• `/listpatterns [#log_channel]` - Zeigt die aktiven Statusmuster an\n"
+            "• `/patternstats` - Zeigt Trefferzahlen und Auswertungskosten der Muster an\n"
+        )
+        embed.add_field(name="Statusmuster Befehle", value=pattern_commands, inline=False)
+        
         await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
@@ -34,15 +34,56 @@ class BotConstants:
     COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', '!')
     ADMIN_USER_ID = int(os.getenv('ADMIN_USER_ID', '0'))  # 0 = nicht konfiguriert
     MAINTENANCE_EMOJI = "🟦"
+    USE_WEBHOOKS = os.getenv('USE_WEBHOOKS', 'false').lower() == 'true'  # Status- und History-Nachrichten über Channel-Webhooks senden
+    WEBHOOK_NAME = os.getenv('WEBHOOK_NAME', 'StatusBot')  # Name der vom Bot angelegten Webhooks
     
     # Rate-Limit-Einstellungen
     RATE_LIMIT_COOL_DOWN = int(os.getenv('RATE_LIMIT_COOL_DOWN', '60'))
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
     RETRY_DELAY = int(os.getenv('RETRY_DELAY', '1'))
+    RENAME_LIMIT = int(os.getenv('RENAME_LIMIT', '2'))  # Umbenennungen pro Channel und Zeitfenster (Discord-Limit)
+    RENAME_WINDOW = int(os.getenv('RENAME_WINDOW', '600'))  # Zeitfenster für Umbenennungen (Sekunden)
+    OVERWRITE_LIMIT = int(os.getenv('OVERWRITE_LIMIT', '10'))  # Berechtigungsänderungen pro Channel und Zeitfenster
+    OVERWRITE_WINDOW = int(os.getenv('OVERWRITE_WINDOW', '10'))  # Zeitfenster für Berechtigungsänderungen (Sekunden)
     
     # Zeitliche Konstanten
     INACTIVITY_THRESHOLD = int(os.getenv('INACTIVITY_THRESHOLD', '600'))  # 10 Minuten
     ACTIVITY_CHECK_THRESHOLD = int(os.getenv('ACTIVITY_CHECK_THRESHOLD', '120'))  # 2 Minuten
+    INGEST_WINDOW = float(os.getenv('INGEST_WINDOW', '1.0'))  # Sekunden, in denen Log-Nachrichten eines Channels gebündelt werden
+    INGEST_MAX_BATCH = int(os.getenv('INGEST_MAX_BATCH', '500'))  # Maximale Nachrichten pro Bündel (ältere werden verworfen)
+    DEADLINE_RETRY_DELAY = int(os.getenv('DEADLINE_RETRY_DELAY', '10'))  # Sekunden bis zum erneuten Versuch nach fehlgeschlagenem Update
+    FLAP_WINDOW = int(os.getenv('FLAP_WINDOW', '600'))  # Zeitfenster der Flap-Erkennung (Sekunden)
+    FLAP_LIMIT = int(os.getenv('FLAP_LIMIT', '3'))  # Automatische Wechsel im Zeitfenster, ab denen gedämpft wird (< 2 = aus)
+    FLAP_SETTLE = int(os.getenv('FLAP_SETTLE', '120'))  # Sekunden, die ein gedämpfter Zielstatus stabil sein muss
+    TRANSITION_EFFECT_TIMEOUT = int(os.getenv('TRANSITION_EFFECT_TIMEOUT', '30'))  # Sekunden pro Schritt eines Status-Updates (Nachricht, Channel mit Name und Lock, History)
+    HISTORY_FLUSH_DELAY = float(os.getenv('HISTORY_FLUSH_DELAY', '3'))  # Sekunden, in denen History-Einträge gesammelt werden
+    HISTORY_QUEUE_MAX = int(os.getenv('HISTORY_QUEUE_MAX', '200'))  # Wartende History-Einträge, darüber nur noch Zusammenfassung
+    ASSET_URL_REFRESH_MARGIN = int(os.getenv('ASSET_URL_REFRESH_MARGIN', '3600'))  # Sekunden vor Ablauf einer GIF-URL, ab denen sie erneuert wird
+    LEARNED_THRESHOLDS = os.getenv('LEARNED_THRESHOLDS', 'true').lower() == 'true'  # Inaktivitätsschwelle aus den Nachrichtenabständen lernen
+    LEARNED_THRESHOLD_QUANTILE = float(os.getenv('LEARNED_THRESHOLD_QUANTILE', '0.99'))  # Quantil der Nachrichtenabstände
+    LEARNED_THRESHOLD_FACTOR = float(os.getenv('LEARNED_THRESHOLD_FACTOR', '2.0'))  # Vielfaches von Quantil bzw. Mittelwert
+    LEARNED_THRESHOLD_ALPHA = float(os.getenv('LEARNED_THRESHOLD_ALPHA', '0.05'))  # Glättungsfaktor des gleitenden Mittelwerts
+    LEARNED_THRESHOLD_MIN_SAMPLES = int(os.getenv('LEARNED_THRESHOLD_MIN_SAMPLES', '50'))  # Abstände, bevor gelernt wird
+    LEARNED_THRESHOLD_MIN = int(os.getenv('LEARNED_THRESHOLD_MIN', '120'))  # Untergrenze der gelernten Schwelle (Sekunden)
+    LEARNED_THRESHOLD_MAX = int(os.getenv('LEARNED_THRESHOLD_MAX', '3600'))  # Obergrenze der gelernten Schwelle (Sekunden)
+    
+    # Mustererkennung
+    PATTERN_CACHE_SIZE = int(os.getenv('PATTERN_CACHE_SIZE', '128'))  # Kompilierte Mustersets im Cache
+    PATTERN_LINE_CACHE_SIZE = int(os.getenv('PATTERN_LINE_CACHE_SIZE', '4096'))  # Klassifizierte Log-Zeilen pro Musterset
+    PATTERN_STATS_INTERVAL = int(os.getenv('PATTERN_STATS_INTERVAL', '300'))  # Sekunden zwischen Sortierung/Speicherung der Muster-Statistik
+    PATTERN_MAX_LENGTH = int(os.getenv('PATTERN_MAX_LENGTH', '200'))  # Maximale Länge eigener Muster
+    PATTERN_BENCHMARK_INPUT_LENGTH = int(os.getenv('PATTERN_BENCHMARK_INPUT_LENGTH', '2000'))  # Länge der Worst-Case-Eingaben
+    PATTERN_ADMISSION_BUDGET_MS = int(os.getenv('PATTERN_ADMISSION_BUDGET_MS', '50'))  # Zeitbudget für den Worst-Case-Korpus
+    PATTERN_ADMISSION_TIMEOUT = int(os.getenv('PATTERN_ADMISSION_TIMEOUT', '5'))  # Sekunden bis zum Abbruch des Benchmarks
+    PATTERN_MATCH_BUDGET_MS = int(os.getenv('PATTERN_MATCH_BUDGET_MS', '500'))  # Zeitbudget pro Nachricht für eigene Mustersets
+    PATTERN_SANDBOX = os.getenv('PATTERN_SANDBOX', 'true').lower() == 'true'  # Eigene Mustersets im separaten Prozess auswerten
+    PATTERN_SANDBOX_WORKERS = int(os.getenv('PATTERN_SANDBOX_WORKERS', '2'))  # Worker-Prozesse der Sandbox
+    PATTERN_BACKFILL_TIMEOUT = int(os.getenv('PATTERN_BACKFILL_TIMEOUT', '30'))  # Sekunden für /backfill mit eigenen Mustersets in der Sandbox
+    PATTERN_RELOAD_INTERVAL = int(os.getenv('PATTERN_RELOAD_INTERVAL', '5'))  # Sekunden zwischen Prüfungen der Musterdatei
+    PATTERN_BATCH_CHUNK_SIZE = int(os.getenv('PATTERN_BATCH_CHUNK_SIZE', '5000'))  # Zeilen pro Block bei der Stapelklassifizierung
+    PATTERN_BATCH_PROCESS_THRESHOLD = int(os.getenv('PATTERN_BATCH_PROCESS_THRESHOLD', '1000000'))  # Ab dieser Zeilenzahl Worker-Prozesse nutzen
+    MESSAGE_MAX_LENGTH = int(os.getenv('MESSAGE_MAX_LENGTH', '2000'))  # Maximale Zeichen pro Nachricht für die Mustererkennung
+    BACKFILL_MAX_MESSAGES = int(os.getenv('BACKFILL_MAX_MESSAGES', '5000'))  # Obergrenze für /backfill
     
     # Log-Einstellungen
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
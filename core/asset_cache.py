@@ -0,0 +1,125 @@
+import discord
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from config.constants import BotConstants
+
+logger = logging.getLogger('StatusBot')
+
+ASSET_FILE = "status_assets.json"
+
+def url_expiry(url: str) -> Optional[float]:
+    """Ablaufzeit einer signierten Discord-CDN-URL (Parameter ex, hexadezimal), None wenn unbefristet"""
+    try:
+        values = parse_qs(urlparse(url).query).get("ex")
+        return float(int(values[0], 16)) if values else None
+    except (ValueError, IndexError):
+        return None
+
+class StatusAssetCache:
+    """
+    Lädt jedes Status-GIF einmal in einen Asset-Channel hoch und merkt sich die URL.
+
+    Embeds verweisen danach nur noch auf die URL, statt das GIF bei jedem Update erneut
+    hochzuladen. Signierte CDN-URLs laufen ab; kurz vorher wird die Asset-Nachricht neu
+    geladen (liefert eine frisch signierte URL), und nur wenn sie gelöscht wurde oder
+    sich die Datei geändert hat, wird erneut hochgeladen.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.channel_id: Optional[int] = None
+        # GIF-Name -> {"message_id": int, "url": str, "signature": [mtime_ns, size]}
+        self.assets: Dict[str, Dict] = {}
+        self._lock = asyncio.Lock()
+
+    def load_data(self):
+        data = self.bot.data_manager.load_json(ASSET_FILE)
+        self.channel_id = data.get("asset_channel")
+        self.assets = data.get("assets", {})
+        logger.info(f"Asset-Cache: Channel {self.channel_id}, {len(self.assets)} GIFs hochgeladen")
+
+    def _save(self):
+        try:
+            self.bot.data_manager.save_json({"asset_channel": self.channel_id, "assets": self.assets}, ASSET_FILE)
+        except Exception as e:
+            logger.error(f"Error saving status assets: {e}")
+
+    def set_channel(self, channel_id: Optional[int]):
+        """Setzt den Asset-Channel; bisherige Uploads werden verworfen"""
+        self.channel_id = channel_id
+        self.assets = {}
+        self._save()
+        logger.info(f"Asset-Channel gesetzt auf: {channel_id}")
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[list]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def _is_fresh(entry: Dict) -> bool:
+        expiry = url_expiry(entry["url"])
+        return expiry is None or time.time() < expiry - BotConstants.ASSET_URL_REFRESH_MARGIN
+
+    async def get_url(self, gif_path: Path) -> Optional[str]:
+        """
+        Gibt eine gültige URL für ein GIF zurück und lädt es bei Bedarf hoch.
+
+        Returns:
+            Optional[str]: URL oder None, wenn kein Asset-Channel gesetzt ist oder der Upload
+                           fehlschlägt (der Aufrufer hängt das GIF dann direkt an)
+        """
+        if not self.channel_id:
+            return None
+        signature = self._signature(gif_path)
+        if signature is None:
+            return None
+
+        name = gif_path.name
+        entry = self.assets.get(name)
+        if entry and entry["signature"] == signature and self._is_fresh(entry):
+            return entry["url"]
+
+        # Bei Massenausfällen wird jedes GIF trotzdem nur einmal hochgeladen
+        async with self._lock:
+            entry = self.assets.get(name)
+            if entry and entry["signature"] == signature and self._is_fresh(entry):
+                return entry["url"]
+
+            try:
+                channel = self.bot.get_channel(self.channel_id)
+                if not channel:
+                    logger.error(f"Asset-Channel {self.channel_id} nicht gefunden")
+                    return None
+
+                message = None
+                if entry and entry["signature"] == signature:
+                    # URL läuft ab: die Nachricht neu laden liefert eine frisch signierte URL
+                    try:
+                        message = await channel.fetch_message(entry["message_id"])
+                        logger.info(f"Asset-URL für {name} erneuert")
+                    except discord.NotFound:
+                        logger.warning(f"Asset-Nachricht für {name} wurde gelöscht, lade erneut hoch")
+
+                if message is None or not message.attachments:
+                    message = await channel.send(file=discord.File(str(gif_path)))
+                    logger.info(f"GIF {name} in Asset-Channel hochgeladen")
+
+                self.assets[name] = {
+                    "message_id": message.id,
+                    "url": message.attachments[0].url,
+                    "signature": signature
+                }
+                self._save()
+                return self.assets[name]["url"]
+
+            except Exception as e:
+                logger.error(f"Fehler beim Bereitstellen von {name} im Asset-Channel: {e}")
+                return None
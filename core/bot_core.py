@@ -1,7 +1,7 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Dict, Set, Optional
+from typing import Dict, FrozenSet, Set, Optional
 import logging
 import time
 import asyncio
@@ -17,6 +17,7 @@ from .message_manager import MessageManager
 from .channel_manager import ChannelManager
 from .channel_config import ChannelConfig
 from .channel_locker import ChannelLocker
+from .pattern_manager import PatternManager
 
 # Externe Module (aus dem Hauptverzeichnis und anderen Ordnern)
 from bot_status import BotStatus
@@ -49,10 +50,16 @@ class StatusBot(commands.Bot):
         self._message_manager = None
         self._channel_manager = None
         self._channel_locker = None
+        self._pattern_manager = None
         
         # State tracking (basics only)
         self.guild_channels: Dict[str, Dict[str, str]] = {}
         self.history_channel_id: Optional[int] = None
+
+        # Überwachte Log-Channels als int-Menge für den Vorfilter in on_message
+        self.monitored_channels: FrozenSet[int] = frozenset()
+        self.accepted_messages = 0
+        self.dropped_messages = 0
         
         # Tasks file path
         self.tasks_file = Path(BotConstants.DATA_DIR) / "json" / "helper_tasks.json"
@@ -95,6 +102,9 @@ class StatusBot(commands.Bot):
         if self._status_manager is None:
             logger.info("Initializing StatusManager")
             self._status_manager = StatusManager(self)
+            # Ohne geladene Status und laufenden Scheduler würden keine Inaktivitätsfristen ablaufen
+            self._status_manager.load_data()
+            self._status_manager.start_tasks()
         return self._status_manager
     
     @property  
@@ -102,6 +112,8 @@ class StatusBot(commands.Bot):
         if self._message_manager is None:
             logger.info("Initializing MessageManager")
             self._message_manager = MessageManager(self)
+            # Gespeicherte Status-Nachrichten werden beim ersten Update benötigt
+            self._message_manager.load_data()
         return self._message_manager
     
     @property
@@ -109,6 +121,8 @@ class StatusBot(commands.Bot):
         if self._channel_manager is None:
             logger.info("Initializing ChannelManager")
             self._channel_manager = ChannelManager(self)
+            # Ausschlüsse, Owner und Schwellen werden vom Inaktivitäts-Scheduler sofort benötigt
+            self._channel_manager.load_data()
         return self._channel_manager
     
     @property
@@ -118,11 +132,22 @@ class StatusBot(commands.Bot):
             self._channel_locker = ChannelLocker(self)
         return self._channel_locker
 
+    @property
+    def pattern_manager(self):
+        if self._pattern_manager is None:
+            logger.info("Initializing PatternManager")
+            self._pattern_manager = PatternManager(self)
+            # Wird erst bei der ersten Nachricht benötigt, daher hier direkt laden
+            self._pattern_manager.load_data()
+            self._pattern_manager.start_tasks()
+        return self._pattern_manager
+
     def load_data(self):
             """Load initial data"""
             # Lade Channel-Konfigurationen
             self.guild_channels = self.data_manager.load_json("guild_channels.json")
             logger.info(f"Geladene Guild-Channels: {len(self.guild_channels)} Guilds mit insgesamt {sum(len(channels) for channels in self.guild_channels.values())} Kanälen")
+            self.rebuild_monitored_channels()
             
             # Lade History Channel
             history_data = self.data_manager.load_json("history_channel.json")
@@ -136,6 +161,17 @@ class StatusBot(commands.Bot):
                 self.channel_manager.load_data()
             if self._channel_locker is not None:
                 self.channel_locker.load_data()
+            if self._pattern_manager is not None:
+                self.pattern_manager.load_data()
+
+    def rebuild_monitored_channels(self):
+        """Baut die Menge der überwachten Log-Channels neu auf (nach jeder Änderung an guild_channels)"""
+        self.monitored_channels = frozenset(
+            int(log_channel_id)
+            for channels in self.guild_channels.values()
+            for log_channel_id in channels
+        )
+        logger.debug(f"Überwachte Log-Channels: {len(self.monitored_channels)}")
 
     async def on_connect(self):
         """Called when the bot connects to Discord"""
@@ -198,9 +234,9 @@ class StatusBot(commands.Bot):
         # Dann lade Daten und starte Tasks
         self.load_data()
         
-        # Starte Tasks nur wenn Manager bereits initialisiert
-        if self._status_manager is not None:
-            self.status_manager.start_tasks()
+        # Der StatusManager wird hier direkt erzeugt, damit der Inaktivitäts-Scheduler
+        # auch ohne eingehende Nachricht läuft
+        self.status_manager.start_tasks()
         
         try:
             logger.info("Waiting for bot to be fully ready...")
@@ -260,8 +296,17 @@ class StatusBot(commands.Bot):
 
     async def on_message(self, message: discord.Message):
             """Handle incoming messages"""
-            # Verarbeite Commands
-            await self.process_commands(message)
+            # Prefix-Commands nur verarbeiten, wenn die Nachricht danach aussieht
+            # (get_prefix löst auch aufrufbare und mehrfache Präfixe auf)
+            prefix = await self.get_prefix(message)
+            if message.content.startswith(prefix if isinstance(prefix, str) else tuple(prefix)):
+                await self.process_commands(message)
+
+            # Nicht überwachte Channels kosten nur einen Set-Lookup
+            if message.channel.id not in self.monitored_channels:
+                self.dropped_messages += 1
+                return
+            self.accepted_messages += 1
 
             # Verarbeite Status-Updates
             await self.status_manager.process_message(message)
@@ -1,17 +1,33 @@
 import discord
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Union
 from bot_status import BotStatus
 import time
+from .rate_budget import retry_after_from
 
 logger = logging.getLogger('StatusBot')
 
+# Verwaltete Berechtigungen beim Sperren bzw. Entsperren
+LOCKED_PERMISSIONS = {
+    "send_messages": False,
+    "add_reactions": False,
+    "send_messages_in_threads": False,
+    "create_public_threads": False,
+    "create_private_threads": False,
+}
+UNLOCKED_PERMISSIONS = {
+    "send_messages": True,
+    "add_reactions": True,
+    "view_channel": True,
+    "read_message_history": True,
+    "attach_files": True,
+}
+
 class ChannelLocker:
     def __init__(self, bot):
         self.bot = bot
         self.locked_channels = {}  # Speichert die ursprünglichen Berechtigungen
         self.managed_roles = {}  # Dict[str, List[int]] - Channel ID -> Liste von Rollen-IDs
-        self._last_channel_lock_ratelimit = 0
 
     async def set_managed_roles(self, channel_id: str, role_ids: List[int]):
         """Setzt die zu verwaltenden Rollen für einen Channel"""
@@ -38,153 +54,113 @@ class ChannelLocker:
 
     async def update_channel_lock(self, channel: discord.TextChannel, status: BotStatus):
         """Aktualisiert den Lock-Status eines Channels basierend auf dem Bot-Status"""
+        budget = self.bot.channel_manager.rate_budget
         try:
-            # Prüfe auf vorherige Rate-Limits
-            last_ratelimit_time = getattr(self, '_last_channel_lock_ratelimit', 0)
-            if time.time() - last_ratelimit_time < 600:  # 10 Minuten
-                logger.warning(f"Vorbeugend delegiere Lock-Aufgabe an Helper-Bot wegen vorherigem Rate-Limit")
-                
-                # Managed Rollen abrufen
-                channel_id = str(channel.id)
-                role_ids = await self.get_managed_roles(channel_id)
-                
-                # Task-Daten erstellen
-                task_data = {
-                    "channel_id": channel_id,
-                    "status": status.value,
-                    "guild_id": str(channel.guild.id),
-                    "role_ids": role_ids
-                }
-                
-                # Aufgabe an Helfer-Bot delegieren
-                task_id = self.bot.channel_manager.delegate_to_helper("update_channel_lock", task_data)
-                logger.info(f"Channel-Lock-Aufgabe {task_id} an Helfer-Bot delegiert")
+            # Vorhersage aus dem Budget statt pauschaler Delegation nach einem Rate-Limit
+            route, at = budget.plan("overwrite", channel.id, self.bot.channel_manager.helper_budget)
+            if route == "helper":
+                await self._delegate_lock(channel, status)
                 return
-            
-            try:
-                if status in [BotStatus.OFFLINE, BotStatus.PROBLEM, BotStatus.MAINTENANCE]:
-                    await self._lock_channel(channel)
-                elif status == BotStatus.ONLINE:
-                    await self._unlock_channel(channel)
-            except discord.HTTPException as e:
-                if e.status == 429:  # Rate limit Status Code
-                    # Speichere Zeit des letzten Rate-Limits
-                    self._last_channel_lock_ratelimit = time.time()
-                    
-                    logger.warning(f"Rate-Limit erreicht beim Ändern der Channel-Berechtigungen. Retry after: {getattr(e, 'retry_after', 'unbekannt')}s. Delegiere an Helfer-Bot.")
-                    
-                    # Managed Rollen abrufen
-                    channel_id = str(channel.id)
-                    role_ids = await self.get_managed_roles(channel_id)
-                    
-                    # Task-Daten erstellen
-                    task_data = {
-                        "channel_id": channel_id,
-                        "status": status.value,
-                        "guild_id": str(channel.guild.id),
-                        "role_ids": role_ids
-                    }
-                    
-                    # Aufgabe an Helfer-Bot delegieren
-                    task_id = self.bot.channel_manager.delegate_to_helper("update_channel_lock", task_data)
-                    logger.info(f"Channel-Lock-Aufgabe {task_id} an Helfer-Bot delegiert")
-                else:
-                    raise  # Andere Fehler weiterreichen
-            
-        except discord.errors.RateLimited as e:
-            # Bei Rate-Limit: Delegieren an Helfer-Bot
-            logger.warning(f"Rate-Limit erreicht beim Ändern der Channel-Berechtigungen. Retry after: {e.retry_after}s. Delegiere an Helfer-Bot.")
-            
-            # Managed Rollen abrufen
-            channel_id = str(channel.id)
-            role_ids = await self.get_managed_roles(channel_id)
-            
-            # Task-Daten erstellen
-            task_data = {
-                "channel_id": channel_id,
-                "status": status.value,
-                "guild_id": str(channel.guild.id),
-                "role_ids": role_ids
-            }
-            
-            # Aufgabe an Helfer-Bot delegieren
-            task_id = self.bot.channel_manager.delegate_to_helper("update_channel_lock", task_data)
-            logger.info(f"Channel-Lock-Aufgabe {task_id} an Helfer-Bot delegiert")
-        except Exception as e:
-            logger.error(f"Error updating channel lock status: {e}", exc_info=True)
-
-    async def _lock_channel(self, channel: discord.TextChannel):
-        """Sperrt spezifische Berechtigungen eines Channels mit Erhalt der anderen Berechtigungen"""
-        try:
-            channel_id = str(channel.id)
-            role_ids = await self.get_managed_roles(channel_id)
-            
-            if not role_ids:
-                logger.warning(f"Keine Rollen konfiguriert für Channel {channel.id}")
+            if route == "defer":
+                # Nur der zuletzt angefragte Lock-Status wird beim Freiwerden angewendet
+                budget.defer("overwrite", channel.id, at, lambda: self.update_channel_lock(channel, status))
+                logger.info(f"Lock-Änderung für Channel {channel.id} zurückgestellt für {at - time.time():.0f}s")
                 return
 
-            for role_id in role_ids:
-                role = channel.guild.get_role(role_id)
-                if role:
-                    # Bot-Rolle Position prüfen
-                    bot_member = channel.guild.me
-                    if bot_member and role >= bot_member.top_role:
-                        logger.warning(f"Bot-Rolle hat nicht genügend Rechte für Rolle {role.name}")
-                        continue
-
-                    # Hole existierende Berechtigungen
-                    existing_overwrite = channel.overwrites_for(role)
-                    
-                    # Aktualisiere nur die spezifischen Berechtigungen
-                    existing_overwrite.send_messages = False
-                    existing_overwrite.add_reactions = False
-                    existing_overwrite.send_messages_in_threads = False
-                    existing_overwrite.create_public_threads = False
-                    existing_overwrite.create_private_threads = False
-
-                    await channel.set_permissions(role, overwrite=existing_overwrite)
-                    logger.info(f"Rolle {role.name} ({role_id}) für Channel {channel.name} gesperrt")
-                else:
-                    logger.warning(f"Rolle {role_id} nicht gefunden in Guild {channel.guild.id}")
+            budget.cancel_deferred("overwrite", channel.id)
+            await self._apply_lock(channel, status)
 
+        except (discord.HTTPException, discord.RateLimited) as e:
+            retry_after = retry_after_from(e)
+            if retry_after is None:
+                logger.error(f"Error updating channel lock status: {e}", exc_info=True)
+                return
+            # Sperre übernehmen und neu entscheiden (Helfer-Bot oder Zurückstellen)
+            budget.penalize("overwrite", channel.id, retry_after)
+            await self.update_channel_lock(channel, status)
         except Exception as e:
-            logger.error(f"Fehler beim Sperren des Channels {channel.name}: {e}")
+            logger.error(f"Error updating channel lock status: {e}", exc_info=True)
 
-    async def _unlock_channel(self, channel: discord.TextChannel):
-        """Entsperrt spezifische Berechtigungen eines Channels mit Erhalt der anderen Berechtigungen"""
+    async def _delegate_lock(self, channel: discord.TextChannel, status: BotStatus):
+        """Übergibt eine Lock-Änderung an den Helfer-Bot"""
+        channel_id = str(channel.id)
+        role_ids = await self.get_managed_roles(channel_id)
+
+        task_data = {
+            "channel_id": channel_id,
+            "status": status.value,
+            "guild_id": str(channel.guild.id),
+            "role_ids": role_ids
+        }
+
+        task_id = await self.bot.channel_manager.delegate_to_helper("update_channel_lock", task_data)
+        for _ in role_ids:
+            self.bot.channel_manager.helper_budget.record("overwrite", channel.id)
+        logger.info(f"Channel-Lock-Aufgabe {task_id} an Helfer-Bot delegiert")
+
+    async def compute_overwrites(
+        self,
+        channel: discord.TextChannel,
+        status: BotStatus
+    ) -> Optional[Dict[Union[discord.Role, discord.Member, discord.Object], discord.PermissionOverwrite]]:
+        """
+        Berechnet die vollständige Overwrite-Map des Channels für den Lock-Status.
+
+        Nur die verwalteten Berechtigungen der verwalteten Rollen werden geändert, alle anderen
+        Overwrites bleiben erhalten. Gibt None zurück, wenn sich nichts ändern würde.
+        """
+        locked = status in [BotStatus.OFFLINE, BotStatus.PROBLEM, BotStatus.MAINTENANCE]
+        if not locked and status != BotStatus.ONLINE:
+            return None
+
+        role_ids = await self.get_managed_roles(str(channel.id))
+        if not role_ids:
+            if locked:
+                logger.warning(f"Keine Rollen konfiguriert für Channel {channel.id}")
+            return None
+
+        overwrites = dict(channel.overwrites)
+        changed = False
+        for role_id in role_ids:
+            role = channel.guild.get_role(role_id)
+            if not role:
+                logger.warning(f"Rolle {role_id} nicht gefunden in Guild {channel.guild.id}")
+                continue
+
+            # Bot-Rolle Position prüfen
+            bot_member = channel.guild.me
+            if bot_member and role >= bot_member.top_role:
+                logger.warning(f"Bot-Rolle hat nicht genügend Rechte für Rolle {role.name}")
+                continue
+
+            # Nur die spezifischen Berechtigungen ändern, die übrigen bleiben erhalten
+            overwrite = channel.overwrites_for(role)
+            before = overwrite.pair()
+            overwrite.update(**(LOCKED_PERMISSIONS if locked else UNLOCKED_PERMISSIONS))
+            if overwrite.pair() != before:
+                overwrites[role] = overwrite
+                changed = True
+
+        return overwrites if changed else None
+
+    async def _apply_lock(self, channel: discord.TextChannel, status: BotStatus):
+        """Setzt die Overwrites aller verwalteten Rollen mit einem einzigen Channel-PATCH"""
         try:
-            channel_id = str(channel.id)
-            role_ids = await self.get_managed_roles(channel_id)
-            
-            if not role_ids:
+            overwrites = await self.compute_overwrites(channel, status)
+            if overwrites is None:
                 return
 
-            for role_id in role_ids:
-                role = channel.guild.get_role(role_id)
-                if role:
-                    # Bot-Rolle Position prüfen
-                    bot_member = channel.guild.me
-                    if bot_member and role >= bot_member.top_role:
-                        logger.warning(f"Bot-Rolle hat nicht genügend Rechte für Rolle {role.name}")
-                        continue
-
-                    # Hole existierende Berechtigungen
-                    existing_overwrite = channel.overwrites_for(role)
-                    
-                    # Aktualisiere nur die spezifischen Berechtigungen
-                    existing_overwrite.send_messages = True
-                    existing_overwrite.add_reactions = True
-                    existing_overwrite.view_channel = True
-                    existing_overwrite.read_message_history = True
-                    existing_overwrite.attach_files = True
-
-                    await channel.set_permissions(role, overwrite=existing_overwrite)
-                    logger.info(f"Rolle {role.name} ({role_id}) für Channel {channel.name} entsperrt")
-                else:
-                    logger.warning(f"Rolle {role_id} nicht gefunden in Guild {channel.guild.id}")
+            self.bot.channel_manager.rate_budget.record("overwrite", channel.id)
+            await channel.edit(overwrites=overwrites)
+            action = "entsperrt" if status == BotStatus.ONLINE else "gesperrt"
+            logger.info(f"Verwaltete Rollen für Channel {channel.name} {action}")
 
+        except (discord.HTTPException, discord.RateLimited) as e:
+            if retry_after_from(e) is not None:
+                raise  # Rate-Limits entscheidet update_channel_lock
+            logger.error(f"Fehler beim Ändern der Berechtigungen des Channels {channel.name}: {e}")
         except Exception as e:
-            logger.error(f"Fehler beim Entsperren des Channels {channel.name}: {e}")
+            logger.error(f"Fehler beim Ändern der Berechtigungen des Channels {channel.name}: {e}")
 
     def save_data(self):
         """Speichert die Konfiguration der verwalteten Rollen"""
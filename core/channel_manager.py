@@ -5,8 +5,10 @@ import time
 import random
 import json
 import os
-from typing import Set, Dict, Optional, List
+from typing import Set, Dict, Optional, List, Tuple
 from bot_status import BotStatus
+from config.constants import BotConstants
+from .rate_budget import RateBudget, retry_after_from
 import asyncio
 
 logger = logging.getLogger('StatusBot')
@@ -17,79 +19,200 @@ class ChannelManager:
         self.bot = bot
         self.excluded_channels: Set[str] = set()
         self.channel_owners = {}  # Neues Dictionary für Channel-Owner
+        # Schwellen pro Kanalpaar: {guild_id: {log_channel_id: {"inactivity": s, "recovery": s}}}
+        self.channel_thresholds: Dict[str, Dict[str, Dict[str, int]]] = {}
+        # Eigene Schwellen (Inaktivität, Erholung) pro Log-Channel-ID für den Hot-Path, None = Standard
+        self._threshold_index: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
         
-        # Rate-Limit-Tracking
-        self._last_channel_name_ratelimit = 0
+        # Rate-Limit-Budgets pro Channel und Route, getrennt für den eigenen und den Helfer-Token
+        limits = {
+            "rename": (BotConstants.RENAME_LIMIT, BotConstants.RENAME_WINDOW),
+            "overwrite": (BotConstants.OVERWRITE_LIMIT, BotConstants.OVERWRITE_WINDOW),
+        }
+        self.rate_budget = RateBudget(limits, "Hauptbot")
+        self.helper_budget = RateBudget(limits, "Helfer-Bot")
+
+        # Index über bot.guild_channels für Lookups in O(1):
+        # Log -> (Guild, Update), Update -> Log, Guild -> Log-Channels
+        self._log_index: Dict[str, Tuple[str, str]] = {}
+        self._update_index: Dict[str, str] = {}
+        self._guild_index: Dict[str, Set[str]] = {}
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """Baut den Channel-Index aus bot.guild_channels neu auf"""
+        self._log_index.clear()
+        self._update_index.clear()
+        self._guild_index.clear()
+        for guild_id, channels in self.bot.guild_channels.items():
+            for log_channel_id, update_channel_id in channels.items():
+                self._index_pair(guild_id, log_channel_id, update_channel_id)
+        logger.debug(f"Channel-Index aufgebaut: {len(self._log_index)} Kanalpaare")
+
+    def _index_pair(self, guild_id: str, log_channel_id: str, update_channel_id: str):
+        self._unindex_pair(log_channel_id)
+        self._log_index[log_channel_id] = (guild_id, update_channel_id)
+        self._update_index[update_channel_id] = log_channel_id
+        self._guild_index.setdefault(guild_id, set()).add(log_channel_id)
+
+    def _unindex_pair(self, log_channel_id: str):
+        entry = self._log_index.pop(log_channel_id, None)
+        if entry is None:
+            return
+        guild_id, update_channel_id = entry
+        if self._update_index.get(update_channel_id) == log_channel_id:
+            del self._update_index[update_channel_id]
+        guild_logs = self._guild_index.get(guild_id)
+        if guild_logs is not None:
+            guild_logs.discard(log_channel_id)
+            if not guild_logs:
+                del self._guild_index[guild_id]
+
+    def status_channel_name(self, channel: discord.TextChannel, status: BotStatus) -> str:
+        """Channel-Name mit dem Status-Emoji"""
+        status_emoji = self.bot.patterns.get_status_emoji(status)
+        base_name = self.bot.patterns.remove_status_emoji(channel.name)
+        return f"{status_emoji}︱{base_name}"
+
+    async def update_channel_state(self, channel: discord.TextChannel, status: BotStatus):
+        """
+        Setzt Name und Lock-Berechtigungen eines Update-Channels für einen Status.
+
+        Beides wird mit einem einzigen channel.edit(name=..., overwrites=...) gesetzt, statt
+        einer Umbenennung plus einem set_permissions pro verwalteter Rolle. Lässt das
+        Rename-Budget gerade keine Umbenennung zu, werden die Berechtigungen sofort gesetzt
+        und nur die Umbenennung zurückgestellt bzw. an den Helfer-Bot gegeben.
+        """
+        try:
+            new_name = self.status_channel_name(channel, status)
+            if channel.name == new_name:
+                self.rate_budget.cancel_deferred("rename", channel.id)
+                await self.bot.channel_locker.update_channel_lock(channel, status)
+                return
+
+            overwrites = await self.bot.channel_locker.compute_overwrites(channel, status)
+            rename_route, _ = self.rate_budget.plan("rename", channel.id)
+            overwrite_route, _ = self.rate_budget.plan("overwrite", channel.id)
+            if rename_route != "main" or (overwrites is not None and overwrite_route != "main"):
+                await self.bot.channel_locker.update_channel_lock(channel, status)
+                await self._request_rename(channel.id, new_name)
+                return
+
+            logger.info(f"Changing channel name from '{channel.name}' to '{new_name}'"
+                        + (" und setze Berechtigungen" if overwrites is not None else ""))
+            self.rate_budget.cancel_deferred("rename", channel.id)
+            self.rate_budget.cancel_deferred("overwrite", channel.id)
+            self.rate_budget.record("rename", channel.id)
+            if overwrites is None:
+                await channel.edit(name=new_name)
+            else:
+                self.rate_budget.record("overwrite", channel.id)
+                await channel.edit(name=new_name, overwrites=overwrites)
+            logger.info(f"Channel name updated to: {new_name}")
+            self._write_channel_state(channel, new_name, completed=True)
+
+        except (discord.HTTPException, discord.RateLimited) as e:
+            retry_after = retry_after_from(e)
+            if retry_after is None:
+                logger.error(f"HTTP-Fehler beim Channel-Update: {e}", exc_info=True)
+                return
+            # Die Umbenennung ist das knappe Limit: Berechtigungen getrennt setzen, Namen neu einplanen
+            self.rate_budget.penalize("rename", channel.id, retry_after)
+            await self.bot.channel_locker.update_channel_lock(channel, status)
+            await self._request_rename(channel.id, self.status_channel_name(channel, status))
+        except Exception as e:
+            logger.error(f"Allgemeiner Fehler in update_channel_state: {e}", exc_info=True)
 
     async def update_channel_name(self, channel: discord.TextChannel, status: BotStatus):
         """Update channel name with status emoji"""
         try:
-            current_name = channel.name
-            status_emoji = self.bot.patterns.get_status_emoji(status)
-            base_name = self.bot.patterns.remove_status_emoji(current_name)
-            new_name = f"{status_emoji}︱{base_name}"
-            
-            if current_name != new_name:
-                logger.info(f"Changing channel name from '{current_name}' to '{new_name}'")
-                
-                # Speichere die gewünschte Änderung in der JSON
-                channel_states_file = self.bot.data_manager.data_dir / "json" / "channel_states.json"
-                channel_states_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Lade aktuelle Channel-States
-                channel_states = {}
-                if channel_states_file.exists():
-                    try:
-                        with open(channel_states_file, 'r', encoding='utf-8') as f:
-                            content = f.read().strip()
-                            if content:
-                                channel_states = json.loads(content)
-                    except:
-                        pass
-                
-                # Aktualisiere den Channel-State
-                channel_states[str(channel.id)] = {
-                    "current_name": current_name,
-                    "desired_name": new_name,
-                    "guild_id": str(channel.guild.id),
-                    "last_update": time.time(),
-                    "last_attempt": 0,  # Wird vor dem Versuch aktualisiert
-                    "completed": False
-                }
-                
-                # Speichere die aktualisierten States
-                with open(channel_states_file, 'w', encoding='utf-8') as f:
-                    json.dump(channel_states, f, indent=2)
-                
-                try:
-                    # Aktualisiere last_attempt vor dem Versuch
-                    channel_states[str(channel.id)]["last_attempt"] = time.time()
-                    with open(channel_states_file, 'w', encoding='utf-8') as f:
-                        json.dump(channel_states, f, indent=2)
-                    
-                    # Versuche die Änderung
-                    await channel.edit(name=new_name)
-                    logger.info(f"Channel name updated to: {new_name}")
-                    
-                    # Markiere als abgeschlossen
-                    channel_states[str(channel.id)]["completed"] = True
-                    with open(channel_states_file, 'w', encoding='utf-8') as f:
-                        json.dump(channel_states, f, indent=2)
-                    
-                except discord.HTTPException as e:
-                    if hasattr(e, 'status') and e.status == 429:
-                        retry_after = getattr(e, 'retry_after', 60)
-                        logger.warning(f"Rate-Limit erreicht beim Ändern des Channel-Namens. "
-                                     f"Retry after: {retry_after}s. HelperBot wird die Änderung übernehmen.")
-                    else:
-                        logger.error(f"HTTP-Fehler beim Channel-Update: {e}", exc_info=True)
-                        
-                except Exception as e:
-                    logger.error(f"Unerwarteter Fehler beim Channel-Update: {e}", exc_info=True)
-                    
+            new_name = self.status_channel_name(channel, status)
+
+            if channel.name == new_name:
+                # Zielname erreicht, eine noch wartende Umbenennung wäre überholt
+                self.rate_budget.cancel_deferred("rename", channel.id)
+                return
+
+            await self._request_rename(channel.id, new_name)
+
         except Exception as e:
             logger.error(f"Allgemeiner Fehler in update_channel_name: {e}", exc_info=True)
 
+    async def _request_rename(self, channel_id: int, new_name: str):
+        """
+        Benennt einen Channel um, sobald das Rate-Limit-Budget es erlaubt.
+
+        Ist das eigene Budget erschöpft, übernimmt der Helfer-Bot nur dann, wenn er sofort
+        umbenennen darf. Sonst wird die Umbenennung bis zum Freiwerden zurückgestellt; weitere
+        Anfragen ersetzen den wartenden Namen, ausgeführt wird nur der zuletzt gewünschte.
+        """
+        channel = self.bot.get_channel(channel_id)
+        if channel is None or channel.name == new_name:
+            return
+
+        route, at = self.rate_budget.plan("rename", channel_id, self.helper_budget)
+        if route == "helper":
+            self._write_channel_state(channel, new_name, completed=False)
+            self.helper_budget.record("rename", channel_id)
+            logger.info(f"Rename-Budget erschöpft, Helfer-Bot übernimmt: '{channel.name}' -> '{new_name}'")
+            return
+        if route == "defer":
+            replaced = self.rate_budget.defer(
+                "rename", channel_id, at, lambda: self._request_rename(channel_id, new_name)
+            )
+            logger.info(
+                f"Umbenennung von '{channel.name}' in '{new_name}' zurückgestellt für {at - time.time():.0f}s"
+                + (" (ersetzt wartende Umbenennung)" if replaced else "")
+            )
+            return
+
+        logger.info(f"Changing channel name from '{channel.name}' to '{new_name}'")
+        self.rate_budget.record("rename", channel_id)
+        try:
+            await channel.edit(name=new_name)
+            logger.info(f"Channel name updated to: {new_name}")
+            # Ein noch offener Auftrag an den Helfer-Bot ist damit überholt
+            self._write_channel_state(channel, new_name, completed=True)
+
+        except (discord.HTTPException, discord.RateLimited) as e:
+            retry_after = retry_after_from(e)
+            if retry_after is None:
+                logger.error(f"HTTP-Fehler beim Channel-Update: {e}", exc_info=True)
+                return
+            # Budget lag daneben (z.B. nach Neustart): Sperre übernehmen und neu entscheiden
+            self.rate_budget.penalize("rename", channel_id, retry_after)
+            await self._request_rename(channel_id, new_name)
+
+    def _write_channel_state(self, channel: discord.TextChannel, desired_name: str, completed: bool):
+        """Schreibt den gewünschten Namen in channel_states.json, die der Helfer-Bot abarbeitet"""
+        try:
+            channel_states_file = self.bot.data_manager.data_dir / "json" / "channel_states.json"
+            channel_states_file.parent.mkdir(parents=True, exist_ok=True)
+
+            channel_states = {}
+            if channel_states_file.exists():
+                try:
+                    with open(channel_states_file, 'r', encoding='utf-8') as f:
+                        content = f.read().strip()
+                        if content:
+                            channel_states = json.loads(content)
+                except:
+                    pass
+
+            channel_states[str(channel.id)] = {
+                "current_name": channel.name,
+                "desired_name": desired_name,
+                "guild_id": str(channel.guild.id),
+                "last_update": time.time(),
+                "last_attempt": 0,
+                "completed": completed
+            }
+
+            with open(channel_states_file, 'w', encoding='utf-8') as f:
+                json.dump(channel_states, f, indent=2)
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben von channel_states.json: {e}")
+
     def is_excluded(self, channel_id: str) -> bool:
         """Check if a channel is excluded from status checks"""
         return channel_id in self.excluded_channels
@@ -108,6 +231,8 @@ class ChannelManager:
         if channel_id in self.excluded_channels:
             self.excluded_channels.remove(channel_id)
             self._save_excluded_channels()
+            # Während des Ausschlusses abgelaufene Fristen werden neu geplant
+            self.bot.status_manager.arm(int(channel_id))
             logger.info(f"Channel {channel_id} removed from excluded channels")
             return True
         return False
@@ -129,6 +254,8 @@ class ChannelManager:
             self.bot.guild_channels[guild_id] = {}
         
         self.bot.guild_channels[guild_id][log_channel_id] = update_channel_id
+        self._index_pair(guild_id, log_channel_id, update_channel_id)
+        self.bot.rebuild_monitored_channels()
         
         # Speichere den Owner wenn angegeben
         if owner_id:
@@ -152,10 +279,20 @@ class ChannelManager:
                 if not self.channel_owners[guild_id]:
                     del self.channel_owners[guild_id]
                 self._save_channel_owners()
-            
+
+            if self._remove_channel_thresholds(guild_id, log_channel_id):
+                self._save_channel_thresholds()
+
+            # Zurückgestellte Umbenennungen/Lock-Änderungen des Update-Channels verwerfen
+            for route in self.rate_budget.limits:
+                self.rate_budget.cancel_deferred(route, int(update_channel_id))
+
             if not self.bot.guild_channels[guild_id]:
                 del self.bot.guild_channels[guild_id]
+            self._unindex_pair(log_channel_id)
+            self.bot.rebuild_monitored_channels()
             self._save_channel_pairs()
+            self.bot.pattern_manager.remove_channel(log_channel_id)
             logger.info(f"Removed channel pair: Log {log_channel_id} -> Update {update_channel_id}")
         return update_channel_id
 
@@ -173,6 +310,80 @@ class ChannelManager:
         except Exception as e:
             logger.error(f"Error saving channel owners: {e}")
 
+    def _save_channel_thresholds(self):
+        """Save the per-channel thresholds to file"""
+        try:
+            self.bot.data_manager.save_json(self.channel_thresholds, "channel_thresholds.json")
+        except Exception as e:
+            logger.error(f"Error saving channel thresholds: {e}")
+
+    def _rebuild_threshold_index(self):
+        """Baut den Index der Kanäle mit eigenen Schwellen neu auf"""
+        self._threshold_index = {
+            int(log_channel_id): (values.get("inactivity"), values.get("recovery"))
+            for guild_thresholds in self.channel_thresholds.values()
+            for log_channel_id, values in guild_thresholds.items()
+        }
+
+    def _remove_channel_thresholds(self, guild_id: str, log_channel_id: str) -> bool:
+        """Entfernt die Schwellen eines Kanalpaars (ohne zu speichern)"""
+        guild_thresholds = self.channel_thresholds.get(guild_id)
+        if not guild_thresholds or log_channel_id not in guild_thresholds:
+            return False
+        del guild_thresholds[log_channel_id]
+        if not guild_thresholds:
+            del self.channel_thresholds[guild_id]
+        self._threshold_index.pop(int(log_channel_id), None)
+        return True
+
+    def set_channel_thresholds(self, guild_id: str, log_channel_id: str,
+                               inactivity: Optional[int] = None, recovery: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Setzt die Schwellen eines Kanalpaars. None lässt einen Wert unverändert,
+        0 setzt ihn auf den globalen Standard zurück.
+
+        Returns:
+            Tuple[int, int]: Wirksame Schwellen (Inaktivität, Erholung) in Sekunden
+        """
+        values = dict(self.channel_thresholds.get(guild_id, {}).get(log_channel_id, {}))
+        for key, value in (("inactivity", inactivity), ("recovery", recovery)):
+            if value is None:
+                continue
+            if value:
+                values[key] = value
+            else:
+                values.pop(key, None)
+
+        if values:
+            self.channel_thresholds.setdefault(guild_id, {})[log_channel_id] = values
+            self._threshold_index[int(log_channel_id)] = (values.get("inactivity"), values.get("recovery"))
+        else:
+            self._remove_channel_thresholds(guild_id, log_channel_id)
+        self._save_channel_thresholds()
+
+        # Kürzere Fristen sofort neu planen, längere werden beim Ablauf nachgeprüft
+        self.bot.status_manager.arm(int(log_channel_id))
+        thresholds = self.get_thresholds(int(log_channel_id))
+        logger.info(f"Schwellen für Channel {log_channel_id}: Inaktivität {thresholds[0]}s, Erholung {thresholds[1]}s")
+        return thresholds
+
+    def get_thresholds(self, log_channel_id: int) -> Tuple[int, int]:
+        """Gibt die wirksamen Schwellen (Inaktivität, Erholung) eines Log-Channels zurück"""
+        thresholds = self._threshold_index.get(log_channel_id)
+        if thresholds is None:
+            return BotConstants.INACTIVITY_THRESHOLD, BotConstants.ACTIVITY_CHECK_THRESHOLD
+        inactivity, recovery = thresholds
+        return inactivity or BotConstants.INACTIVITY_THRESHOLD, recovery or BotConstants.ACTIVITY_CHECK_THRESHOLD
+
+    def get_inactivity_override(self, log_channel_id: int) -> Optional[int]:
+        """Gibt die per /setthresholds gesetzte Inaktivitätsschwelle zurück (None = keine)"""
+        thresholds = self._threshold_index.get(log_channel_id)
+        return thresholds[0] if thresholds else None
+
+    def has_custom_thresholds(self, guild_id: str, log_channel_id: str) -> bool:
+        """Prüft, ob ein Kanalpaar eigene Schwellen hat"""
+        return log_channel_id in self.channel_thresholds.get(guild_id, {})
+
     def get_channel_pairs(self, guild_id: str) -> List[Dict[str, str]]:
         """Get all channel pairs for a guild"""
         if guild_id in self.bot.guild_channels:
@@ -191,11 +402,19 @@ class ChannelManager:
 
     def get_log_channel(self, guild_id: str, update_channel_id: str) -> Optional[str]:
         """Get the log channel ID for a given update channel"""
-        if guild_id in self.bot.guild_channels:
-            for log_id, update_id in self.bot.guild_channels[guild_id].items():
-                if update_id == update_channel_id:
-                    return log_id
-        return None
+        log_id = self._update_index.get(update_channel_id)
+        if log_id is None or self._log_index[log_id][0] != guild_id:
+            return None
+        return log_id
+
+    def get_guild_for_log_channel(self, log_channel_id: str) -> Optional[str]:
+        """Gibt die Guild-ID zurück, zu der ein Log-Channel gehört"""
+        entry = self._log_index.get(log_channel_id)
+        return entry[0] if entry else None
+
+    def get_guild_log_channels(self, guild_id: str) -> Set[str]:
+        """Gibt die Log-Channel-IDs einer Guild zurück"""
+        return self._guild_index.get(guild_id, set())
 
     def get_channel_owner(self, guild_id: str, log_channel_id: str) -> Optional[int]:
         """Get the owner ID for a given channel pair"""
@@ -204,10 +423,16 @@ class ChannelManager:
     def load_data(self):
         """Load channel related data"""
         try:
+            self.rebuild_index()
+
             excluded_data = self.bot.data_manager.load_json("excluded_channels.json")
             self.excluded_channels = set(excluded_data if isinstance(excluded_data, list) else [])
             
             self.channel_owners = self.bot.data_manager.load_json("channel_owners.json")
+
+            self.channel_thresholds = self.bot.data_manager.load_json("channel_thresholds.json")
+            self._rebuild_threshold_index()
+            logger.info(f"Channel-Schwellen: {len(self._threshold_index)} Kanäle mit eigenen Schwellen")
             
             # Debug-Ausgabe für geladene Daten
             logger.info(f"Excluded Channels: {len(self.excluded_channels)} Kanäle ausgeschlossen")
@@ -226,6 +451,8 @@ class ChannelManager:
             logger.error(f"Error loading channel data: {e}", exc_info=True)
             self.excluded_channels = set()
             self.channel_owners = {}
+            self.channel_thresholds = {}
+            self._threshold_index = {}
 
     async def setup_update_channel(self, channel: discord.TextChannel, status: BotStatus):
         """Initial setup of an update channel"""
@@ -285,33 +512,39 @@ class ChannelManager:
                 for guild_id, log_id in channels_to_remove:
                     if guild_id in self.bot.guild_channels and log_id in self.bot.guild_channels[guild_id]:
                         update_id = self.bot.guild_channels[guild_id].pop(log_id)
+                        self._unindex_pair(log_id)
                         
                         # Entferne Guild wenn keine Channels mehr übrig
                         if not self.bot.guild_channels[guild_id]:
                             del self.bot.guild_channels[guild_id]
                         
                         # Entferne Channel aus anderen Konfigurationen
-                        if log_id in self.bot.status_manager.last_known_status:
-                            del self.bot.status_manager.last_known_status[log_id]
+                        self.bot.status_manager.remove_channel(int(log_id), save=False)
                         
                         if log_id in self.excluded_channels:
                             self.excluded_channels.remove(log_id)
                         
+                        self.bot.pattern_manager.remove_channel(log_id)
+                        
                         # Entferne Owner-Informationen
                         if guild_id in self.channel_owners and log_id in self.channel_owners[guild_id]:
                             del self.channel_owners[guild_id][log_id]
                             if not self.channel_owners[guild_id]:
                                 del self.channel_owners[guild_id]
+
+                        self._remove_channel_thresholds(guild_id, log_id)
                         
                         removed_count += 1
                         logger.info(f"Channel-Paar entfernt - Guild: {guild_id}, Log: {log_id}, Update: {update_id}")
 
                 # Speichere die aktualisierten Daten
                 if removed_count > 0:
+                    self.bot.rebuild_monitored_channels()
                     self._save_channel_pairs()
                     self._save_excluded_channels()
-                    self.bot.data_manager.save_json(self.bot.status_manager.last_known_status, "last_known_status.json")
+                    self.bot.status_manager.save_status()
                     self._save_channel_owners()
+                    self._save_channel_thresholds()
                     logger.info(f"Cleanup abgeschlossen: {removed_count} ungültige Channel-Paare entfernt")
                 else:
                     logger.info("Cleanup abgeschlossen: Keine ungültigen Channels gefunden")
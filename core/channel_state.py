@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from bot_status import BotStatus
+from utils.interarrival_stats import InterArrivalStats
+
+logger = logging.getLogger('StatusBot')
+
+# Feste Position jedes Status in der Cooldown-Liste
+_STATUS_INDEX: Dict[BotStatus, int] = {status: index for index, status in enumerate(BotStatus)}
+
+class DeferredTransition:
+    """Zielstatus eines flappenden Channels, der erst nach einer Ruhephase angewendet wird"""
+
+    __slots__ = ('status', 'reason', 'since', 'coalesced', 'task')
+
+    def __init__(self, status: BotStatus, reason: str, since: float):
+        self.status = status
+        self.reason = reason
+        # Zeitpunkt der letzten Änderung des Zielstatus
+        self.since = since
+        # Anzahl der zusammengefassten Wechselanfragen
+        self.coalesced = 1
+        self.task: Optional[asyncio.Task] = None
+
+class ChannelState:
+    """
+    Laufzeitzustand eines überwachten Log-Channels.
+
+    Bündelt, was früher auf vier parallele, über String-IDs adressierte Dicts verteilt war
+    (Status, letzte Nachricht, Activity-Tracking, Cooldowns), sodass eine Nachricht nur
+    ein Objekt anfasst. Zeitwerte von 0.0 bedeuten "nicht gesetzt".
+    """
+
+    __slots__ = ('status', 'last_message_time', 'activity_start', 'cooldowns', 'pending', 'flush_task', 'arrivals',
+                 'transitions', 'deferred')
+
+    def __init__(self, status: Optional[BotStatus] = None):
+        self.status: Optional[BotStatus] = status
+        self.last_message_time = 0.0
+        self.activity_start = 0.0
+        # Zeitpunkt des letzten Updates pro Status, wird erst beim ersten Update angelegt
+        self.cooldowns: Optional[List[float]] = None
+        # Eingangspuffer für die Bündelung von Log-Nachrichten
+        self.pending: Optional[Deque[str]] = None
+        self.flush_task: Optional[asyncio.Task] = None
+        # Statistik der Nachrichtenabstände, wird mit dem ersten Abstand angelegt
+        self.arrivals: Optional[InterArrivalStats] = None
+        # Zeitpunkte der letzten automatischen Statuswechsel (Flap-Erkennung)
+        self.transitions: Optional[Deque[float]] = None
+        # Zurückgehaltener Statuswechsel, solange der Channel flappt
+        self.deferred: Optional[DeferredTransition] = None
+
+    def last_update(self, status: BotStatus) -> float:
+        """Gibt den Zeitpunkt des letzten Updates auf diesen Status zurück (0.0 = nie)"""
+        return self.cooldowns[_STATUS_INDEX[status]] if self.cooldowns else 0.0
+
+    def mark_updated(self, status: BotStatus, timestamp: float):
+        """Merkt sich den Zeitpunkt eines Updates für die Cooldown-Prüfung"""
+        if self.cooldowns is None:
+            self.cooldowns = [0.0] * len(_STATUS_INDEX)
+        self.cooldowns[_STATUS_INDEX[status]] = timestamp
+
+    def enqueue(self, content: str, max_batch: int):
+        """Reiht eine Nachricht ein; bei Überlauf fallen die ältesten heraus"""
+        if self.pending is None:
+            self.pending = deque(maxlen=max_batch)
+        self.pending.append(content)
+
+    def note_transition(self, timestamp: float, limit: int):
+        """Merkt sich einen durchgeführten Statuswechsel (nur die letzten limit werden benötigt)"""
+        if self.transitions is None or self.transitions.maxlen != limit:
+            self.transitions = deque(self.transitions or (), maxlen=limit)
+        self.transitions.append(timestamp)
+
+    def would_flap(self, timestamp: float, window: float, limit: int) -> bool:
+        """Prüft, ob ein Wechsel jetzt der limit-te innerhalb von window Sekunden wäre"""
+        if limit < 2 or not self.transitions or len(self.transitions) < limit - 1:
+            return False
+        return timestamp - self.transitions[-(limit - 1)] < window
+
+    def take_pending(self) -> List[str]:
+        """Entnimmt alle gepufferten Nachrichten"""
+        batch = list(self.pending) if self.pending else []
+        self.pending = None
+        return batch
+
+def states_from_json(data: Dict[str, str]) -> Dict[int, ChannelState]:
+    """Erstellt Channel-Zustände aus dem Format von last_known_status.json ({"<id>": "<status>"})"""
+    states = {}
+    for channel_id, value in data.items():
+        try:
+            states[int(channel_id)] = ChannelState(BotStatus(value))
+        except (ValueError, TypeError):
+            logger.warning(f"Ungültiger gespeicherter Status für Channel {channel_id}: {value}")
+    return states
+
+def states_to_json(states: Dict[int, ChannelState]) -> Dict[str, str]:
+    """Gibt die bekannten Status im Format von last_known_status.json zurück"""
+    return {str(channel_id): state.status.value for channel_id, state in states.items() if state.status}
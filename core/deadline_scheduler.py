@@ -0,0 +1,143 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger('StatusBot')
+
+class DeadlineScheduler:
+    """
+    Min-Heap mit einer Frist pro Schlüssel.
+
+    Pro Schlüssel ist höchstens eine Frist aktiv. Eine spätere Frist ersetzt eine bereits
+    geplante frühere nicht: der Callback prüft beim Ablauf den aktuellen Zustand und gibt
+    bei Bedarf die neue Frist zurück. Dadurch kostet ein Re-Arm pro Nachricht nur einen
+    Dict-Zugriff, und der Heap wächst nicht mit der Nachrichtenrate.
+
+    Abgelaufene Fristen werden als eigene Tasks abgearbeitet: ein Callback, der auf ein
+    langsames Status-Update wartet, verzögert die Fristen anderer Schlüssel nicht.
+    """
+
+    def __init__(self, callback: Callable[[Hashable], Awaitable[Optional[float]]]):
+        """
+        Args:
+            callback: Wird bei Ablauf einer Frist aufgerufen und gibt die nächste Frist
+                      (Unix-Zeit) oder None zurück
+        """
+        self.callback = callback
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counter = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # Laufende Callbacks pro Schlüssel, Schlüssel deren Frist währenddessen erneut ablief,
+        # und Schlüssel, die währenddessen verworfen wurden
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        self._due_again: Set[Hashable] = set()
+        self._cancelled: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """Plant eine Frist; eine bereits geplante frühere Frist bleibt bestehen"""
+        self._cancelled.discard(key)
+        current = self._deadlines.get(key)
+        if current is not None and current <= deadline:
+            return
+
+        self._deadlines[key] = deadline
+        self._counter += 1
+        heapq.heappush(self._heap, (deadline, self._counter, key))
+        # Nur wecken, wenn die neue Frist vor allen anderen liegt
+        if self._wakeup is not None and self._heap[0][1] == self._counter:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Verwirft die Frist eines Schlüssels (der Heap-Eintrag wird beim Entnehmen übersprungen)"""
+        self._deadlines.pop(key, None)
+        self._due_again.discard(key)
+        if key in self._running:
+            # Die vom laufenden Callback zurückgegebene Frist wird nicht mehr geplant
+            self._cancelled.add(key)
+
+    def next_deadline(self) -> Optional[float]:
+        """Gibt die früheste gültige Frist zurück"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """Entnimmt alle Schlüssel, deren Frist abgelaufen ist"""
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+
+    def _discard_stale(self):
+        while self._heap:
+            deadline, _, key = self._heap[0]
+            if self._deadlines.get(key) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def start(self, before: Optional[Callable[[], Awaitable[None]]] = None):
+        """
+        Startet die Scheduler-Schleife im laufenden Event-Loop
+
+        Args:
+            before: Optional, wird vor der ersten Frist abgewartet (z.B. bot.wait_until_ready)
+        """
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(before))
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self, before: Optional[Callable[[], Awaitable[None]]]):
+        """Schläft bis zur nächsten Frist (oder bis eine frühere geplant wird)"""
+        if before is not None:
+            await before()
+        while True:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            for key in self.pop_due(time.time()):
+                self._dispatch(key)
+
+    def _dispatch(self, key: Hashable):
+        """Startet den Callback als eigene Task, damit ein langsamer Callback die übrigen nicht aufhält"""
+        if key in self._running:
+            # Pro Schlüssel läuft höchstens ein Callback; der Ablauf wird danach nachgeholt
+            self._due_again.add(key)
+            return
+        task = asyncio.create_task(self.callback(key))
+        self._running[key] = task
+        task.add_done_callback(lambda finished, key=key: self._finished(key, finished))
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        """Plant die vom Callback zurückgegebene Frist"""
+        del self._running[key]
+        if key in self._cancelled:
+            self._cancelled.discard(key)
+            return
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Fehler bei Fristablauf für {key}: {error}", exc_info=error)
+        elif task.result() is not None:
+            self.schedule(key, task.result())
+        if key in self._due_again:
+            self._due_again.discard(key)
+            self.schedule(key, time.time())
@@ -0,0 +1,118 @@
+import discord
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Deque, List, Optional, Tuple
+from config.constants import BotConstants
+
+logger = logging.getLogger('StatusBot')
+
+# Discord-Grenzen pro Nachricht: 10 Embeds, 4096 Zeichen Beschreibung, 6000 Zeichen insgesamt
+MAX_EMBEDS = 10
+MAX_DESCRIPTION = 4096
+MAX_TOTAL = 6000
+# Reserve für Titel und Überlast-Feld
+TOTAL_RESERVE = 400
+# Längere Zeilen werden gekürzt, damit jede Zeile in ein Sammel-Embed passt
+MAX_LINE = 300
+
+class HistoryWriter:
+    """
+    Schreibt Einträge gebündelt in den History-Channel.
+
+    Einträge werden einige Sekunden gesammelt; ein einzelner Eintrag wird wie bisher als
+    eigenes Embed gesendet, mehrere als Sammel-Embed mit einer Zeile pro Eintrag. Die
+    Warteschlange ist begrenzt: ist sie voll, werden neue Einträge nur noch gezählt und
+    beim nächsten Senden als Zusammenfassung ausgegeben.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # (Embed für Einzelversand, Zeile für Sammel-Embed, Kategorie für die Zusammenfassung)
+        self._queue: Deque[Tuple[discord.Embed, str, str]] = deque()
+        self._dropped: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, embed: discord.Embed, line: str, category: str):
+        """Reiht einen Eintrag ein, ohne zu warten"""
+        if len(line) > MAX_LINE:
+            line = line[:MAX_LINE - 1] + "…"
+        if len(self._queue) < BotConstants.HISTORY_QUEUE_MAX:
+            self._queue.append((embed, line, category))
+        else:
+            self._dropped[category] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while self._queue or self._dropped:
+                await asyncio.sleep(BotConstants.HISTORY_FLUSH_DELAY)
+                await self._flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Fehler im History-Writer: {e}", exc_info=True)
+
+    async def _flush(self):
+        history_channel = self.bot.get_channel(self.bot.history_channel_id)
+        if not history_channel:
+            logger.error("History channel not found")
+            self._queue.clear()
+            self._dropped.clear()
+            return
+
+        if len(self._queue) == 1 and not self._dropped:
+            embed, _, _ = self._queue.popleft()
+            await self._send(history_channel, [embed])
+            return
+
+        embeds, count = self._build_digest()
+        logger.info(f"Sende Sammel-Embed mit {count} Einträgen in den History-Channel ({len(self._queue)} verbleiben)")
+        await self._send(history_channel, embeds)
+
+    def _build_digest(self) -> Tuple[List[discord.Embed], int]:
+        """Entnimmt so viele Zeilen, wie in eine Nachricht passen"""
+        pages: List[List[str]] = [[]]
+        page_length = 0
+        total = 0
+        count = 0
+        while self._queue:
+            line = self._queue[0][1]
+            if total + len(line) + 1 > MAX_TOTAL - TOTAL_RESERVE:
+                break
+            if page_length + len(line) + 1 > MAX_DESCRIPTION:
+                if len(pages) == MAX_EMBEDS:
+                    break
+                pages.append([])
+                page_length = 0
+            self._queue.popleft()
+            pages[-1].append(line)
+            page_length += len(line) + 1
+            total += len(line) + 1
+            count += 1
+
+        embeds = [
+            discord.Embed(
+                title="Status Change Log" if index == 0 else None,
+                description="\n".join(lines) or None,
+                color=discord.Color.blue()
+            )
+            for index, lines in enumerate(pages)
+        ]
+        if self._dropped:
+            summary = ", ".join(f"{category}: {amount}" for category, amount in self._dropped.most_common())
+            embeds[-1].add_field(
+                name="⚠️ Überlast",
+                value=f"{sum(self._dropped.values())} weitere Einträge nicht einzeln protokolliert ({summary})",
+                inline=False
+            )
+            self._dropped.clear()
+        embeds[-1].timestamp = discord.utils.utcnow()
+        return embeds, count
+
+    async def _send(self, channel: discord.TextChannel, embeds: List[discord.Embed]):
+        try:
+            await self.bot.message_manager.webhooks.send(channel, embeds=embeds)
+        except Exception as e:
+            logger.error(f"Error logging status change: {e}", exc_info=True)
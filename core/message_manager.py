@@ -2,33 +2,55 @@ import discord
 import logging
 import os
 import asyncio
-from typing import Optional, List, Tuple
+from pathlib import Path
+from datetime import timedelta
+from typing import Dict, Optional, List, Tuple
 from config.constants import BotConstants
 from bot_status import BotStatus
+from .asset_cache import StatusAssetCache
+from .webhook_transport import WebhookTransport
 
 logger = logging.getLogger('StatusBot')
 
+POSTED_IDS_FILE = "posted_message_ids.json"
+BULK_DELETE_MAX_AGE_DAYS = 14
+
 class MessageManager:
     def __init__(self, bot):
         self.bot = bot
         self.message_ids = {}
+        # Vom Bot gepostete Nachrichten pro Update-Channel: {channel_id: [message_id, ...]}
+        self.posted_ids: Dict[str, List[int]] = {}
+        # An der Status-Nachricht hängendes GIF pro Update-Channel (nur im Speicher; nach einem
+        # Neustart wird beim ersten Bearbeiten einmal neu hochgeladen)
+        self.attached_gifs: Dict[str, str] = {}
+        self.assets = StatusAssetCache(bot)
+        self.webhooks = WebhookTransport(bot)
 
     async def send_with_retry(
         self,
         channel: discord.TextChannel,
         embed: discord.Embed,
-        gif_path: str,
+        gif_path: Optional[str],
         retries: int = BotConstants.MAX_RETRIES
     ) -> Optional[discord.Message]:
-        """Send a message with retries on failure"""
+        """Send a message with retries on failure (without gif_path the embed is sent alone)"""
         for attempt in range(retries):
             try:
-                if os.path.exists(gif_path):
+                if gif_path is None:
+                    message = await self.webhooks.send(channel, embed=embed)
+                    self.attached_gifs.pop(str(channel.id), None)
+                elif os.path.exists(gif_path):
                     logger.info(f"Sending message with gif: {gif_path}")
-                    return await channel.send(embed=embed, file=discord.File(gif_path))
+                    message = await self.webhooks.send(channel, embed=embed, file=discord.File(gif_path))
+                    self.attached_gifs[str(channel.id)] = os.path.basename(gif_path)
                 else:
                     logger.warning(f"GIF file not found: {gif_path}, sending embed only")
-                    return await channel.send(embed=embed)
+                    message = await self.webhooks.send(channel, embed=embed)
+                    self.attached_gifs.pop(str(channel.id), None)
+                # Jede gesendete Nachricht aufzeichnen, damit purge_bot_messages sie wiederfindet
+                self.track_message(str(channel.id), message.id)
+                return message
             except discord.errors.HTTPException as e:
                 logger.warning(f"HTTP error when sending message (attempt {attempt + 1}/{retries}): {e}")
                 if attempt == retries - 1:
@@ -40,32 +62,37 @@ class MessageManager:
                 return None
         return None
 
-    async def purge_bot_messages(self, channel: discord.TextChannel) -> List[discord.Message]:
-        """Delete all bot messages in a channel"""
+    async def purge_bot_messages(self, channel: discord.TextChannel) -> List[discord.abc.Snowflake]:
+        """
+        Löscht die Bot-Nachrichten eines Update-Channels.
+
+        Gelöscht werden genau die IDs, die der Bot dort selbst gepostet hat. Nur wenn für den
+        Channel keine IDs aufgezeichnet sind (z.B. neu eingerichtet oder das letzte Senden ist
+        fehlgeschlagen), wird der Verlauf nach Bot-Nachrichten durchsucht, begrenzt auf das
+        Zeitfenster, in dem Bulk-Delete möglich ist.
+        """
+        channel_id = str(channel.id)
         try:
-            # Hole alle Nachrichten im Kanal
-            messages = []
-            async for message in channel.history(limit=100):
-                if message.author == self.bot.user:
-                    messages.append(message)
-            
+            posted = self.posted_ids.get(channel_id)
+            if posted:
+                messages = [discord.Object(id=message_id) for message_id in posted]
+            else:
+                messages = [
+                    message async for message in channel.history(limit=100, after=self._scan_start(channel_id))
+                    if message.author == self.bot.user or self.webhooks.owns(message)
+                ]
+                logger.info(f"Keine aufgezeichneten Nachrichten für {channel.name}, {len(messages)} per Verlauf gefunden")
+
             if messages:
-                try:
-                    # Versuche Bulk-Delete
-                    await channel.delete_messages(messages)
-                    logger.info(f"Successfully bulk deleted {len(messages)} messages")
-                except discord.errors.HTTPException as e:
-                    if e.code == 50034:  # Nachricht zu alt zum Bulk-Delete
-                        logger.info("Messages too old for bulk delete, trying individual deletion")
-                        for message in messages:
-                            try:
-                                await message.delete()
-                                await asyncio.sleep(0.5)  # Kleine Verzögerung zwischen Löschungen
-                            except Exception as delete_error:
-                                logger.error(f"Error deleting individual message: {delete_error}")
-                    else:
-                        raise  # Andere HTTPException weitergeben
-            
+                await self._delete_messages(channel, messages)
+
+            # Eine gespeicherte Status-Nachricht existiert danach nicht mehr
+            stored_id = self.message_ids.get(channel_id)
+            if stored_id and any(message.id == stored_id for message in messages):
+                self.forget_message_id(channel_id)
+
+            self.posted_ids[channel_id] = []
+            self._save_posted_ids()
             return messages
 
         except discord.errors.Forbidden:
@@ -75,8 +102,56 @@ class MessageManager:
             logger.error(f"Error purging messages in channel {channel.name}: {e}")
             return []
 
-    async def create_status_embed(self, status: BotStatus, log_channel_id: str, guild_id: str) -> Tuple[discord.Embed, str]:
-        """Create a status embed with the corresponding gif name"""
+    def _scan_start(self, channel_id: str) -> discord.abc.Snowflake:
+        """Startpunkt der Verlaufssuche: die gespeicherte Status-Nachricht, sonst die Bulk-Delete-Grenze"""
+        stored_id = self.message_ids.get(channel_id)
+        if stored_id:
+            return discord.Object(id=stored_id - 1)
+        return discord.Object(id=discord.utils.time_snowflake(
+            discord.utils.utcnow() - timedelta(days=BULK_DELETE_MAX_AGE_DAYS)
+        ))
+
+    async def _delete_messages(self, channel: discord.TextChannel, messages: List[discord.abc.Snowflake]):
+        """Löscht Nachrichten per Bulk-Delete (100 pro Aufruf), zu alte einzeln"""
+        for start in range(0, len(messages), 100):
+            chunk = messages[start:start + 100]
+            try:
+                await channel.delete_messages(chunk)
+                logger.info(f"Successfully bulk deleted {len(chunk)} messages")
+            except discord.errors.NotFound:
+                pass  # Einzelne Nachricht wurde bereits gelöscht
+            except discord.errors.HTTPException as e:
+                if e.code != 50034:  # Nachricht zu alt zum Bulk-Delete
+                    raise
+                logger.info("Messages too old for bulk delete, trying individual deletion")
+                for message in chunk:
+                    try:
+                        await channel.get_partial_message(message.id).delete()
+                        await asyncio.sleep(0.5)  # Kleine Verzögerung zwischen Löschungen
+                    except discord.errors.NotFound:
+                        pass
+                    except Exception as delete_error:
+                        logger.error(f"Error deleting individual message: {delete_error}")
+
+    def track_message(self, channel_id: str, message_id: int):
+        """Merkt sich eine vom Bot gepostete Nachricht für das nächste Aufräumen"""
+        self.posted_ids.setdefault(channel_id, []).append(message_id)
+        self._save_posted_ids()
+
+    def _save_posted_ids(self):
+        try:
+            self.bot.data_manager.save_json(self.posted_ids, POSTED_IDS_FILE)
+        except Exception as e:
+            logger.error(f"Error saving posted message IDs: {e}")
+
+    async def create_status_embed(
+        self,
+        status: BotStatus,
+        log_channel_id: str,
+        guild_id: str,
+        note: Optional[str] = None
+    ) -> Tuple[discord.Embed, str]:
+        """Create a status embed with the corresponding gif name (note is shown as a warning field)"""
         try:
             # Hole den channel-spezifischen Owner oder den Standard-Admin
             owner_id = self.bot.channel_manager.get_channel_owner(guild_id, log_channel_id)
@@ -91,6 +166,9 @@ class MessageManager:
                 timestamp=discord.utils.utcnow()
             )
             
+            if note:
+                embed.add_field(name="⚠️ Instabil", value=note, inline=False)
+
             gif_name = self.bot.config.status_gifs[status]
             embed.set_image(url=f"attachment://{gif_name}")
             
@@ -108,31 +186,103 @@ class MessageManager:
         except Exception as e:
             logger.error(f"Error saving message ID: {e}")
 
+    def forget_message_id(self, channel_id: str):
+        """Remove the stored message ID of a channel"""
+        self.attached_gifs.pop(channel_id, None)
+        if self.message_ids.pop(channel_id, None) is None:
+            return
+        try:
+            self.bot.data_manager.save_json(self.message_ids, "message_ids.json")
+        except Exception as e:
+            logger.error(f"Error saving message IDs: {e}")
+
     async def edit_message(
         self,
         channel: discord.TextChannel,
         message_id: int,
         embed: discord.Embed,
-        gif_path: str
+        gif_path: Optional[str]
     ) -> Optional[discord.Message]:
-        """Edit an existing message with new content"""
+        """
+        Edit an existing message with new content.
+
+        Das GIF wird nur hochgeladen, wenn sich das Bild ändert; sonst bleibt der vorhandene
+        Anhang bestehen und das Embed verweist weiter auf attachment://<name>.
+        """
+        channel_id = str(channel.id)
         try:
-            message = await channel.fetch_message(message_id)
-            if message:
-                if os.path.exists(gif_path):
-                    await message.edit(embed=embed, attachments=[discord.File(gif_path)])
-                else:
-                    await message.edit(embed=embed)
+            # Ohne fetch_message: das Bearbeiten ist ein einzelner PATCH (über den Webhook, falls aktiv)
+            if gif_path and os.path.exists(gif_path):
+                gif_name = os.path.basename(gif_path)
+                if self.attached_gifs.get(channel_id) == gif_name:
+                    return await self.webhooks.edit(channel, message_id, embed=embed)
+                message = await self.webhooks.edit(channel, message_id, embed=embed, attachments=[discord.File(gif_path)])
+                self.attached_gifs[channel_id] = gif_name
                 return message
+            message = await self.webhooks.edit(channel, message_id, embed=embed, attachments=[])
+            self.attached_gifs.pop(channel_id, None)
+            return message
         except discord.NotFound:
             logger.warning(f"Message {message_id} not found in channel {channel.name}")
+            self.forget_message_id(channel_id)
         except discord.Forbidden:
             logger.error(f"Bot doesn't have permission to edit messages in channel {channel.name}")
         except Exception as e:
             logger.error(f"Error editing message: {e}")
         return None
 
+    async def update_status_message(
+        self,
+        channel: discord.TextChannel,
+        embed: discord.Embed,
+        gif_path: str
+    ) -> Optional[discord.Message]:
+        """
+        Aktualisiert die Status-Nachricht eines Update-Channels.
+
+        Die gespeicherte Nachricht wird direkt bearbeitet; nur wenn es keine gibt oder sie
+        gelöscht wurde, werden alte Bot-Nachrichten entfernt und eine neue gesendet.
+        Ist das GIF bereits im Asset-Channel hochgeladen, verweist das Embed nur auf dessen URL.
+        """
+        asset_url = await self.assets.get_url(Path(gif_path))
+        if asset_url:
+            embed.set_image(url=asset_url)
+            gif_path = None
+
+        channel_id = str(channel.id)
+        message_id = self.message_ids.get(channel_id)
+        if message_id:
+            message = await self.edit_message(channel, message_id, embed, gif_path)
+            if message:
+                logger.info(f"Status-Nachricht {message_id} in {channel.name} bearbeitet")
+                return message
+
+        # Fallback: Alte Nachrichten löschen und neu senden. Gegen Abbruch (Timeout des
+        # Status-Updates) geschützt, damit keine gesendete Nachricht ohne gespeicherte ID bleibt,
+        # die beim nächsten Aufräumen nicht mehr gefunden würde
+        return await asyncio.shield(self._replace_status_message(channel, embed, gif_path))
+
+    async def _replace_status_message(
+        self,
+        channel: discord.TextChannel,
+        embed: discord.Embed,
+        gif_path: Optional[str]
+    ) -> Optional[discord.Message]:
+        """Löscht alte Bot-Nachrichten, sendet die Status-Nachricht neu und merkt sich ihre ID"""
+        channel_id = str(channel.id)
+        try:
+            await self.purge_bot_messages(channel)
+        except Exception as e:
+            logger.error(f"Fehler beim Löschen alter Nachrichten: {e}")
+
+        message = await self.send_with_retry(channel, embed, gif_path)
+        if message:
+            self.save_message_id(channel_id, message.id)
+        return message
+
     def load_data(self):
         """Load message related data"""
         self.message_ids = self.bot.data_manager.load_json("message_ids.json")
         logger.info(f"Message Manager: {len(self.message_ids)} gespeicherte Nachrichten-IDs geladen")
+        self.posted_ids = self.bot.data_manager.load_json(POSTED_IDS_FILE)
+        self.assets.load_data()
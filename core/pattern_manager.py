@@ -0,0 +1,420 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from discord.ext import tasks
+from bot_status import BotStatus
+from config.constants import BotConstants
+from .pattern_sandbox import PatternSandbox, PatternSandboxError, PatternTimeout
+from utils.pattern_safety import check_pattern
+from utils.pattern_stats import PatternStats
+from utils.status_patterns import StatusPatterns
+
+logger = logging.getLogger('StatusBot')
+
+PATTERN_CATEGORIES = ('offline', 'error', 'online')
+# Status der Kategorien in derselben Reihenfolge
+CATEGORY_STATUSES = (BotStatus.OFFLINE, BotStatus.PROBLEM, BotStatus.ONLINE)
+
+# Standard-Muster, werden bei Änderungen im laufenden Betrieb neu geladen
+PATTERN_FILE = "status_patterns.json"
+
+# Aufgelöstes Musterset: (offline, error, online) - hashbar und damit direkt als Cache-Schlüssel nutzbar
+PatternSetKey = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+def load_pattern_file(path: Path) -> StatusPatterns:
+    """
+    Liest und kompiliert die Standard-Muster aus einer Datei (läuft außerhalb des Event-Loops).
+
+    Raises:
+        ValueError: Wenn die Datei ungültig ist oder ein Muster die Sicherheitsprüfung nicht besteht
+        re.error: Wenn ein Muster kein gültiger regulärer Ausdruck ist
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Die Musterdatei muss ein JSON-Objekt enthalten")
+
+    patterns = StatusPatterns.from_dict(data)
+    # Standard-Muster laufen direkt im Event-Loop, daher gelten dieselben Regeln wie für /addpattern
+    for category in PATTERN_CATEGORIES:
+        for pattern in getattr(patterns, category):
+            problem = check_pattern(pattern, BotConstants.PATTERN_MAX_LENGTH)
+            if problem:
+                raise ValueError(f"Muster '{pattern}' ({category}): {problem}")
+    return patterns
+
+def _classify_snapshot(config: Dict[str, List[str]], messages: List[Tuple[str, str]]) -> Dict[str, BotStatus]:
+    """
+    Läuft im Thread: Stapelklassifizierung auf einer eigenen Kopie des Mustersets.
+
+    Der Event-Loop ersetzt Reihenfolge und Vorfilter des laufenden Sets jederzeit; die
+    Kopie ist davon unabhängig und schreibt keine Backfill-Daten in die Trefferstatistik.
+    """
+    return StatusPatterns.from_dict(config).classify_many(messages)
+
+class PatternManager:
+    """
+    Verwaltet Mustersets pro Guild und pro Log-Channel.
+
+    Auflösung: Channel-Set > Guild-Set > Standard-Muster, jeweils pro Kategorie.
+    Aufgelöste Sets werden bei Bedarf kompiliert und in einem begrenzten LRU-Cache
+    gehalten, der über das Musterset selbst adressiert wird - Channels mit identischer
+    Konfiguration teilen sich also einen Matcher.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.guild_patterns: Dict[str, Dict[str, List[str]]] = {}
+        self.channel_patterns: Dict[str, Dict[str, List[str]]] = {}
+        self._matchers: "OrderedDict[PatternSetKey, StatusPatterns]" = OrderedDict()
+        self._channel_keys: Dict[str, Optional[PatternSetKey]] = {}
+        self.cache_size = BotConstants.PATTERN_CACHE_SIZE
+
+        # Benutzerdefinierte Mustersets laufen mit Zeitbudget in einem eigenen Prozess;
+        # Sets, die das Budget sprengen, werden bis zum nächsten Laden deaktiviert
+        self.sandbox = PatternSandbox(BotConstants.PATTERN_MATCH_BUDGET_MS / 1000, BotConstants.PATTERN_SANDBOX_WORKERS)
+        self._quarantined: Set[PatternSetKey] = set()
+        # Reihenfolge der Sandbox-Sets: Schlüssel -> Schlüssel mit nach Treffern sortierten Mustern
+        self._sandbox_order: Dict[PatternSetKey, PatternSetKey] = {}
+
+        # Trefferstatistik aller Mustersets, bestimmt die Reihenfolge innerhalb der Prioritätsstufen
+        self.stats = PatternStats()
+        self.bot.patterns.stats = self.stats
+        self.maintenance_task = tasks.loop(seconds=BotConstants.PATTERN_STATS_INTERVAL)(self.maintain_patterns)
+
+        # Standard-Muster aus der Musterdatei; jede übernommene Änderung erhöht die Version
+        self.patterns_file = Path(self.bot.data_manager.data_dir) / "json" / PATTERN_FILE
+        self.patterns_version = 0
+        self._patterns_signature: Optional[Tuple[int, int]] = None
+        self.reload_task = tasks.loop(seconds=BotConstants.PATTERN_RELOAD_INTERVAL)(self.watch_pattern_file)
+
+    def load_data(self):
+        """Lädt die Musterset-Konfiguration"""
+        data = self.bot.data_manager.load_json("pattern_sets.json")
+        self.guild_patterns = data.get("guilds", {})
+        self.channel_patterns = data.get("channels", {})
+        self._invalidate()
+        self._quarantined.clear()
+        logger.info(f"Mustersets geladen: {len(self.guild_patterns)} Guilds, {len(self.channel_patterns)} Kanäle")
+
+        self.stats.load(self.bot.data_manager.load_json("pattern_stats.json"))
+        self._load_default_patterns()
+        self.bot.patterns.reorder_patterns()
+        logger.info(f"Muster-Statistik geladen: {len(self.stats.entries)} Muster mit Treffern")
+
+    def start_tasks(self):
+        """Startet die periodische Musterpflege und die Überwachung der Musterdatei"""
+        if not self.maintenance_task.is_running():
+            self.maintenance_task.start()
+            logger.info("Started pattern maintenance task")
+        if not self.reload_task.is_running():
+            self.reload_task.start()
+            logger.info(f"Started pattern file watcher for {self.patterns_file}")
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Änderungszeit und Größe der Musterdatei, None wenn sie nicht existiert"""
+        try:
+            stat = self.patterns_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_default_patterns(self):
+        """Lädt die Standard-Muster beim Start; legt die Musterdatei mit den eingebauten Mustern an, falls sie fehlt"""
+        signature = self._file_signature()
+        if signature is None:
+            self.bot.data_manager.save_json(self.bot.patterns.to_dict(), PATTERN_FILE)
+            self._patterns_signature = self._file_signature()
+            logger.info(f"Musterdatei {self.patterns_file} mit den eingebauten Mustern angelegt")
+            return
+        if signature == self._patterns_signature:
+            return
+
+        try:
+            patterns = load_pattern_file(self.patterns_file)
+        except Exception as e:
+            self._patterns_signature = signature
+            logger.error(f"Musterdatei {self.patterns_file} ungültig, verwende bisherige Muster: {e}")
+            return
+        self._swap_patterns(patterns, signature)
+
+    async def watch_pattern_file(self):
+        """Übernimmt Änderungen an der Musterdatei, ohne den Bot neu zu starten"""
+        signature = self._file_signature()
+        if signature is None or signature == self._patterns_signature:
+            return
+
+        try:
+            # Einlesen, Prüfen und Kompilieren außerhalb des Event-Loops
+            loop = asyncio.get_running_loop()
+            patterns = await loop.run_in_executor(None, load_pattern_file, self.patterns_file)
+        except Exception as e:
+            # Gleiche Datei nicht erneut versuchen; die nächste Änderung wird wieder geprüft
+            self._patterns_signature = signature
+            logger.error(f"Musterdatei {self.patterns_file} ungültig, Version {self.patterns_version} bleibt aktiv: {e}")
+            return
+        self._swap_patterns(patterns, signature)
+
+    def _swap_patterns(self, patterns: StatusPatterns, signature: Tuple[int, int]):
+        """
+        Ersetzt die Standard-Muster in einem Schritt. Laufende Auswertungen behalten
+        ihre Referenz auf das alte Musterset und werden normal abgeschlossen.
+        """
+        patterns.stats = self.stats
+        patterns.reorder_patterns()
+
+        self.bot.patterns = patterns
+        self._patterns_signature = signature
+        self.patterns_version += 1
+
+        # Geerbte Standard-Muster sind Teil der aufgelösten Sets
+        self._matchers.clear()
+        self._invalidate()
+        self._quarantined.clear()
+
+        logger.info(
+            f"Standard-Muster Version {self.patterns_version} aktiv: {len(patterns.offline)} Offline, "
+            f"{len(patterns.error)} Fehler, {len(patterns.online)} Online"
+        )
+
+    async def maintain_patterns(self):
+        """Sortiert die Muster nach Trefferhäufigkeit und speichert die Statistik"""
+        try:
+            if not self.stats.dirty:
+                return
+
+            reordered = 0
+            for matcher in [self.bot.patterns, *self._matchers.values()]:
+                if matcher.reorder_patterns():
+                    reordered += 1
+            # Sandbox-Sets: der Worker kompiliert das Set mit der neuen Reihenfolge beim nächsten Aufruf
+            for key, ordered in list(self._sandbox_order.items()):
+                new_order = self._order_key(key)
+                if new_order != ordered:
+                    self._sandbox_order[key] = new_order
+                    reordered += 1
+            if reordered:
+                logger.info(f"Musterreihenfolge für {reordered} Mustersets nach Trefferhäufigkeit angepasst")
+
+            self.save_stats()
+        except Exception as e:
+            logger.error(f"Fehler bei der Musterpflege: {e}", exc_info=True)
+
+    def save_stats(self):
+        """Speichert die Muster-Statistik"""
+        if self.bot.data_manager.save_json(self.stats.to_dict(), "pattern_stats.json"):
+            self.stats.dirty = False
+
+    def save_data(self):
+        """Speichert die Musterset-Konfiguration"""
+        data = {"guilds": self.guild_patterns, "channels": self.channel_patterns}
+        self.bot.data_manager.save_json(data, "pattern_sets.json")
+
+    def _invalidate(self):
+        """Verwirft die Channel-Zuordnungen nach einer Konfigurationsänderung"""
+        self._channel_keys.clear()
+        self._sandbox_order.clear()
+
+    def _order_key(self, key: PatternSetKey) -> PatternSetKey:
+        """Sortiert die Muster jeder Kategorie nach Treffern (wie StatusPatterns.reorder_patterns)"""
+        return tuple(
+            tuple(sorted(patterns, key=lambda pattern: -self.stats.hits(status, pattern)))
+            for patterns, status in zip(key, CATEGORY_STATUSES)
+        )
+
+    def _sandbox_key(self, key: PatternSetKey) -> PatternSetKey:
+        """Schlüssel, mit dem ein Set in der Sandbox ausgewertet wird; die Reihenfolge ändert nur maintain_patterns"""
+        ordered = self._sandbox_order.get(key)
+        if ordered is None:
+            ordered = self._sandbox_order[key] = self._order_key(key)
+        return ordered
+
+    def resolve(self, guild_id: Optional[str], channel_id: Optional[str]) -> Dict[str, List[str]]:
+        """Löst das effektive Musterset für einen Log-Channel auf"""
+        defaults = self.bot.patterns
+        guild_set = self.guild_patterns.get(guild_id, {}) if guild_id else {}
+        channel_set = self.channel_patterns.get(channel_id, {}) if channel_id else {}
+
+        resolved = {}
+        for category in PATTERN_CATEGORIES:
+            if category in channel_set:
+                resolved[category] = list(channel_set[category])
+            elif category in guild_set:
+                resolved[category] = list(guild_set[category])
+            else:
+                resolved[category] = list(getattr(defaults, category))
+        return resolved
+
+    def _key_for(self, guild_id: str, channel_id: str) -> Optional[PatternSetKey]:
+        """Gibt den Cache-Schlüssel zurück, None wenn die Standard-Muster gelten"""
+        if channel_id in self._channel_keys:
+            return self._channel_keys[channel_id]
+
+        if guild_id not in self.guild_patterns and channel_id not in self.channel_patterns:
+            key = None
+        else:
+            resolved = self.resolve(guild_id, channel_id)
+            key = tuple(tuple(resolved[category]) for category in PATTERN_CATEGORIES)
+        self._channel_keys[channel_id] = key
+        return key
+
+    def get_patterns(self, guild_id: str, channel_id: str) -> StatusPatterns:
+        """Gibt den kompilierten Matcher für einen Log-Channel zurück"""
+        key = self._key_for(guild_id, channel_id)
+        if key is None or key in self._quarantined:
+            return self.bot.patterns
+
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            self._matchers.move_to_end(key)
+            return matcher
+
+        offline, error, online = key
+        matcher = StatusPatterns(offline=list(offline), error=list(error), online=list(online), stats=self.stats)
+        self._matchers[key] = matcher
+        if len(self._matchers) > self.cache_size:
+            self._matchers.popitem(last=False)
+        logger.debug(f"Musterset für Channel {channel_id} kompiliert ({len(self._matchers)} im Cache)")
+        return matcher
+
+    def is_quarantined(self, guild_id: str, channel_id: str) -> bool:
+        """Prüft, ob das Musterset eines Log-Channels wegen Zeitüberschreitung deaktiviert ist"""
+        key = self._key_for(guild_id, channel_id)
+        return key is not None and key in self._quarantined
+
+    async def classify(self, guild_id: str, channel_id: str, content: str, normalized: bool = False) -> Optional[BotStatus]:
+        """
+        Klassifiziert eine Log-Nachricht mit dem Musterset des Channels.
+
+        Standard-Muster werden direkt ausgewertet. Benutzerdefinierte Sets laufen in der
+        Sandbox; überschreitet ein Set das Zeitbudget, fällt nur dieser Channel auf die
+        Standard-Muster zurück. Kann die Sandbox selbst nicht auswerten (z.B. Worker startet
+        nicht), gelten die Standard-Muster nur für diese Nachricht. Treffer und Kosten aus der Sandbox fließen in dieselbe
+        Statistik, die Reihenfolge wird dem Worker mit dem Schlüssel übergeben.
+        """
+        key = self._key_for(guild_id, channel_id)
+        if key is None or key in self._quarantined or not BotConstants.PATTERN_SANDBOX:
+            return self.get_patterns(guild_id, channel_id).check_patterns(content, normalized)
+
+        try:
+            result = await self.sandbox.classify(self._sandbox_key(key), content, normalized)
+        except PatternTimeout as e:
+            self._quarantined.add(key)
+            logger.error(f"Musterset von Channel {channel_id} deaktiviert: {e}. Verwende Standard-Muster.")
+            return self.bot.patterns.check_patterns(content, normalized)
+        except PatternSandboxError as e:
+            logger.error(f"Musterset von Channel {channel_id} nicht ausgewertet: {e}. Verwende einmalig Standard-Muster.")
+            return self.bot.patterns.check_patterns(content, normalized)
+
+        if result is None:
+            return None
+        status, pattern, seconds = result
+        self.stats.record_hit(status, pattern)
+        if seconds is not None:
+            self.stats.record_cost(status, pattern, seconds)
+        logger.debug(f"Muster '{pattern}' ({status.value}) erkannt in Channel {channel_id}")
+        return status
+
+    async def classify_history(self, guild_id: str, channel_id: str, messages: List[Tuple[str, str]]) -> Dict[str, BotStatus]:
+        """
+        Stapelklassifizierung für /backfill mit dem Musterset des Channels.
+
+        Es gelten dieselben Regeln wie bei classify: benutzerdefinierte Sets laufen in der
+        Sandbox (mit Zeitbudget für den ganzen Verlauf), bei Zeitüberschreitung wird das Set
+        deaktiviert und der Verlauf mit den Standard-Mustern ausgewertet. Bei einem Fehler der
+        Sandbox selbst gelten die Standard-Muster nur für diesen Verlauf.
+        """
+        key = self._key_for(guild_id, channel_id)
+        loop = asyncio.get_running_loop()
+        if key is not None and key not in self._quarantined and BotConstants.PATTERN_SANDBOX:
+            try:
+                results = await self.sandbox.classify_many(self._sandbox_key(key), messages, BotConstants.PATTERN_BACKFILL_TIMEOUT)
+            except PatternTimeout as e:
+                self._quarantined.add(key)
+                logger.error(f"Musterset von Channel {channel_id} deaktiviert: {e}. Verwende Standard-Muster.")
+                patterns = self.bot.patterns
+            except PatternSandboxError as e:
+                logger.error(f"Musterset von Channel {channel_id} nicht ausgewertet: {e}. Verwende einmalig Standard-Muster.")
+                patterns = self.bot.patterns
+            else:
+                return results
+        else:
+            patterns = self.get_patterns(guild_id, channel_id)
+
+        # Standard-Muster (bzw. ohne Sandbox das eigene Set) im Thread, damit der Event-Loop frei bleibt
+        return await loop.run_in_executor(None, _classify_snapshot, patterns.to_dict(), messages)
+
+    def _scope(self, guild_id: str, channel_id: Optional[str]) -> Tuple[Dict[str, Dict[str, List[str]]], str]:
+        """Gibt Speicherort und Schlüssel für eine Guild- oder Channel-Konfiguration zurück"""
+        if channel_id:
+            return self.channel_patterns, channel_id
+        return self.guild_patterns, guild_id
+
+    def add_pattern(self, guild_id: str, category: str, pattern: str, channel_id: Optional[str] = None) -> bool:
+        """Fügt ein Muster hinzu; die Kategorie übernimmt dabei zunächst die geerbten Muster"""
+        store, scope_id = self._scope(guild_id, channel_id)
+        scope = store.setdefault(scope_id, {})
+        if category not in scope:
+            scope[category] = self.resolve(guild_id, channel_id)[category]
+        if pattern in scope[category]:
+            return False
+
+        scope[category].append(pattern)
+        self._invalidate()
+        self.save_data()
+        logger.info(f"Muster '{pattern}' ({category}) hinzugefügt für {'Channel' if channel_id else 'Guild'} {scope_id}")
+        return True
+
+    def remove_pattern(self, guild_id: str, category: str, pattern: str, channel_id: Optional[str] = None) -> bool:
+        """Entfernt ein Muster; die Kategorie übernimmt dabei zunächst die geerbten Muster"""
+        store, scope_id = self._scope(guild_id, channel_id)
+        inherited = self.resolve(guild_id, channel_id)[category]
+        if pattern not in inherited:
+            return False
+
+        scope = store.setdefault(scope_id, {})
+        scope[category] = [p for p in inherited if p != pattern]
+        self._invalidate()
+        self.save_data()
+        logger.info(f"Muster '{pattern}' ({category}) entfernt für {'Channel' if channel_id else 'Guild'} {scope_id}")
+        return True
+
+    def reset_patterns(self, guild_id: str, channel_id: Optional[str] = None) -> bool:
+        """Entfernt ein Guild- oder Channel-Musterset, danach gelten wieder die geerbten Muster"""
+        store, scope_id = self._scope(guild_id, channel_id)
+        if scope_id not in store:
+            return False
+
+        del store[scope_id]
+        self._invalidate()
+        self.save_data()
+        logger.info(f"Musterset zurückgesetzt für {'Channel' if channel_id else 'Guild'} {scope_id}")
+        return True
+
+    def remove_channel(self, channel_id: str):
+        """Entfernt die Konfiguration eines nicht mehr überwachten Log-Channels"""
+        if channel_id in self.channel_patterns:
+            del self.channel_patterns[channel_id]
+            self._invalidate()
+            self.save_data()
+
+    def get_cache_info(self) -> Dict[str, int]:
+        """Gibt Informationen über den Matcher-Cache und die Zeilen-Caches aller Mustersets zurück"""
+        line_hits = 0
+        line_misses = 0
+        for matcher in [self.bot.patterns, *self._matchers.values()]:
+            info = matcher.cache_info()
+            line_hits += info["hits"]
+            line_misses += info["misses"]
+
+        return {
+            "compiled": len(self._matchers),
+            "max_size": self.cache_size,
+            "channels": len(self._channel_keys),
+            "line_hits": line_hits,
+            "line_misses": line_misses,
+            "version": self.patterns_version,
+        }
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from bot_status import BotStatus
+
+logger = logging.getLogger('StatusBot')
+
+# Kompilierte Mustersets im Worker-Prozess, adressiert über die Set-ID
+_worker_matchers = OrderedDict()
+_WORKER_CACHE_SIZE = 32
+# Set-IDs, die sich der Hauptprozess merkt (ältere Sets bekommen beim nächsten Aufruf eine neue ID)
+_SET_ID_CACHE_SIZE = 4 * _WORKER_CACHE_SIZE
+# Obergrenze für den Start des Worker-Prozesses
+_STARTUP_TIMEOUT = 30
+
+class _UnknownPatternSet(Exception):
+    """Der Worker kennt die Set-ID nicht (neu gestartet oder aus dem Cache verdrängt)"""
+
+def _worker_matcher(set_id: int, key):
+    """
+    Läuft im Worker-Prozess: gibt den (zwischengespeicherten) Matcher für eine Set-ID zurück.
+    Die Muster selbst (key) werden nur übertragen, wenn der Worker das Set noch nicht kennt.
+    """
+    from utils.status_patterns import StatusPatterns
+
+    matcher = _worker_matchers.get(set_id)
+    if matcher is not None:
+        _worker_matchers.move_to_end(set_id)
+        return matcher
+    if key is None:
+        raise _UnknownPatternSet(set_id)
+
+    offline, error, online = key
+    matcher = StatusPatterns(offline=list(offline), error=list(error), online=list(online))
+    _worker_matchers[set_id] = matcher
+    if len(_worker_matchers) > _WORKER_CACHE_SIZE:
+        _worker_matchers.popitem(last=False)
+    return matcher
+
+def _classify_many_in_worker(set_id: int, key, messages: List[Tuple[Hashable, str]]) -> Dict[Hashable, str]:
+    """Läuft im Worker-Prozess: Stapelklassifizierung (Backfill) mit dem Musterset der Set-ID"""
+    results = _worker_matcher(set_id, key).classify_many(messages)
+    return {channel: status.value for channel, status in results.items()}
+
+def _classify_in_worker(set_id: int, key, content: str, normalized: bool) -> Optional[Tuple[str, str, Optional[float]]]:
+    """
+    Läuft im Worker-Prozess: klassifiziert eine Nachricht mit dem Musterset der Set-ID.
+
+    Das Set enthält die Muster bereits in der Reihenfolge nach Trefferhäufigkeit. Zurück
+    kommen (Status, Muster, Sekunden); die Dauer ist None, wenn die Zeile aus dem Cache kam.
+    """
+    matcher = _worker_matcher(set_id, key)
+    misses = matcher.cache_info()["misses"]
+    start = time.perf_counter()
+    result = matcher.match(content, normalized)
+    seconds = time.perf_counter() - start if matcher.cache_info()["misses"] != misses else None
+    return (result[0].value, result[1], seconds) if result else None
+
+def _warm_up() -> bool:
+    """Läuft im Worker-Prozess: lädt die Module vorab, damit der Start nicht ins Zeitbudget fällt"""
+    from utils.status_patterns import StatusPatterns
+    return StatusPatterns is not None
+
+class PatternTimeout(Exception):
+    """Ein Musterset hat sein Zeitbudget überschritten"""
+
+class PatternSandboxError(Exception):
+    """Die Sandbox konnte die Auswertung nicht durchführen (z.B. Worker startet nicht); das Musterset ist nicht schuld"""
+
+class _SandboxWorker:
+    """Ein Worker-Prozess der Sandbox; wird nach einer Zeitüberschreitung einzeln neu gestartet"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self._pool = None
+        # Set-IDs, deren Muster dieser Worker bereits erhalten hat
+        self.known: Set[int] = set()
+
+    async def get_pool(self):
+        """
+        Raises:
+            PatternSandboxError: Wenn der Worker-Prozess nicht rechtzeitig startet
+        """
+        if self._pool is None:
+            pool = multiprocessing.get_context("spawn").Pool(processes=1)
+            pending = pool.apply_async(_warm_up)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, pending.get, _STARTUP_TIMEOUT)
+            except Exception as e:
+                pool.terminate()
+                raise PatternSandboxError(f"Muster-Sandbox konnte nicht gestartet werden: {e!r}")
+            self._pool = pool
+            logger.info(f"Muster-Sandbox-Worker {self.index} gestartet")
+        return self._pool
+
+    def reset(self):
+        """Beendet den Worker-Prozess; beim nächsten Aufruf wird ein neuer gestartet"""
+        self.known.clear()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+            logger.warning(f"Muster-Sandbox-Worker {self.index} beendet und wird neu gestartet")
+
+class PatternSandbox:
+    """
+    Wertet benutzerdefinierte Mustersets in eigenen Prozessen mit Zeitbudget aus.
+
+    Die Regex-Engine gibt den GIL während einer Suche nicht frei; ein hängendes Muster
+    würde im Bot-Prozess den gesamten Event-Loop blockieren. Im Worker wird es nach
+    Ablauf des Budgets samt Prozess beendet. Mehrere Worker laufen parallel, jeder
+    wertet eine Nachricht zur Zeit aus: eine Zeitüberschreitung ist damit eindeutig
+    zuzuordnen und trifft beim Neustart nur diesen Worker, die übrigen Channels laufen
+    auf den anderen Workern weiter.
+
+    Jedes Musterset bekommt eine Set-ID; die Muster werden nur beim ersten Aufruf je
+    Worker übertragen, danach nur noch die ID.
+    """
+
+    def __init__(self, timeout: float, workers: int = 1):
+        self.timeout = timeout
+        self._workers = [_SandboxWorker(index) for index in range(max(1, workers))]
+        # Freie Worker; wird erst im laufenden Event-Loop angelegt
+        self._idle: Optional[asyncio.Queue] = None
+        # Musterset -> Set-ID; IDs werden nie wiederverwendet
+        self._set_ids: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._next_set_id = 0
+
+    def _idle_workers(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+        return self._idle
+
+    def _set_id(self, key) -> int:
+        set_id = self._set_ids.get(key)
+        if set_id is not None:
+            self._set_ids.move_to_end(key)
+            return set_id
+        self._next_set_id += 1
+        self._set_ids[key] = self._next_set_id
+        if len(self._set_ids) > _SET_ID_CACHE_SIZE:
+            self._set_ids.popitem(last=False)
+        return self._next_set_id
+
+    async def classify(self, key, content: str, normalized: bool = False) -> Optional[Tuple[BotStatus, str, Optional[float]]]:
+        """
+        Klassifiziert eine Nachricht in einem freien Worker-Prozess.
+
+        Returns:
+            Optional[Tuple[BotStatus, str, Optional[float]]]: Status, Muster und Auswertungsdauer
+                                                             (None bei Treffer aus dem Zeilen-Cache)
+
+        Raises:
+            PatternTimeout: Wenn die Auswertung das Zeitbudget überschreitet
+            PatternSandboxError: Wenn die Sandbox die Auswertung nicht durchführen konnte
+        """
+        result = await self._run(_classify_in_worker, key, (content, normalized), self.timeout)
+        if result is None:
+            return None
+        status_value, pattern, seconds = result
+        return BotStatus(status_value), pattern, seconds
+
+    async def classify_many(self, key, messages: List[Tuple[Hashable, str]], timeout: float) -> Dict[Hashable, BotStatus]:
+        """
+        Stapelklassifizierung (Backfill) in einem freien Worker-Prozess.
+
+        Raises:
+            PatternTimeout: Wenn die gesamte Auswertung länger als timeout dauert
+            PatternSandboxError: Wenn die Sandbox die Auswertung nicht durchführen konnte
+        """
+        results = await self._run(_classify_many_in_worker, key, (messages,), timeout)
+        return {channel: BotStatus(status_value) for channel, status_value in results.items()}
+
+    async def _run(self, func, key, args: tuple, timeout: float):
+        """Führt func in einem freien Worker aus; bei Zeitüberschreitung wird nur dieser Worker neu gestartet"""
+        set_id = self._set_id(key)
+        idle = self._idle_workers()
+        worker = await idle.get()
+        try:
+            pool = await worker.get_pool()
+            try:
+                result = await self._call(worker, pool, func, (set_id, None if set_id in worker.known else key, *args), timeout)
+            except _UnknownPatternSet:
+                # Vom Worker verdrängt: Muster erneut mitschicken
+                result = await self._call(worker, pool, func, (set_id, key, *args), timeout)
+            worker.known.add(set_id)
+            return result
+        finally:
+            idle.put_nowait(worker)
+
+    async def _call(self, worker: _SandboxWorker, pool, func, args: tuple, timeout: float):
+        pending = pool.apply_async(func, args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, pending.get, timeout)
+        except multiprocessing.TimeoutError:
+            worker.reset()
+            raise PatternTimeout(f"Auswertung dauerte länger als {timeout:.2f}s")
+        except asyncio.CancelledError:
+            # Die Auswertung läuft im Worker weiter und würde dem nächsten Aufruf angelastet
+            worker.reset()
+            raise
+        except _UnknownPatternSet:
+            worker.known.discard(args[0])
+            raise
+        except Exception as e:
+            # Fehler beim Übertragen oder im Worker, kein Zeitproblem des Mustersets
+            raise PatternSandboxError(f"Auswertung in der Sandbox fehlgeschlagen: {e!r}") from e
+
+    def reset(self):
+        """Beendet alle Worker-Prozesse"""
+        for worker in self._workers:
+            worker.reset()
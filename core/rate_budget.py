@@ -0,0 +1,129 @@
+import discord
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+from config.constants import BotConstants
+
+logger = logging.getLogger('StatusBot')
+
+# Route -> (Aufrufe, Fenster in Sekunden); Schlüssel sind immer (Route, Channel-ID)
+RouteLimits = Dict[str, Tuple[int, float]]
+
+class RateBudget:
+    """
+    Budget pro Channel und Route für einen Bot-Token.
+
+    Merkt sich die Zeitpunkte der letzten Aufrufe (gleitendes Fenster) und Sperren aus
+    429-Antworten, und sagt daraus voraus, wann der nächste Aufruf erlaubt ist, statt
+    das Limit erst durch einen 429 zu entdecken. Angefragte Änderungen, die noch warten
+    müssen, werden pro Schlüssel zusammengefasst: es läuft höchstens ein Timer, und beim
+    Ablauf wird nur die zuletzt angefragte Änderung ausgeführt.
+    """
+
+    def __init__(self, limits: RouteLimits, name: str):
+        self.limits = limits
+        self.name = name
+        self._calls: Dict[Tuple[str, int], Deque[float]] = {}
+        self._blocked_until: Dict[Tuple[str, int], float] = {}
+        self._deferred: Dict[Tuple[str, int], Callable[[], Awaitable[None]]] = {}
+        self._timers: Dict[Tuple[str, int], asyncio.Task] = {}
+
+    def next_allowed(self, route: str, channel_id: int, now: Optional[float] = None) -> float:
+        """Frühester Zeitpunkt, zu dem ein weiterer Aufruf erlaubt ist"""
+        now = time.time() if now is None else now
+        key = (route, channel_id)
+        allowed = max(now, self._blocked_until.get(key, 0.0))
+        limit, window = self.limits[route]
+        calls = self._calls.get(key)
+        if calls and len(calls) >= limit:
+            allowed = max(allowed, calls[-limit] + window)
+        return allowed
+
+    def record(self, route: str, channel_id: int, now: Optional[float] = None):
+        """Erfasst einen durchgeführten Aufruf"""
+        key = (route, channel_id)
+        calls = self._calls.get(key)
+        if calls is None:
+            calls = self._calls[key] = deque(maxlen=self.limits[route][0])
+        calls.append(time.time() if now is None else now)
+
+    def penalize(self, route: str, channel_id: int, retry_after: float, now: Optional[float] = None):
+        """Übernimmt die Sperre aus einer 429-Antwort"""
+        now = time.time() if now is None else now
+        key = (route, channel_id)
+        self._blocked_until[key] = max(self._blocked_until.get(key, 0.0), now + retry_after)
+        logger.warning(f"Rate-Limit ({self.name}) für {route} in Channel {channel_id}: gesperrt für {retry_after:.0f}s")
+
+    def plan(self, route: str, channel_id: int, helper: Optional['RateBudget'] = None) -> Tuple[str, float]:
+        """
+        Entscheidet, wer einen Aufruf ausführt.
+
+        Returns:
+            Tuple[str, float]: ("main", jetzt), ("helper", jetzt) wenn nur der Helfer-Token sofort
+                               Kapazität hat, sonst ("defer", Zeitpunkt der frühesten Kapazität)
+        """
+        now = time.time()
+        main_at = self.next_allowed(route, channel_id, now)
+        if main_at <= now:
+            return "main", now
+        if helper is None:
+            return "defer", main_at
+        helper_at = helper.next_allowed(route, channel_id, now)
+        if helper_at <= now:
+            return "helper", now
+        # Beim Ablauf wird neu entschieden, der Helfer kommt also nur zum Zug, wenn er früher frei ist
+        return "defer", min(main_at, helper_at)
+
+    def defer(self, route: str, channel_id: int, at: float, apply: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Plant apply für den Zeitpunkt at. Wartet bereits eine Änderung, wird sie durch apply ersetzt.
+
+        Returns:
+            bool: True, wenn eine wartende Änderung ersetzt wurde
+        """
+        key = (route, channel_id)
+        self._deferred[key] = apply
+        timer = self._timers.get(key)
+        if timer is not None and not timer.done():
+            return True
+        self._timers[key] = asyncio.create_task(self._run_deferred(key, at))
+        return False
+
+    def has_deferred(self, route: str, channel_id: int) -> bool:
+        return (route, channel_id) in self._deferred
+
+    def cancel_deferred(self, route: str, channel_id: int):
+        """Verwirft eine wartende Änderung (z.B. wenn der Zielzustand bereits erreicht ist)"""
+        key = (route, channel_id)
+        self._deferred.pop(key, None)
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def _run_deferred(self, key: Tuple[str, int], at: float):
+        try:
+            await asyncio.sleep(max(0.0, at - time.time()))
+        finally:
+            if self._timers.get(key) is asyncio.current_task():
+                del self._timers[key]
+        apply = self._deferred.pop(key, None)
+        if apply is None:
+            return
+        try:
+            await apply()
+        except Exception as e:
+            logger.error(f"Fehler bei verzögerter Ausführung von {key[0]} für Channel {key[1]}: {e}", exc_info=True)
+
+    def pending_count(self) -> int:
+        return len(self._deferred)
+
+def retry_after_from(error: Exception) -> Optional[float]:
+    """Wartezeit aus einer Rate-Limit-Ausnahme, None wenn es keine ist"""
+    if isinstance(error, discord.RateLimited):
+        return error.retry_after
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        # discord.py wartet kurze Sperren selbst ab; hier landen nur lange (z.B. Umbenennungen)
+        return float(getattr(error, 'retry_after', None) or BotConstants.RENAME_WINDOW)
+    return None
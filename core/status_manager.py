@@ -1,48 +1,137 @@
 import discord
-from discord.ext import tasks
 import logging
 import time
 import asyncio
-from typing import Dict, Optional
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from datetime import datetime
 from bot_status import BotStatus
 from config.constants import BotConstants
+from utils.message_normalizer import MessageNormalizer
+from utils.interarrival_stats import InterArrivalStats
+from utils.transition_stats import TransitionStats
+from .channel_state import ChannelState, DeferredTransition, states_from_json, states_to_json
+from .deadline_scheduler import DeadlineScheduler
+from .history_writer import HistoryWriter
 
 logger = logging.getLogger('StatusBot')
 
 class StatusManager:
     def __init__(self, bot):
         self.bot = bot
-        self.last_known_status: Dict[str, str] = {}
-        self.last_message_times: Dict[str, float] = {}
-        self.continuous_activity: Dict[str, float] = {}
-        self.last_status_update: Dict[str, Dict[str, float]] = {}
-        self.check_inactivity_task = tasks.loop(seconds=10)(self.check_inactivity)
-        self.check_inactivity_task.before_loop(self.before_check_inactivity)
-
-    def initialize_tasks(self):
-        """Initialize inactivity check task"""
-        self.check_inactivity_task = tasks.loop(seconds=10)(self.check_inactivity)
-        self.check_inactivity_task.before_loop(self.before_check_inactivity)
+        # Laufzeitzustand pro Log-Channel, adressiert über die int-ID
+        self.channels: Dict[int, ChannelState] = {}
+        self.normalizer = MessageNormalizer(BotConstants.MESSAGE_MAX_LENGTH)
+        # Inaktivitäts- und Aktivitätsfristen pro Channel statt periodischem Scan aller Kanäle
+        self.scheduler = DeadlineScheduler(self._on_deadline)
+        self.transition_stats = TransitionStats()
+        self.history = HistoryWriter(bot)
 
     def start_tasks(self):
         """Start the tasks if they're not already running"""
         try:
-            if not self.check_inactivity_task.is_running():
-                self.check_inactivity_task.start()
-                logger.info("Started inactivity check task")
+            if not self.scheduler.is_running():
+                self.scheduler.start(self.bot.wait_until_ready)
+                logger.info(f"Started inactivity scheduler ({len(self.scheduler)} Fristen geplant)")
             else:
-                logger.info("Inactivity check task is already running")
+                logger.info("Inactivity scheduler is already running")
         except Exception as e:
             logger.error(f"Error starting tasks: {e}", exc_info=True)
 
-    def update_last_message_time(self, channel_id: str):
-        """Aktualisiert die letzte Nachrichtenzeit für einen Channel"""
+    def get_state(self, channel_id: int) -> ChannelState:
+        """Gibt den Zustand eines Log-Channels zurück und legt ihn bei Bedarf an"""
+        state = self.channels.get(channel_id)
+        if state is None:
+            state = self.channels[channel_id] = ChannelState()
+        return state
+
+    def get_status(self, channel_id: int) -> Optional[BotStatus]:
+        """Gibt den zuletzt bekannten Status eines Log-Channels zurück"""
+        state = self.channels.get(channel_id)
+        return state.status if state else None
+
+    def remove_channel(self, channel_id: int, save: bool = True):
+        """Entfernt den Zustand eines nicht mehr überwachten Log-Channels"""
+        state = self.channels.pop(channel_id, None)
+        if state is None:
+            return
+        if state.flush_task:
+            state.flush_task.cancel()
+        if state.deferred and state.deferred.task:
+            state.deferred.task.cancel()
+        self.scheduler.cancel(channel_id)
+        if save:
+            self.save_status()
+
+    def save_status(self):
+        """Speichert die bekannten Status (Format von last_known_status.json bleibt erhalten)"""
+        self.bot.data_manager.save_json(states_to_json(self.channels), "last_known_status.json")
+
+    def learned_threshold(self, channel_id: int) -> Optional[float]:
+        """Aus den Nachrichtenabständen gelernte Inaktivitätsschwelle (None während der Lernphase)"""
+        state = self.channels.get(channel_id)
+        if not BotConstants.LEARNED_THRESHOLDS or state is None or state.arrivals is None:
+            return None
+        return state.arrivals.threshold(
+            BotConstants.LEARNED_THRESHOLD_FACTOR,
+            BotConstants.LEARNED_THRESHOLD_MIN_SAMPLES,
+            BotConstants.LEARNED_THRESHOLD_MIN,
+            BotConstants.LEARNED_THRESHOLD_MAX
+        )
+
+    def get_inactivity_threshold(self, channel_id: int) -> float:
+        """Wirksame Inaktivitätsschwelle: eigene Schwelle vor gelernter vor globaler"""
+        override = self.bot.channel_manager.get_inactivity_override(channel_id)
+        if override:
+            return override
+        learned = self.learned_threshold(channel_id)
+        return learned if learned is not None else BotConstants.INACTIVITY_THRESHOLD
+
+    def _next_deadline(self, channel_id: int, state: ChannelState) -> Optional[float]:
+        """Nächste Frist eines Channels: Inaktivität bei Online, kontinuierliche Aktivität bei Problem"""
+        if state.status == BotStatus.ONLINE and state.last_message_time:
+            return state.last_message_time + self.get_inactivity_threshold(channel_id)
+        if state.status == BotStatus.PROBLEM and state.activity_start:
+            _, recovery = self.bot.channel_manager.get_thresholds(channel_id)
+            return state.activity_start + recovery
+        return None
+
+    def arm(self, channel_id: int):
+        """Plant die nächste Frist eines Channels (z.B. nach Statuswechsel oder Aufhebung des Ausschlusses)"""
+        state = self.channels.get(channel_id)
+        if state is None:
+            return
+        deadline = self._next_deadline(channel_id, state)
+        if deadline is not None:
+            self.scheduler.schedule(channel_id, deadline)
+
+    def update_last_message_time(self, state: ChannelState, channel_id: int):
+        """Aktualisiert die letzte Nachrichtenzeit für einen Channel und plant seine Frist neu"""
         current_time = time.time()
-        previous_time = self.last_message_times.get(channel_id, 0)
+        previous_time = state.last_message_time
         time_since_last = current_time - previous_time if previous_time > 0 else 0
         
-        self.last_message_times[channel_id] = current_time
+        state.last_message_time = current_time
+
+        # Abstände innerhalb eines Bündels sagen nichts über Pausen aus; nach einem Problem-Reset
+        # (previous_time = 0) wird die Ausfallzeit nicht als normale Pause gelernt
+        if previous_time > 0 and time_since_last >= BotConstants.INGEST_WINDOW:
+            if state.arrivals is None:
+                state.arrivals = InterArrivalStats(
+                    BotConstants.LEARNED_THRESHOLD_QUANTILE,
+                    BotConstants.LEARNED_THRESHOLD_ALPHA
+                )
+            state.arrivals.add(time_since_last)
+
+        # Bei Problem-Status beginnt mit der ersten Nachricht das Activity-Tracking
+        if state.status == BotStatus.PROBLEM and not state.activity_start:
+            state.activity_start = current_time
+            logger.info(f"Starte neues Activity-Tracking für {channel_id}")
+
+        # Eine bereits geplante frühere Frist bleibt bestehen und wird beim Ablauf nachgeprüft,
+        # daher kostet das pro Nachricht nur einen Dict-Zugriff
+        deadline = self._next_deadline(channel_id, state)
+        if deadline is not None:
+            self.scheduler.schedule(channel_id, deadline)
         
         # Nur ausführliches Logging, wenn vorherige Zeit existiert und signifikante Zeit vergangen ist
         if previous_time > 0 and time_since_last > 10:
@@ -52,14 +141,20 @@ class StatusManager:
 
     def load_data(self):
         """Load status related data"""
-        self.last_known_status = self.bot.data_manager.load_json("last_known_status.json")
-        logger.info(f"Status-Daten geladen: {len(self.last_known_status)} Kanäle mit bekanntem Status")
+        # Bestehende Zustände (Zeitstempel, Puffer) bleiben erhalten, nur der Status wird übernommen
+        loaded = states_from_json(self.bot.data_manager.load_json("last_known_status.json"))
+        for channel_id, state in self.channels.items():
+            state.status = loaded[channel_id].status if channel_id in loaded else None
+        for channel_id, state in loaded.items():
+            self.channels.setdefault(channel_id, state)
+        logger.info(f"Status-Daten geladen: {len(loaded)} Kanäle mit bekanntem Status")
         
         # Detaillierte Debug-Informationen
-        online_count = sum(1 for status in self.last_known_status.values() if status == BotStatus.ONLINE.value)
-        offline_count = sum(1 for status in self.last_known_status.values() if status == BotStatus.OFFLINE.value)
-        problem_count = sum(1 for status in self.last_known_status.values() if status == BotStatus.PROBLEM.value)
-        maintenance_count = sum(1 for status in self.last_known_status.values() if status == BotStatus.MAINTENANCE.value)
+        statuses = [state.status for state in self.channels.values() if state.status]
+        online_count = statuses.count(BotStatus.ONLINE)
+        offline_count = statuses.count(BotStatus.OFFLINE)
+        problem_count = statuses.count(BotStatus.PROBLEM)
+        maintenance_count = statuses.count(BotStatus.MAINTENANCE)
         
         logger.info(f"Status-Verteilung: Online: {online_count}, Offline: {offline_count}, Problem: {problem_count}, Wartung: {maintenance_count}")
         
@@ -67,99 +162,85 @@ class StatusManager:
         current_time = time.time()
         online_channels_initialized = 0
         
-        for channel_id, status in self.last_known_status.items():
-            if status == BotStatus.ONLINE.value:
-                self.last_message_times[channel_id] = current_time
+        for state in self.channels.values():
+            if state.status == BotStatus.ONLINE:
+                state.last_message_time = current_time
                 online_channels_initialized += 1
                 
                 # Um sicherzustellen, dass kontinuierliche Aktivität nicht verloren geht
-                if channel_id not in self.continuous_activity:
-                    self.continuous_activity[channel_id] = current_time
+                if not state.activity_start:
+                    state.activity_start = current_time
         
         logger.info(f"Letzte Nachrichtenzeiten für {online_channels_initialized} Online-Kanäle initialisiert")
-        logger.info(f"Activity-Tracking für {len(self.continuous_activity)} Kanäle initialisiert")
+        logger.info(f"Activity-Tracking für {sum(1 for state in self.channels.values() if state.activity_start)} Kanäle initialisiert")
 
-    async def before_check_inactivity(self):
-        await self.bot.wait_until_ready()
+        for channel_id in self.channels:
+            self.arm(channel_id)
 
-    async def check_inactivity(self):
-        """Verbesserte Inaktivitätsprüfung mit korrektem Activity-Reset"""
-        if not self.bot.is_ready():
-            return
+    async def _on_deadline(self, channel_id: int) -> Optional[float]:
+        """
+        Wird vom Scheduler aufgerufen, wenn die Frist eines Channels abgelaufen ist.
+        Prüft den aktuellen Zustand nach (neuere Nachrichten verschieben die Frist nur
+        logisch) und gibt die nächste Frist zurück.
+        """
+        state = self.channels.get(channel_id)
+        if state is None:
+            return None
 
-        try:
-            current_time = time.time()
-            channels_to_check = []
-            
-            for guild_id, channels in self.bot.guild_channels.items():
-                for log_channel_id in channels.keys():
-                    channels_to_check.append((guild_id, log_channel_id))
-            
-            logger.debug(f"Inaktivitätsprüfung für {len(channels_to_check)} Kanäle")
-            
-            for guild_id, log_channel_id in channels_to_check:
-                try:
-                    if log_channel_id in self.bot.channel_manager.excluded_channels:
-                        continue
-
-                    channel_status = self.last_known_status.get(log_channel_id)
-                    if not channel_status or channel_status == BotStatus.OFFLINE.value:
-                        continue
-
-                    last_message_time = self.last_message_times.get(log_channel_id)
-                    
-                    # Bei Problem-Status: Prüfe auf neue Aktivität
-                    if channel_status == BotStatus.PROBLEM.value:
-                        if last_message_time:
-                            activity_duration = current_time - last_message_time
-                            logger.debug(f"Problem-Status Activity Check - Channel {log_channel_id}: "
-                                       f"Aktivität seit {activity_duration:.1f}s")
-                            
-                            # Nur wenn kontinuierlich aktiv für die Schwellzeit
-                            if activity_duration < BotConstants.ACTIVITY_CHECK_THRESHOLD:
-                                if log_channel_id not in self.continuous_activity:
-                                    self.continuous_activity[log_channel_id] = current_time
-                                    logger.info(f"Starte neues Activity-Tracking für {log_channel_id} (letzte Aktivität vor {activity_duration:.1f}s)")
-                            else:
-                                # Reset wenn Inaktivität zu lang
-                                if log_channel_id in self.continuous_activity:
-                                    del self.continuous_activity[log_channel_id]
-                                    logger.info(f"Activity-Tracking zurückgesetzt wegen Inaktivität: {log_channel_id} (inaktiv seit {activity_duration:.1f}s)")
-                            
-                            # Prüfe ob lang genug kontinuierlich aktiv
-                            if log_channel_id in self.continuous_activity:
-                                continuous_duration = current_time - self.continuous_activity[log_channel_id]
-                                if continuous_duration >= BotConstants.ACTIVITY_CHECK_THRESHOLD:
-                                    logger.info(f"Channel {log_channel_id}: Online nach {continuous_duration:.1f}s "
-                                              f"kontinuierlicher Aktivität")
-                                    await self.update_status(
-                                        log_channel_id,
-                                        BotStatus.ONLINE,
-                                        f"Kontinuierliche Aktivität für {int(continuous_duration)} Sekunden"
-                                    )
-                    
-                    # Bei Online-Status: Prüfe auf Inaktivität
-                    elif channel_status == BotStatus.ONLINE.value and last_message_time:
-                        inactive_duration = current_time - last_message_time
-                        logger.debug(f"Online-Status Inaktivitäts-Check - Channel {log_channel_id}: "
-                                   f"Inaktiv seit {inactive_duration:.1f}s (Schwelle: {BotConstants.INACTIVITY_THRESHOLD}s)")
-                        
-                        if inactive_duration >= BotConstants.INACTIVITY_THRESHOLD:
-                            logger.info(f"Channel {log_channel_id}: Problem (Inaktiv seit {inactive_duration:.1f}s)")
-                            await self.update_status(
-                                log_channel_id,
-                                BotStatus.PROBLEM,
-                                f"Inaktiv seit {int(inactive_duration)} Sekunden"
-                            )
-
-                except Exception as e:
-                    logger.error(f"Fehler bei Prüfung von Channel {log_channel_id}: {e}", exc_info=True)
+        log_channel_id = str(channel_id)
+        # Nicht mehr überwacht oder ausgeschlossen: erst remove_excluded_channel plant wieder
+        if not self.bot.channel_manager.get_guild_for_log_channel(log_channel_id):
+            return None
+        if self.bot.channel_manager.is_excluded(log_channel_id):
+            return None
 
-        except Exception as e:
-            logger.error(f"Fehler bei Inaktivitätsprüfung: {e}", exc_info=True)
+        current_time = time.time()
+        last_message_time = state.last_message_time
+        # Schwellen werden bei jedem Ablauf neu gelesen, Änderungen per /setthresholds gelten sofort
+        _, recovery_threshold = self.bot.channel_manager.get_thresholds(channel_id)
+        inactivity_threshold = self.get_inactivity_threshold(channel_id)
+
+        # Bei Problem-Status: Prüfe ob lang genug kontinuierlich aktiv
+        if state.status == BotStatus.PROBLEM and state.activity_start:
+            activity_duration = current_time - last_message_time if last_message_time else None
+            if activity_duration is None or activity_duration >= recovery_threshold:
+                # Reset wenn Inaktivität zu lang; die nächste Nachricht startet ein neues Tracking
+                state.activity_start = 0.0
+                logger.info(f"Activity-Tracking zurückgesetzt wegen Inaktivität: {log_channel_id}")
+                return None
+
+            continuous_duration = current_time - state.activity_start
+            if continuous_duration >= recovery_threshold:
+                logger.info(f"Channel {log_channel_id}: Online nach {continuous_duration:.1f}s "
+                          f"kontinuierlicher Aktivität")
+                await self.request_status(
+                    log_channel_id,
+                    state,
+                    BotStatus.ONLINE,
+                    f"Kontinuierliche Aktivität für {int(continuous_duration)} Sekunden"
+                )
+
+        # Bei Online-Status: Prüfe auf Inaktivität
+        elif state.status == BotStatus.ONLINE and last_message_time:
+            inactive_duration = current_time - last_message_time
+            if inactive_duration >= inactivity_threshold:
+                logger.info(f"Channel {log_channel_id}: Problem (Inaktiv seit {inactive_duration:.1f}s, "
+                          f"Schwelle {inactivity_threshold:.0f}s)")
+                await self.request_status(
+                    log_channel_id,
+                    state,
+                    BotStatus.PROBLEM,
+                    f"Inaktiv seit {int(inactive_duration)} Sekunden (Schwelle: {int(inactivity_threshold)} Sekunden)"
+                )
+
+        deadline = self._next_deadline(channel_id, state)
+        if deadline is not None and deadline <= time.time():
+            # Update fehlgeschlagen (z.B. Update-Channel nicht erreichbar): später erneut versuchen
+            deadline = time.time() + BotConstants.DEADLINE_RETRY_DELAY
+        return deadline
 
     async def process_message(self, message: discord.Message):
-        """Verbesserte Nachrichtenverarbeitung mit Debug-Logging"""
+        """Nimmt eine Nachricht entgegen und reiht sie in das Bündel ihres Log-Channels ein"""
         try:
             channel_id = str(message.channel.id)
             guild_id = str(message.guild.id) if message.guild else None
@@ -173,73 +254,247 @@ class StatusManager:
             if is_log_channel:
                 # Debug: Zeige die Nachricht
                 logger.debug(f"Log-Channel Nachricht empfangen: {message.content}")
+                state = self.get_state(message.channel.id)
                 
                 # Aktualisiere letzte Nachrichtenzeit
-                self.update_last_message_time(channel_id)
-                
-                # Hole aktuellen Status und prüfe auf Muster
-                current_status = self.last_known_status.get(channel_id)
-                new_status = self.bot.patterns.check_patterns(message.content)
-                
-                # Debug: Status-Info
-                logger.info(f"Channel {channel_id} - Aktueller Status: {current_status}, "
-                            f"Erkannter Status: {new_status.value if new_status else 'None'}")
-                
-                if new_status:
-                    # Bei Online-Muster: immer continuous_activity aktualisieren
-                    if new_status == BotStatus.ONLINE:
-                        current_time = time.time()
-                        logger.info(f"Online-Aktivität für Channel {channel_id} erkannt: {message.content}")
-                        
-                        # Activity-Tracking starten/aktualisieren
-                        if channel_id not in self.continuous_activity:
-                            self.continuous_activity[channel_id] = current_time
-                            logger.info(f"Starte neues Activity-Tracking für {channel_id}")
-                        else:
-                            # Existierende Activity aktualisieren
-                            continuous_duration = current_time - self.continuous_activity[channel_id]
-                            logger.info(f"Channel {channel_id}: Kontinuierliche Aktivität seit {continuous_duration:.1f}s")
-                    
-                    # Prüfe Cooldown nur wenn es eine echte Statusänderung ist
-                    if current_status != new_status.value:
-                        current_time = time.time()
-                        last_update_time = self.last_status_update.get(channel_id, {}).get(new_status.value, 0)
-                        
-                        # Debug: Cooldown-Info
-                        time_since_last = current_time - last_update_time
-                        logger.info(f"Zeit seit letztem Update: {time_since_last:.1f}s")
-                        
-                        if time_since_last >= 30:  # Cooldown von 30 Sekunden
-                            # Aktualisiere Cooldown und Status
-                            if channel_id not in self.last_status_update:
-                                self.last_status_update[channel_id] = {}
-                            self.last_status_update[channel_id][new_status.value] = current_time
-                            
-                            logger.info(f"Führe Status-Update durch: {current_status} -> {new_status.value}")
-                            await self.update_status(
-                                channel_id,
-                                new_status,
-                                f"Statusänderung erkannt in: {message.content}"
-                            )
-                        else:
-                            logger.info(f"Status-Update ignoriert (Cooldown aktiv: {30 - time_since_last:.1f}s verbleibend)")
-                    else:
-                        if new_status == BotStatus.ONLINE and current_status == BotStatus.ONLINE.value:
-                            logger.info(f"Online-Status unverändert: {current_status} - Aktivität wird weiterhin überwacht")
-                        else:
-                            logger.info(f"Status unverändert: {current_status}")
+                self.update_last_message_time(state, message.channel.id)
+
+                # Ältere Nachrichten fallen bei Überlauf heraus, für den Status zählt der letzte Treffer
+                state.enqueue(message.content, BotConstants.INGEST_MAX_BATCH)
+                if state.flush_task is None:
+                    state.flush_task = asyncio.create_task(self._flush_channel(guild_id, channel_id, state))
 
         except Exception as e:
             logger.error(f"Fehler bei Nachrichtenverarbeitung: {e}", exc_info=True)
 
-    async def update_status(self, log_channel_id: str, new_status: BotStatus, reason: str):
+    async def _flush_channel(self, guild_id: str, channel_id: str, state: ChannelState):
+        """
+        Wertet die gesammelten Nachrichten eines Log-Channels nach Ablauf des Bündelungsfensters aus.
+        Nachrichten, die während der Auswertung eintreffen, bilden das nächste Bündel; pro
+        Channel läuft also immer nur eine Auswertung und höchstens ein Status-Update.
+        """
+        try:
+            while state.pending:
+                await asyncio.sleep(BotConstants.INGEST_WINDOW)
+                batch = state.take_pending()
+                if batch:
+                    await self._process_batch(guild_id, channel_id, state, batch)
+        except Exception as e:
+            logger.error(f"Fehler bei der Bündelverarbeitung für Channel {channel_id}: {e}", exc_info=True)
+        finally:
+            state.flush_task = None
+
+    async def _process_batch(self, guild_id: str, channel_id: str, state: ChannelState, batch: List[str]):
+        """Leitet aus einem Bündel genau eine Statusentscheidung ab (maßgeblich ist der letzte Treffer)"""
+        new_status = None
+        matched_content = None
+        online_seen = False
+        for content in batch:
+            # Einmalige Normalisierung, danach arbeitet die Mustererkennung direkt auf dem Ergebnis
+            text = self.normalizer.normalize(content)
+            status = await self.bot.pattern_manager.classify(guild_id, channel_id, text, normalized=True)
+            if status:
+                new_status = status
+                matched_content = content
+                online_seen = online_seen or status == BotStatus.ONLINE
+
+        # Hole aktuellen Status
+        current_status = state.status.value if state.status else None
+
+        # Debug: Status-Info
+        logger.info(f"Channel {channel_id} - {len(batch)} Nachricht(en) gebündelt, Aktueller Status: {current_status}, "
+                    f"Erkannter Status: {new_status.value if new_status else 'None'}")
+
+        if not new_status:
+            return
+
+        # Bei Online-Muster: immer Activity-Tracking aktualisieren
+        if online_seen:
+            current_time = time.time()
+            logger.info(f"Online-Aktivität für Channel {channel_id} erkannt: {matched_content}")
+
+            # Activity-Tracking starten/aktualisieren
+            if not state.activity_start:
+                state.activity_start = current_time
+                logger.info(f"Starte neues Activity-Tracking für {channel_id}")
+            else:
+                # Existierende Activity aktualisieren
+                continuous_duration = current_time - state.activity_start
+                logger.info(f"Channel {channel_id}: Kontinuierliche Aktivität seit {continuous_duration:.1f}s")
+
+        # Flappender Channel: nur den Zielstatus nachführen, auch wenn er dem aktuellen entspricht
+        if state.deferred is not None:
+            await self.request_status(channel_id, state, new_status, f"Statusänderung erkannt in: {matched_content}")
+            return
+
+        # Prüfe Cooldown nur wenn es eine echte Statusänderung ist
+        if current_status != new_status.value:
+            current_time = time.time()
+            last_update_time = state.last_update(new_status)
+
+            # Debug: Cooldown-Info
+            time_since_last = current_time - last_update_time
+            logger.info(f"Zeit seit letztem Update: {time_since_last:.1f}s")
+
+            if time_since_last >= 30:  # Cooldown von 30 Sekunden
+                # Aktualisiere Cooldown und Status
+                state.mark_updated(new_status, current_time)
+
+                logger.info(f"Führe Status-Update durch: {current_status} -> {new_status.value}")
+                await self.request_status(
+                    channel_id,
+                    state,
+                    new_status,
+                    f"Statusänderung erkannt in: {matched_content}"
+                )
+            else:
+                logger.info(f"Status-Update ignoriert (Cooldown aktiv: {30 - time_since_last:.1f}s verbleibend)")
+        else:
+            if new_status == BotStatus.ONLINE and current_status == BotStatus.ONLINE.value:
+                logger.info(f"Online-Status unverändert: {current_status} - Aktivität wird weiterhin überwacht")
+            else:
+                logger.info(f"Status unverändert: {current_status}")
+
+    async def backfill_status(self, guild_id: str, log_channel: discord.TextChannel, limit: int) -> Optional[BotStatus]:
+        """
+        Ermittelt den Status eines Log-Channels aus dem Nachrichtenverlauf und übernimmt ihn,
+        wenn er vom gespeicherten Status abweicht.
+
+        Returns:
+            Optional[BotStatus]: Erkannter Status oder None, wenn keine Nachricht ein Muster enthält
+        """
+        channel_id = str(log_channel.id)
+        messages = [
+            (channel_id, self.normalizer.normalize(message.content))
+            async for message in log_channel.history(limit=limit)
+        ]
+        # history() liefert die neuesten Nachrichten zuerst
+        messages.reverse()
+
+        # Eigene Mustersets laufen wie im Live-Betrieb in der Sandbox
+        results = await self.bot.pattern_manager.classify_history(guild_id, channel_id, messages)
+
+        status = results.get(channel_id)
+        logger.info(f"Backfill für Channel {channel_id}: {len(messages)} Nachrichten, "
+                    f"erkannter Status: {status.value if status else 'None'}")
+
+        if status and self.get_status(log_channel.id) != status:
+            await self.update_status(channel_id, status, f"Backfill aus den letzten {len(messages)} Nachrichten")
+        return status
+
+    def is_flapping(self, channel_id: int) -> bool:
+        """Prüft, ob Statuswechsel eines Channels gerade zurückgehalten werden"""
+        state = self.channels.get(channel_id)
+        return state is not None and state.deferred is not None
+
+    def cancel_deferred(self, channel_id: int):
+        """Verwirft einen zurückgehaltenen Statuswechsel (z.B. bei manuellem /toggle)"""
+        state = self.channels.get(channel_id)
+        if state is None or state.deferred is None:
+            return
+        if state.deferred.task:
+            state.deferred.task.cancel()
+        state.deferred = None
+        logger.info(f"Gebündelter Statuswechsel für Channel {channel_id} verworfen")
+
+    async def request_status(self, log_channel_id: str, state: ChannelState, new_status: BotStatus, reason: str):
+        """
+        Automatischer Statuswechsel mit Flap-Dämpfung.
+
+        Wären es mit diesem Wechsel FLAP_LIMIT Wechsel innerhalb von FLAP_WINDOW Sekunden,
+        wird nur noch der Zielstatus nachgeführt und erst angewendet, wenn er sich
+        FLAP_SETTLE Sekunden lang nicht mehr ändert. Manuelle Wechsel (/toggle) rufen
+        update_status direkt auf und sind davon ausgenommen.
+        """
+        deferred = state.deferred
+        if deferred is not None:
+            if deferred.status != new_status:
+                deferred.status = new_status
+                deferred.since = time.time()
+                deferred.coalesced += 1
+            deferred.reason = reason
+            return
+
+        if new_status == state.status:
+            return
+
+        now = time.time()
+        if not state.would_flap(now, BotConstants.FLAP_WINDOW, BotConstants.FLAP_LIMIT):
+            await self.update_status(log_channel_id, new_status, reason)
+            return
+
+        logger.warning(f"Channel {log_channel_id} flappt: {BotConstants.FLAP_LIMIT} Wechsel in weniger als "
+                       f"{BotConstants.FLAP_WINDOW}s, Statuswechsel werden {BotConstants.FLAP_SETTLE}s lang gebündelt")
+        deferred = state.deferred = DeferredTransition(new_status, reason, now)
+        deferred.task = asyncio.create_task(self._settle_deferred(log_channel_id, state, deferred))
+        await self._log_flapping(log_channel_id)
+
+    async def _settle_deferred(self, log_channel_id: str, state: ChannelState, deferred: DeferredTransition):
+        """Wendet den zurückgehaltenen Zielstatus an, sobald er FLAP_SETTLE Sekunden stabil war"""
+        try:
+            while True:
+                remaining = deferred.since + BotConstants.FLAP_SETTLE - time.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(remaining)
+
+            state.deferred = None
+            if deferred.status == state.status:
+                logger.info(f"Channel {log_channel_id} hat sich beim bisherigen Status {state.status.value} stabilisiert "
+                            f"({deferred.coalesced} Wechsel verworfen)")
+                return
+
+            logger.info(f"Channel {log_channel_id} hat sich stabilisiert: {deferred.status.value} "
+                        f"({deferred.coalesced} Wechsel zusammengefasst)")
+            await self.update_status(
+                log_channel_id,
+                deferred.status,
+                deferred.reason,
+                note=f"Status schwankte, {deferred.coalesced} Wechsel wurden zusammengefasst"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Fehler beim Anwenden des gebündelten Status für Channel {log_channel_id}: {e}", exc_info=True)
+        finally:
+            if state.deferred is deferred:
+                state.deferred = None
+
+    async def _log_flapping(self, log_channel_id: str):
+        """Meldet im History-Channel, dass ein Channel flappt"""
+        try:
+            history_channel = self.bot.get_channel(self.bot.history_channel_id)
+            guild_id = self.bot.channel_manager.get_guild_for_log_channel(log_channel_id)
+            if not history_channel or not guild_id:
+                return
+
+            embed = discord.Embed(
+                title="Status Flapping",
+                description=f"Update-Channel: <#{self.bot.guild_channels[guild_id][log_channel_id]}>",
+                color=discord.Color.orange(),
+                timestamp=discord.utils.utcnow()
+            )
+            embed.add_field(
+                name="Dämpfung",
+                value=f"Statuswechsel werden gebündelt, bis der Status {BotConstants.FLAP_SETTLE} Sekunden stabil ist",
+                inline=False
+            )
+            self.history.submit(
+                embed,
+                f"〰️ <#{self.bot.guild_channels[guild_id][log_channel_id]}> flappt, Wechsel werden gebündelt",
+                "flapping"
+            )
+
+        except Exception as e:
+            logger.error(f"Error logging flapping: {e}", exc_info=True)
+
+    async def update_status(self, log_channel_id: str, new_status: BotStatus, reason: str, note: Optional[str] = None):
         """Status-Update mit verbessertem Activity-Reset"""
         logger.info(f"Status-Update für Channel {log_channel_id}: {new_status.value}")
         logger.info(f"Grund: {reason}")
         
         try:
-            guild_id = next((guild_id for guild_id, channels in self.bot.guild_channels.items() 
-                         if log_channel_id in channels), None)
+            guild_id = self.bot.channel_manager.get_guild_for_log_channel(log_channel_id)
             
             if not guild_id:
                 logger.error(f"Keine Guild gefunden für Channel {log_channel_id}")
@@ -255,50 +510,54 @@ class StatusManager:
                 logger.error(f"Update-Channel {update_channel_id} nicht gefunden")
                 return
             
-            current_status = self.last_known_status.get(log_channel_id)
-            logger.debug(f"Status-Änderung: {current_status} -> {new_status.value}")
+            state = self.get_state(int(log_channel_id))
+            logger.debug(f"Status-Änderung: {state.status.value if state.status else None} -> {new_status.value}")
 
             # Wenn der neue Status PROBLEM ist, setze Activity-Tracking zurück
             if new_status == BotStatus.PROBLEM:
-                if log_channel_id in self.continuous_activity:
-                    del self.continuous_activity[log_channel_id]
-                if log_channel_id in self.last_message_times:
-                    del self.last_message_times[log_channel_id]
+                state.activity_start = 0.0
+                state.last_message_time = 0.0
                 logger.debug(f"Activity-Tracking zurückgesetzt für Channel {log_channel_id}")
             
             # Statusänderung durchführen
             try:
-                # Alte Nachrichten löschen
-                try:
-                    await self.bot.message_manager.purge_bot_messages(update_channel)
-                except Exception as e:
-                    logger.error(f"Fehler beim Löschen alter Nachrichten: {e}")
-
-                # Neue Nachricht senden
                 embed, gif_name = await self.bot.message_manager.create_status_embed(
                     new_status,
                     log_channel_id,
-                    guild_id
+                    guild_id,
+                    note
                 )
                 
                 gif_path = BotConstants.GIF_DIR / gif_name
-                new_message = await self.bot.message_manager.send_with_retry(update_channel, embed, str(gif_path))
-                
-                if not new_message:
+
+                # Zuerst die Status-Nachricht: schlägt sie fehl, bleibt der alte Status gespeichert
+                # und die nächste Erkennung führt den Übergang erneut durch. Name, Lock und
+                # History-Eintrag folgen erst danach, damit ein erneuter Versuch nichts doppelt auslöst.
+                start = time.perf_counter()
+                message, message_seconds = await self._run_effect(
+                    "message",
+                    # Bestehende Status-Nachricht bearbeiten (Fallback: alte löschen und neu senden)
+                    self.bot.message_manager.update_status_message(update_channel, embed, str(gif_path))
+                )
+                if not message:
+                    self.transition_stats.record_transition(time.perf_counter() - start, message_seconds)
                     logger.error("Fehler beim Senden der Status-Nachricht")
                     return
 
-                # Channel-Name und Lock aktualisieren
-                await self.bot.channel_manager.update_channel_name(update_channel, new_status)
-                await self.bot.channel_locker.update_channel_lock(update_channel, new_status)
-                
                 # Status speichern
-                self.last_known_status[log_channel_id] = new_status.value
-                self.bot.data_manager.save_json(self.last_known_status, "last_known_status.json")
-                
-                # History-Log
-                await self._log_status_change(new_status, log_channel_id, reason, guild_id)
-                
+                state.status = new_status
+                state.note_transition(time.time(), BotConstants.FLAP_LIMIT)
+                self.save_status()
+                self.arm(int(log_channel_id))
+
+                # Die übrigen Schritte sind voneinander unabhängig und laufen parallel, damit z.B.
+                # eine langsame Umbenennung den History-Eintrag nicht aufhält
+                await self._run_effects({
+                    # Name und Lock-Berechtigungen in einem einzigen Channel-PATCH
+                    "channel": self.bot.channel_manager.update_channel_state(update_channel, new_status),
+                    "history": self._log_status_change(new_status, log_channel_id, reason, guild_id),
+                }, start, message_seconds)
+
                 logger.info(f"Status-Update erfolgreich durchgeführt")
                 
             except Exception as e:
@@ -307,6 +566,38 @@ class StatusManager:
         except Exception as e:
             logger.error(f"Fehler bei Status-Update-Vorbereitung: {e}", exc_info=True)
 
+    async def _run_effect(self, name: str, effect: Awaitable) -> Tuple[Any, float]:
+        """Führt einen Schritt eines Status-Updates mit Timeout aus; Fehler bleiben auf den Schritt beschränkt"""
+        start = time.perf_counter()
+        result = None
+        outcome = "ok"
+        try:
+            result = await asyncio.wait_for(effect, BotConstants.TRANSITION_EFFECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.warning(f"Status-Update-Schritt '{name}' nach {BotConstants.TRANSITION_EFFECT_TIMEOUT}s abgebrochen")
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Fehler im Status-Update-Schritt '{name}': {e}", exc_info=True)
+        duration = time.perf_counter() - start
+        self.transition_stats.record_effect(name, duration, outcome)
+        return result, duration
+
+    async def _run_effects(self, effects: Dict[str, Awaitable], start: float, serial: float = 0.0) -> Dict[str, Any]:
+        """
+        Führt Schritte eines Status-Updates parallel aus und erfasst die Latenz des Übergangs.
+
+        Args:
+            start: perf_counter()-Zeit, zu der der Übergang begonnen hat
+            serial: Dauer der bereits zuvor ausgeführten Schritte
+        """
+        outcomes = await asyncio.gather(*(self._run_effect(name, effect) for name, effect in effects.items()))
+        wall = time.perf_counter() - start
+        serial += sum(duration for _, duration in outcomes)
+        self.transition_stats.record_transition(wall, serial)
+        logger.info(f"Status-Update-Schritte in {wall:.2f}s abgeschlossen (seriell wären es {serial:.2f}s)")
+        return {name: result for name, (result, _) in zip(effects, outcomes)}
+
     async def _log_status_change(self, status: BotStatus, log_channel_id: str, reason: str, guild_id: str):
         """Log status change to history channel"""
         try:
@@ -326,14 +617,18 @@ class StatusManager:
             embed.add_field(name="New Status", value=status.value, inline=True)
             embed.add_field(name="Reason", value=reason, inline=True)
             
+            line = f"{self.bot.patterns.get_status_emoji(status)} <#{update_channel_id}> → **{status.value}** · {reason}"
+
             # Füge Bot-Owner Information ohne Mention hinzu
             owner_id = self.bot.channel_manager.get_channel_owner(guild_id, log_channel_id)
             if owner_id:
                 user = self.bot.get_user(owner_id)
                 owner_name = user.name if user else f"User (ID: {owner_id})"
                 embed.add_field(name="Bot Owner", value=owner_name, inline=True)
-                
-            await history_channel.send(embed=embed)
+                line += f" · {owner_name}"
+
+            # Gebündelt senden: bei Massenausfällen ein Sammel-Embed statt einer Nachricht pro Wechsel
+            self.history.submit(embed, line, status.value)
 
         except Exception as e:
             logger.error(f"Error logging status change: {e}", exc_info=True)
\ No newline at end of file
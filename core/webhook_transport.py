@@ -0,0 +1,99 @@
+import discord
+import asyncio
+import logging
+from typing import Dict, Optional
+from config.constants import BotConstants
+
+logger = logging.getLogger('StatusBot')
+
+UNKNOWN_WEBHOOK = 10015
+
+class WebhookTransport:
+    """
+    Sendet Status- und History-Nachrichten optional über einen Webhook pro Channel.
+
+    Webhook-Aufrufe haben eigene Rate-Limit-Buckets und konkurrieren damit nicht mit
+    Umbenennungen und Berechtigungsänderungen des Bot-Tokens. Der Bot legt die Webhooks
+    selbst an und merkt sie sich im Speicher (die Tokens werden nicht gespeichert, nach
+    einem Neustart werden sie über channel.webhooks() wiedergefunden). Ist ein Webhook
+    verschwunden oder fehlt die Berechtigung, wird über channel.send gesendet.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Channel-ID -> Webhook, None = Channel unterstützt keine Webhooks (fehlende Berechtigung)
+        self._webhooks: Dict[int, Optional[discord.Webhook]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return BotConstants.USE_WEBHOOKS
+
+    async def _get_webhook(self, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        if channel.id in self._webhooks:
+            return self._webhooks[channel.id]
+
+        async with self._lock:
+            if channel.id in self._webhooks:
+                return self._webhooks[channel.id]
+
+            webhook = None
+            try:
+                for existing in await channel.webhooks():
+                    if existing.token and existing.name == BotConstants.WEBHOOK_NAME:
+                        webhook = existing
+                        break
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=BotConstants.WEBHOOK_NAME, reason="Status-Nachrichten")
+                    logger.info(f"Webhook für Channel {channel.name} angelegt")
+            except discord.Forbidden:
+                logger.warning(f"Keine Berechtigung für Webhooks in Channel {channel.name}, sende direkt")
+            except discord.HTTPException as e:
+                # Nicht dauerhaft merken, beim nächsten Mal erneut versuchen
+                logger.error(f"Fehler beim Bereitstellen des Webhooks für Channel {channel.name}: {e}")
+                return None
+
+            self._webhooks[channel.id] = webhook
+            return webhook
+
+    def forget(self, channel_id: int):
+        """Verwirft den gemerkten Webhook eines Channels"""
+        self._webhooks.pop(channel_id, None)
+
+    def owns(self, message: discord.Message) -> bool:
+        """Prüft, ob eine Nachricht über den Webhook des Channels gesendet wurde"""
+        webhook = self._webhooks.get(message.channel.id)
+        return webhook is not None and message.webhook_id == webhook.id
+
+    async def send(self, channel: discord.TextChannel, **kwargs) -> discord.Message:
+        """Sendet über den Webhook des Channels, sonst über channel.send"""
+        webhook = await self._get_webhook(channel) if self.enabled else None
+        if webhook is not None:
+            try:
+                return await webhook.send(
+                    username=self.bot.user.name,
+                    avatar_url=self.bot.user.display_avatar.url,
+                    wait=True,
+                    **kwargs
+                )
+            except discord.NotFound:
+                logger.warning(f"Webhook in Channel {channel.name} wurde gelöscht, sende direkt")
+                self.forget(channel.id)
+        return await channel.send(**kwargs)
+
+    async def edit(self, channel: discord.TextChannel, message_id: int, **kwargs) -> discord.Message:
+        """
+        Bearbeitet eine Nachricht über den Webhook, falls sie von ihm stammt, sonst direkt.
+
+        Raises:
+            discord.NotFound: Wenn die Nachricht nicht mehr existiert
+        """
+        webhook = await self._get_webhook(channel) if self.enabled else None
+        if webhook is not None:
+            try:
+                return await webhook.edit_message(message_id, **kwargs)
+            except discord.NotFound as e:
+                # Webhook gelöscht oder Nachricht stammt vom Bot selbst (z.B. vor dem Umstieg)
+                if e.code == UNKNOWN_WEBHOOK:
+                    self.forget(channel.id)
+        return await channel.get_partial_message(message_id).edit(**kwargs)
@@ -5,6 +5,7 @@ Startet sowohl den Haupt-Bot als auch den Helper-Bot gleichzeitig
 """
 
 import asyncio
+import multiprocessing
 import logging
 import sys
 import os
@@ -300,4 +301,6 @@ def main():
         print("👋 Bot-System beendet")
 
 if __name__ == "__main__":
+    # Erforderlich für Worker-Prozesse (Muster-Sandbox) in der PyInstaller-EXE
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
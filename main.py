@@ -9,6 +9,7 @@ from core.bot_core import StatusBot
 from config.constants import BotConstants
 from cogs import setup_cogs
 import asyncio
+import multiprocessing
 from core.log_manager import setup_bot_logging
 
 def setup_logging():
@@ -150,6 +151,9 @@ class BotTokenBalancer:
             return f"Sekundärer Bot aktiv (Primärer Bot blockiert für weitere {int(remaining)} Sekunden)"
 
 if __name__ == "__main__":
+    # Erforderlich für Worker-Prozesse (Muster-Sandbox) in der PyInstaller-EXE
+    multiprocessing.freeze_support()
+    
     # Setup Logging
     logger = setup_logging()
     
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from core.channel_manager import ChannelManager
+from core.data_manager import DataManager
+from core.message_manager import MessageManager
+from core.pattern_manager import PatternManager
+from core.status_manager import StatusManager
+from tests.helpers import FakeChannel
+from utils.status_patterns import StatusPatterns
+
+@pytest.fixture
+def bot(tmp_path):
+    """Minimaler Bot mit echtem DataManager; Manager werden in den Tests nach Bedarf ergänzt"""
+    return SimpleNamespace(
+        patterns=StatusPatterns(),
+        data_manager=DataManager(tmp_path),
+        user=SimpleNamespace(id=1, name="StatusBot"),
+    )
+
+@pytest.fixture
+def pattern_manager(bot):
+    """PatternManager mit eigenem Datenverzeichnis und eingebauten Standard-Mustern"""
+    return PatternManager(bot)
+
+@pytest.fixture
+def message_manager(bot):
+    bot.message_manager = MessageManager(bot)
+    return bot.message_manager
+
+@pytest.fixture
+def status_bot(bot):
+    """
+    Bot mit einem Kanalpaar (Guild 1: Log-Channel 10 -> Update-Channel 20) und echtem Channel-,
+    Muster- und Status-Manager. Nachricht und Channel-Update eines Statuswechsels sind Mocks;
+    update_channel_state zählt also die durchgeführten Übergänge.
+    """
+    bot.guild_channels = {"1": {"10": "20"}}
+    bot.history_channel_id = None
+    bot.rebuild_monitored_channels = lambda: None
+    bot.channel_manager = ChannelManager(bot)
+    bot.channel_manager.update_channel_state = AsyncMock()
+    bot.pattern_manager = PatternManager(bot)
+    bot.status_manager = StatusManager(bot)
+    bot.message_manager = MagicMock()
+    bot.message_manager.create_status_embed = AsyncMock(return_value=(discord.Embed(), "online.gif"))
+    bot.message_manager.update_status_message = AsyncMock(return_value=SimpleNamespace(id=1))
+    update_channel = FakeChannel(bot.user, channel_id=20)
+    bot.get_channel = lambda channel_id: update_channel if channel_id == 20 else None
+    return bot
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+from typing import List, Set, Tuple
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+def make_interaction(guild_id: int = 1) -> MagicMock:
+    """Interaction, deren Antwortstatus wie bei discord.py nach defer/send_message umschaltet"""
+    interaction = MagicMock()
+    interaction.guild_id = guild_id
+    done = []
+    interaction.response.is_done = lambda: bool(done)
+    interaction.response.defer = AsyncMock(side_effect=lambda *args, **kwargs: done.append(True))
+    interaction.response.send_message = AsyncMock(side_effect=lambda *args, **kwargs: done.append(True))
+    interaction.followup.send = AsyncMock()
+    return interaction
+
+def http_error(error_type=discord.HTTPException, status: int = 500, code: int = 0):
+    """Erzeugt eine discord.py-Ausnahme ohne echte HTTP-Antwort"""
+    response = MagicMock(status=status, reason="test")
+    return error_type(response, {"code": code, "message": "test"})
+
+class FakeChannel:
+    """
+    Text-Channel im Speicher: zeichnet gesendete, bearbeitete und gelöschte Nachrichten auf.
+    Nachrichten-IDs sind Snowflakes ab dem Erstellungszeitpunkt und steigen monoton.
+    """
+
+    def __init__(self, author, channel_id: int = 20, name: str = "status"):
+        self.id = channel_id
+        self.name = name
+        self.guild = SimpleNamespace(id=1)
+        self.author = author
+        self.sent: List[SimpleNamespace] = []
+        self.edits: List[Tuple[int, dict]] = []
+        self.deleted: List[int] = []
+        # Nachrichten, die history() liefert (auch fremde)
+        self.history_messages: List[SimpleNamespace] = []
+        self.missing: Set[int] = set()
+        self.fail_send = False
+        # Channel-PATCHes (Name, Berechtigungen) und ein optionaler Fehler für den nächsten
+        self.patches: List[dict] = []
+        self.patch_error = None
+        self._next_id = discord.utils.time_snowflake(discord.utils.utcnow())
+
+    def message(self, author=None) -> SimpleNamespace:
+        self._next_id += 1
+        return SimpleNamespace(id=self._next_id, author=author or self.author, channel=self, webhook_id=None)
+
+    async def send(self, **kwargs):
+        if self.fail_send:
+            raise http_error()
+        message = self.message()
+        message.kwargs = kwargs
+        self.sent.append(message)
+        self.history_messages.append(message)
+        return message
+
+    async def edit(self, **kwargs):
+        if self.patch_error:
+            error, self.patch_error = self.patch_error, None
+            raise error
+        self.patches.append(kwargs)
+        self.name = kwargs.get("name", self.name)
+
+    async def delete_messages(self, messages):
+        self.deleted.extend(message.id for message in messages)
+
+    async def history(self, limit: int = 100, after=None):
+        for message in self.history_messages[:limit]:
+            if after is None or message.id > after.id:
+                yield message
+
+    def get_partial_message(self, message_id: int):
+        channel = self
+
+        class PartialMessage:
+            id = message_id
+
+            async def edit(self, **kwargs):
+                if message_id in channel.missing:
+                    raise http_error(discord.NotFound, 404, 10008)
+                channel.edits.append((message_id, kwargs))
+                return SimpleNamespace(id=message_id, kwargs=kwargs)
+
+            async def delete(self):
+                channel.deleted.append(message_id)
+
+        return PartialMessage()
+
+def applied_statuses(bot):
+    """Status aller durchgeführten Übergänge in Reihenfolge"""
+    return [call.args[1] for call in bot.channel_manager.update_channel_state.await_args_list]
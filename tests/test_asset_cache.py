@@ -0,0 +1,119 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from config.constants import BotConstants
+from core.asset_cache import StatusAssetCache, url_expiry
+from tests.helpers import http_error
+
+def signed_url(name: str, expires: float) -> str:
+    return f"https://cdn.discordapp.com/attachments/1/2/{name}?ex={int(expires):x}&is=0&hm=abc"
+
+class AssetChannel:
+    """Asset-Channel, dessen Uploads signierte URLs mit einstellbarer Laufzeit liefern"""
+
+    def __init__(self):
+        self.uploads = []
+        self.fetched = []
+        self.deleted = set()
+        self.lifetime = 86400
+
+    async def send(self, file):
+        self.uploads.append(file.filename)
+        return self._message(len(self.uploads), file.filename)
+
+    async def fetch_message(self, message_id):
+        if message_id in self.deleted:
+            raise http_error(discord.NotFound, 404, 10008)
+        self.fetched.append(message_id)
+        return self._message(message_id, "online.gif")
+
+    def _message(self, message_id, name):
+        url = signed_url(name, time.time() + self.lifetime)
+        return SimpleNamespace(id=message_id, attachments=[SimpleNamespace(url=url)])
+
+@pytest.fixture
+def channel(bot):
+    channel = AssetChannel()
+    bot.get_channel = lambda channel_id: channel if channel_id == 30 else None
+    return channel
+
+@pytest.fixture
+def gif(tmp_path):
+    path = tmp_path / "online.gif"
+    path.write_bytes(b"GIF89a")
+    return path
+
+def test_url_expiry_parses_hex_parameter():
+    assert url_expiry(signed_url("a.gif", 0x65000000)) == float(0x65000000)
+    assert url_expiry("https://cdn.discordapp.com/a.gif") is None
+    assert url_expiry("https://cdn.discordapp.com/a.gif?ex=zz") is None
+
+def test_without_channel_gif_is_attached_directly(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    assert asyncio.run(cache.get_url(gif)) is None
+    assert channel.uploads == []
+
+def test_gif_is_uploaded_once_and_persisted(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    cache.set_channel(30)
+
+    async def scenario():
+        # Gleichzeitige Anfragen führen trotzdem nur zu einem Upload
+        return await asyncio.gather(*(cache.get_url(gif) for _ in range(5)))
+
+    urls = asyncio.run(scenario())
+    assert len(set(urls)) == 1 and urls[0].startswith("https://cdn.discordapp.com/")
+    assert channel.uploads == ["online.gif"]
+
+    reloaded = StatusAssetCache(bot)
+    reloaded.load_data()
+    assert asyncio.run(reloaded.get_url(gif)) == urls[0]
+    assert channel.uploads == ["online.gif"]
+
+def test_changed_file_is_uploaded_again(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    cache.set_channel(30)
+    asyncio.run(cache.get_url(gif))
+    gif.write_bytes(b"GIF89a-new-frames")
+    asyncio.run(cache.get_url(gif))
+    assert channel.uploads == ["online.gif", "online.gif"]
+    assert channel.fetched == []
+
+def test_expiring_url_is_refreshed_without_upload(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    cache.set_channel(30)
+    channel.lifetime = BotConstants.ASSET_URL_REFRESH_MARGIN / 2
+    first = asyncio.run(cache.get_url(gif))
+
+    channel.lifetime = 86400
+    second = asyncio.run(cache.get_url(gif))
+    assert second != first
+    assert channel.fetched == [1]
+    assert channel.uploads == ["online.gif"]
+    # Die erneuerte URL ist frisch genug und wird direkt verwendet
+    assert asyncio.run(cache.get_url(gif)) == second
+    assert channel.fetched == [1]
+
+def test_deleted_asset_message_is_uploaded_again(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    cache.set_channel(30)
+    channel.lifetime = 0
+    asyncio.run(cache.get_url(gif))
+    channel.deleted.add(1)
+    channel.lifetime = 86400
+    asyncio.run(cache.get_url(gif))
+    assert channel.uploads == ["online.gif", "online.gif"]
+    assert cache.assets["online.gif"]["message_id"] == 2
+
+def test_set_channel_discards_previous_uploads(bot, channel, gif):
+    cache = StatusAssetCache(bot)
+    cache.set_channel(30)
+    asyncio.run(cache.get_url(gif))
+    cache.set_channel(31)
+    assert cache.assets == {}
+    # Channel 31 existiert nicht: kein Upload, Aufrufer hängt das GIF an
+    assert asyncio.run(cache.get_url(gif)) is None
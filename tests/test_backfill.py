@@ -0,0 +1,47 @@
+import asyncio
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from utils.status_patterns import StatusPatterns
+
+def test_classify_many_last_match_wins_across_chunks():
+    patterns = StatusPatterns()
+    messages = [
+        ("a", "Bot startup"),
+        ("a", "Ending PokeTrade"),
+        ("a", "trade done"),
+        ("a", "queue empty"),
+        ("a", "Failed to connect"),
+        ("a", "trade done"),
+        ("a", "queue empty"),
+        ("b", "Connected"),
+        ("b", "nothing"),
+        ("c", "nothing"),
+        ("c", ""),
+    ]
+    # Kleine Blöcke: der letzte Treffer von "a" liegt in einem früheren Block als die letzte Zeile
+    for chunk_size in (1, 2, 3, 100):
+        assert patterns.classify_many(messages, chunk_size=chunk_size) == {
+            "a": BotStatus.PROBLEM,
+            "b": BotStatus.ONLINE,
+        }
+
+def test_classify_many_keeps_priority_within_a_line():
+    patterns = StatusPatterns()
+    # Offline hat Vorrang vor Fehler und Online, auch wenn alle in derselben Zeile stehen
+    assert patterns.classify_many([(1, "Connected, Timeout, Ending PokeTrade")]) == {1: BotStatus.OFFLINE}
+
+def test_classify_history_uses_snapshot_without_stats(pattern_manager, monkeypatch):
+    monkeypatch.setattr(BotConstants, "PATTERN_SANDBOX", False)
+    pattern_manager.add_pattern("1", "online", "custom ready", channel_id="10")
+    live = pattern_manager.get_patterns("1", "10")
+    prefilter = live._prefilter
+
+    messages = [("10", "custom ready")] * 50 + [("10", "noise")]
+    results = asyncio.run(pattern_manager.classify_history("1", "10", messages))
+
+    assert results == {"10": BotStatus.ONLINE}
+    # Backfill zählt nicht in die Statistik des laufenden Betriebs und lässt das Set unverändert
+    assert pattern_manager.stats.entries == {}
+    assert live._prefilter is prefilter
+    assert live.cache_info()["misses"] == 0
@@ -0,0 +1,36 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from bot_status import BotStatus
+from cogs.channel.channel_commands import ChannelCommands
+from tests.helpers import make_interaction
+
+def run_backfill(bot, interaction, limit=10):
+    log_channel = MagicMock(id=10, mention="#log")
+    asyncio.run(ChannelCommands.backfill.callback(ChannelCommands(bot), interaction, log_channel, limit))
+
+def test_backfill_reports_status():
+    bot = MagicMock()
+    bot.channel_manager.get_update_channel.return_value = "20"
+    bot.status_manager.backfill_status = AsyncMock(return_value=BotStatus.OFFLINE)
+    interaction = make_interaction()
+    run_backfill(bot, interaction)
+    interaction.response.defer.assert_awaited_once()
+    assert BotStatus.OFFLINE.value in interaction.followup.send.await_args.args[0]
+
+def test_backfill_error_before_defer_uses_response():
+    bot = MagicMock()
+    bot.channel_manager.get_update_channel.side_effect = RuntimeError("kaputt")
+    interaction = make_interaction()
+    run_backfill(bot, interaction)
+    interaction.response.send_message.assert_awaited_once()
+    interaction.followup.send.assert_not_awaited()
+
+def test_backfill_error_after_defer_uses_followup():
+    bot = MagicMock()
+    bot.channel_manager.get_update_channel.return_value = "20"
+    bot.status_manager.backfill_status = AsyncMock(side_effect=RuntimeError("kaputt"))
+    interaction = make_interaction()
+    run_backfill(bot, interaction)
+    interaction.response.send_message.assert_not_awaited()
+    interaction.followup.send.assert_awaited_once()
@@ -0,0 +1,47 @@
+def test_lookups_from_loaded_pairs(status_bot):
+    channels = status_bot.channel_manager
+    assert channels.get_guild_for_log_channel("10") == "1"
+    assert channels.get_update_channel("1", "10") == "20"
+    assert channels.get_log_channel("1", "20") == "10"
+    assert channels.get_guild_log_channels("1") == {"10"}
+    # Update-Channel gehört zu einer anderen Guild
+    assert channels.get_log_channel("2", "20") is None
+    assert channels.get_guild_for_log_channel("20") is None
+
+def test_add_and_repoint_pairs(status_bot):
+    channels = status_bot.channel_manager
+    channels.add_channel_pair("2", "30", "40", owner_id=7)
+    assert channels.get_guild_for_log_channel("30") == "2"
+    assert channels.get_log_channel("2", "40") == "30"
+    assert channels.get_channel_owner("2", "30") == 7
+
+    # Log-Channel bekommt einen neuen Update-Channel: der alte verweist nicht mehr auf ihn
+    channels.add_channel_pair("1", "10", "21")
+    assert channels.get_log_channel("1", "21") == "10"
+    assert channels.get_log_channel("1", "20") is None
+    assert channels.get_guild_log_channels("1") == {"10"}
+
+    saved = status_bot.data_manager.load_json("guild_channels.json")
+    assert saved == {"1": {"10": "21"}, "2": {"30": "40"}}
+
+def test_remove_pair_cleans_index(status_bot):
+    channels = status_bot.channel_manager
+    channels.add_channel_pair("1", "11", "22", owner_id=7)
+    assert channels.remove_channel_pair("1", "11") == "22"
+    assert channels.get_guild_for_log_channel("11") is None
+    assert channels.get_log_channel("1", "22") is None
+    assert channels.get_channel_owner("1", "11") is None
+    assert channels.get_guild_log_channels("1") == {"10"}
+
+    assert channels.remove_channel_pair("1", "10") == "20"
+    assert channels.get_guild_log_channels("1") == set()
+    assert status_bot.guild_channels == {}
+    assert channels.remove_channel_pair("1", "10") is None
+
+def test_index_follows_reloaded_configuration(status_bot):
+    channels = status_bot.channel_manager
+    status_bot.guild_channels = {"3": {"50": "60", "51": "61"}}
+    channels.load_data()
+    assert channels.get_guild_for_log_channel("10") is None
+    assert channels.get_guild_log_channels("3") == {"50", "51"}
+    assert channels.get_log_channel("3", "61") == "51"
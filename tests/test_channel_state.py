@@ -0,0 +1,78 @@
+import json
+
+from bot_status import BotStatus
+from core.channel_state import ChannelState, states_from_json, states_to_json
+from core.status_manager import StatusManager
+
+def test_json_round_trip_keeps_file_format():
+    states = {10: ChannelState(BotStatus.ONLINE), 11: ChannelState(BotStatus.MAINTENANCE), 12: ChannelState()}
+    data = states_to_json(states)
+    # Gleiches Format wie zuvor: String-IDs auf Statuswerte, Channels ohne Status fehlen
+    assert data == {"10": BotStatus.ONLINE.value, "11": BotStatus.MAINTENANCE.value}
+    assert json.loads(json.dumps(data)) == data
+
+    loaded = states_from_json(data)
+    assert {channel_id: state.status for channel_id, state in loaded.items()} == {
+        10: BotStatus.ONLINE,
+        11: BotStatus.MAINTENANCE,
+    }
+
+def test_invalid_entries_are_skipped():
+    loaded = states_from_json({"10": "nonsense", "abc": BotStatus.ONLINE.value, "11": BotStatus.OFFLINE.value})
+    assert list(loaded) == [11]
+
+def test_cooldowns_per_status():
+    state = ChannelState()
+    assert state.last_update(BotStatus.ONLINE) == 0.0
+    state.mark_updated(BotStatus.ONLINE, 100.0)
+    state.mark_updated(BotStatus.PROBLEM, 200.0)
+    assert state.last_update(BotStatus.ONLINE) == 100.0
+    assert state.last_update(BotStatus.PROBLEM) == 200.0
+    assert state.last_update(BotStatus.OFFLINE) == 0.0
+
+def test_pending_buffer():
+    state = ChannelState()
+    assert state.take_pending() == []
+    for index in range(5):
+        state.enqueue(str(index), max_batch=3)
+    assert state.take_pending() == ["2", "3", "4"]
+    assert state.pending is None
+
+def test_status_survives_restart(status_bot):
+    manager = status_bot.status_manager
+    manager.get_state(10).status = BotStatus.PROBLEM
+    manager.get_state(11).status = BotStatus.ONLINE
+    manager.get_state(12)
+    manager.save_status()
+
+    restarted = StatusManager(status_bot)
+    restarted.load_data()
+    assert {channel_id: state.status for channel_id, state in restarted.channels.items()} == {
+        10: BotStatus.PROBLEM,
+        11: BotStatus.ONLINE,
+    }
+    # Online-Channels starten mit frischer Nachrichtenzeit und geplanter Inaktivitätsfrist
+    assert restarted.channels[11].last_message_time > 0
+    assert restarted.channels[10].last_message_time == 0.0
+    assert len(restarted.scheduler) == 1
+
+def test_reload_keeps_runtime_state_of_known_channels(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.OFFLINE
+    manager.save_status()
+    state.status = BotStatus.PROBLEM
+    state.enqueue("line", max_batch=10)
+
+    manager.load_data()
+    assert manager.channels[10] is state
+    assert state.status == BotStatus.OFFLINE
+    assert list(state.pending) == ["line"]
+
+def test_remove_channel_persists(status_bot):
+    manager = status_bot.status_manager
+    manager.get_state(10).status = BotStatus.ONLINE
+    manager.save_status()
+    manager.remove_channel(10)
+    assert manager.get_status(10) is None
+    assert status_bot.data_manager.load_json("last_known_status.json") == {}
@@ -0,0 +1,101 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from core.channel_manager import ChannelManager
+from tests.helpers import FakeChannel, http_error
+
+OVERWRITES = {"@everyone": "gesperrt"}
+
+@pytest.fixture
+def channel(bot):
+    channel = FakeChannel(bot.user, channel_id=20, name="status")
+    bot.guild_channels = {"1": {"10": "20"}}
+    bot.get_channel = lambda channel_id: channel if channel_id == 20 else None
+    bot.channel_locker = MagicMock()
+    bot.channel_locker.compute_overwrites = AsyncMock(return_value=OVERWRITES)
+    bot.channel_locker.update_channel_lock = AsyncMock()
+    return channel
+
+@pytest.fixture
+def manager(bot, channel):
+    return ChannelManager(bot)
+
+def channel_states(bot):
+    return json.loads((bot.data_manager.data_dir / "json" / "channel_states.json").read_text(encoding="utf-8"))
+
+def test_name_and_overwrites_in_one_patch(bot, manager, channel):
+    expected = manager.status_channel_name(channel, BotStatus.PROBLEM)
+    asyncio.run(manager.update_channel_state(channel, BotStatus.PROBLEM))
+
+    assert channel.patches == [{"name": expected, "overwrites": OVERWRITES}]
+    bot.channel_locker.update_channel_lock.assert_not_awaited()
+    assert channel_states(bot)["20"]["completed"] is True
+    # Beide Routen sind verbraucht
+    assert manager.rate_budget._calls[("rename", 20)]
+    assert manager.rate_budget._calls[("overwrite", 20)]
+
+def test_channel_without_lock_roles_is_only_renamed(bot, manager, channel):
+    bot.channel_locker.compute_overwrites.return_value = None
+    asyncio.run(manager.update_channel_state(channel, BotStatus.ONLINE))
+
+    assert channel.patches == [{"name": manager.status_channel_name(channel, BotStatus.ONLINE)}]
+    assert ("overwrite", 20) not in manager.rate_budget._calls
+
+def test_unchanged_name_only_updates_lock(bot, manager, channel):
+    channel.name = manager.status_channel_name(channel, BotStatus.ONLINE)
+    asyncio.run(manager.update_channel_state(channel, BotStatus.ONLINE))
+
+    assert channel.patches == []
+    bot.channel_locker.compute_overwrites.assert_not_awaited()
+    bot.channel_locker.update_channel_lock.assert_awaited_once_with(channel, BotStatus.ONLINE)
+
+def test_exhausted_rename_budget_sets_lock_and_hands_rename_to_helper(bot, manager, channel):
+    for _ in range(BotConstants.RENAME_LIMIT):
+        manager.rate_budget.record("rename", 20)
+    expected = manager.status_channel_name(channel, BotStatus.PROBLEM)
+    asyncio.run(manager.update_channel_state(channel, BotStatus.PROBLEM))
+
+    assert channel.patches == []
+    bot.channel_locker.update_channel_lock.assert_awaited_once_with(channel, BotStatus.PROBLEM)
+    state = channel_states(bot)["20"]
+    assert state["desired_name"] == expected and state["completed"] is False
+
+def test_exhausted_budgets_defer_rename(bot, manager, channel):
+    for _ in range(BotConstants.RENAME_LIMIT):
+        manager.rate_budget.record("rename", 20)
+        manager.helper_budget.record("rename", 20)
+
+    async def scenario():
+        await manager.update_channel_state(channel, BotStatus.PROBLEM)
+        assert manager.rate_budget.has_deferred("rename", 20)
+        # Erreicht der Channel den Zielnamen doch noch, wird die Umbenennung verworfen
+        channel.name = manager.status_channel_name(channel, BotStatus.PROBLEM)
+        await manager.update_channel_state(channel, BotStatus.PROBLEM)
+        assert not manager.rate_budget.has_deferred("rename", 20)
+
+    asyncio.run(scenario())
+    assert channel.patches == []
+    assert bot.channel_locker.update_channel_lock.await_count == 2
+
+def test_rate_limited_patch_falls_back_to_separate_steps(bot, manager, channel):
+    channel.patch_error = http_error(status=429)
+    expected = manager.status_channel_name(channel, BotStatus.PROBLEM)
+    asyncio.run(manager.update_channel_state(channel, BotStatus.PROBLEM))
+
+    # Berechtigungen getrennt gesetzt, Umbenennung wegen der Sperre an den Helfer-Bot
+    bot.channel_locker.update_channel_lock.assert_awaited_once_with(channel, BotStatus.PROBLEM)
+    assert channel.patches == []
+    assert channel_states(bot)["20"]["desired_name"] == expected
+    assert manager.rate_budget.plan("rename", 20)[0] == "defer"
+
+def test_other_http_error_is_not_retried(bot, manager, channel):
+    channel.patch_error = http_error(status=500)
+    asyncio.run(manager.update_channel_state(channel, BotStatus.PROBLEM))
+
+    bot.channel_locker.update_channel_lock.assert_not_awaited()
+    assert not (bot.data_manager.data_dir / "json" / "channel_states.json").exists()
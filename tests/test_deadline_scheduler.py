@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+from core.deadline_scheduler import DeadlineScheduler
+
+async def _noop(key):
+    return None
+
+def test_pop_due_in_deadline_order():
+    scheduler = DeadlineScheduler(_noop)
+    scheduler.schedule("c", 30.0)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+    assert scheduler.next_deadline() == 10.0
+    assert scheduler.pop_due(25.0) == ["a", "b"]
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(25.0) == []
+    assert scheduler.pop_due(30.0) == ["c"]
+
+def test_earlier_deadline_is_kept():
+    scheduler = DeadlineScheduler(_noop)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("a", 50.0)
+    assert scheduler.next_deadline() == 10.0
+    scheduler.schedule("a", 5.0)
+    assert scheduler.pop_due(5.0) == ["a"]
+    # Der ersetzte Heap-Eintrag wird übersprungen
+    assert scheduler.pop_due(100.0) == []
+    assert len(scheduler) == 0
+
+def test_cancel():
+    scheduler = DeadlineScheduler(_noop)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+    scheduler.cancel("a")
+    scheduler.cancel("unknown")
+    assert scheduler.next_deadline() == 20.0
+    assert scheduler.pop_due(100.0) == ["b"]
+
+def test_runs_callbacks_and_reschedules():
+    async def scenario():
+        calls = []
+
+        async def callback(key):
+            calls.append(key)
+            # "a" einmal neu planen, danach keine weitere Frist
+            return time.time() + 0.01 if calls == ["a"] else None
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        scheduler.schedule("a", time.time() + 0.01)
+        await asyncio.sleep(0.1)
+        assert calls == ["a", "a"]
+        assert len(scheduler) == 0
+        # Eine frühere Frist weckt die schlafende Schleife
+        scheduler.schedule("b", time.time() + 0.01)
+        await asyncio.sleep(0.05)
+        assert calls == ["a", "a", "b"]
+
+    asyncio.run(scenario())
+
+def test_failing_callback_does_not_stop_scheduler():
+    async def scenario():
+        calls = []
+
+        async def callback(key):
+            calls.append(key)
+            if key == "bad":
+                raise RuntimeError("kaputt")
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        now = time.time()
+        scheduler.schedule("bad", now + 0.01)
+        scheduler.schedule("good", now + 0.02)
+        await asyncio.sleep(0.1)
+        assert calls == ["bad", "good"]
+        assert scheduler.is_running()
+
+    asyncio.run(scenario())
+
+def test_slow_callback_does_not_delay_other_keys():
+    async def scenario():
+        started = {}
+        release = asyncio.Event()
+
+        async def callback(key):
+            started[key] = time.time()
+            if key == "slow":
+                await release.wait()
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        now = time.time()
+        scheduler.schedule("slow", now + 0.01)
+        scheduler.schedule("fast", now + 0.02)
+        await asyncio.sleep(0.1)
+        assert set(started) == {"slow", "fast"}
+        release.set()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+def test_key_due_while_running_is_run_again_afterwards():
+    async def scenario():
+        calls = []
+        release = asyncio.Event()
+
+        async def callback(key):
+            calls.append(key)
+            if len(calls) == 1:
+                await release.wait()
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        scheduler.schedule("a", time.time())
+        await asyncio.sleep(0.02)
+        scheduler.schedule("a", time.time())
+        await asyncio.sleep(0.02)
+        # Höchstens ein Callback pro Schlüssel gleichzeitig
+        assert calls == ["a"]
+        release.set()
+        await asyncio.sleep(0.05)
+        assert calls == ["a", "a"]
+
+    asyncio.run(scenario())
+
+def test_cancel_while_running_drops_returned_deadline():
+    async def scenario():
+        calls = []
+        release = asyncio.Event()
+
+        async def callback(key):
+            calls.append(key)
+            await release.wait()
+            return time.time()
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        scheduler.schedule("a", time.time())
+        await asyncio.sleep(0.02)
+        scheduler.cancel("a")
+        release.set()
+        await asyncio.sleep(0.05)
+        assert calls == ["a"]
+        assert len(scheduler) == 0
+
+    asyncio.run(scenario())
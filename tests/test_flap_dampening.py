@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from core.channel_state import ChannelState
+from tests.helpers import applied_statuses
+
+@pytest.fixture(autouse=True)
+def short_settle(monkeypatch):
+    monkeypatch.setattr(BotConstants, "FLAP_WINDOW", 600)
+    monkeypatch.setattr(BotConstants, "FLAP_LIMIT", 3)
+    monkeypatch.setattr(BotConstants, "FLAP_SETTLE", 0.05)
+
+def test_would_flap_counts_transitions_in_window():
+    state = ChannelState()
+    assert not state.would_flap(100.0, 600, 3)
+    state.note_transition(100.0, 3)
+    assert not state.would_flap(150.0, 600, 3)
+    state.note_transition(150.0, 3)
+    # Der dritte Wechsel innerhalb von 600s wäre ein Flap, außerhalb nicht
+    assert state.would_flap(650.0, 600, 3)
+    assert not state.would_flap(700.0, 600, 3)
+    # Limit < 2 schaltet die Dämpfung ab
+    assert not state.would_flap(151.0, 600, 1)
+
+def test_note_transition_keeps_only_last_limit():
+    state = ChannelState()
+    for timestamp in (1.0, 2.0, 3.0, 4.0):
+        state.note_transition(timestamp, 3)
+    assert list(state.transitions) == [2.0, 3.0, 4.0]
+    state.note_transition(5.0, 2)
+    assert list(state.transitions) == [4.0, 5.0]
+
+def toggle(manager, state, *statuses):
+    for status in statuses:
+        asyncio.run(manager.request_status("10", state, status, f"Test: {status.value}"))
+
+def test_third_transition_is_deferred_and_settles_once(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+
+    async def scenario():
+        for status in (BotStatus.PROBLEM, BotStatus.ONLINE, BotStatus.PROBLEM):
+            await manager.request_status("10", state, status, "Test")
+        assert manager.is_flapping(10)
+        assert applied_statuses(status_bot) == [BotStatus.PROBLEM, BotStatus.ONLINE]
+
+        # Weitere Wechsel führen nur den Zielstatus nach
+        await manager.request_status("10", state, BotStatus.ONLINE, "Test")
+        await manager.request_status("10", state, BotStatus.PROBLEM, "letzter Grund")
+        await manager.request_status("10", state, BotStatus.PROBLEM, "letzter Grund")
+        assert state.deferred.coalesced == 3
+        await state.deferred.task
+
+    asyncio.run(scenario())
+    assert applied_statuses(status_bot) == [BotStatus.PROBLEM, BotStatus.ONLINE, BotStatus.PROBLEM]
+    assert not manager.is_flapping(10)
+    note = status_bot.message_manager.create_status_embed.await_args.args[3]
+    assert "3 Wechsel wurden zusammengefasst" in note
+
+def test_settling_back_to_current_status_applies_nothing(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+
+    async def scenario():
+        for status in (BotStatus.PROBLEM, BotStatus.ONLINE, BotStatus.PROBLEM, BotStatus.ONLINE):
+            await manager.request_status("10", state, status, "Test")
+        await state.deferred.task
+
+    asyncio.run(scenario())
+    assert applied_statuses(status_bot) == [BotStatus.PROBLEM, BotStatus.ONLINE]
+    assert state.status == BotStatus.ONLINE
+    assert state.deferred is None
+
+def test_target_change_restarts_settle_period(status_bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "FLAP_SETTLE", 0.2)
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+
+    async def scenario():
+        for status in (BotStatus.PROBLEM, BotStatus.ONLINE, BotStatus.PROBLEM):
+            await manager.request_status("10", state, status, "Test")
+        await asyncio.sleep(0.15)
+        await manager.request_status("10", state, BotStatus.ONLINE, "Test")
+        await asyncio.sleep(0.15)
+        # Ohne Neustart der Ruhephase wäre der Wechsel jetzt bereits angewendet
+        assert manager.is_flapping(10)
+        await state.deferred.task
+
+    asyncio.run(scenario())
+    assert state.status == BotStatus.ONLINE
+    assert applied_statuses(status_bot) == [BotStatus.PROBLEM, BotStatus.ONLINE]
+
+def test_cancel_deferred_drops_pending_transition(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+
+    async def scenario():
+        for status in (BotStatus.PROBLEM, BotStatus.ONLINE, BotStatus.PROBLEM):
+            await manager.request_status("10", state, status, "Test")
+        task = state.deferred.task
+        manager.cancel_deferred(10)
+        await asyncio.sleep(0.1)
+        return task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert not manager.is_flapping(10)
+    assert applied_statuses(status_bot) == [BotStatus.PROBLEM, BotStatus.ONLINE]
+
+def test_dampening_disabled_with_low_limit(status_bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "FLAP_LIMIT", 1)
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+    statuses = [BotStatus.PROBLEM, BotStatus.ONLINE] * 3
+    toggle(manager, state, *statuses)
+    assert applied_statuses(status_bot) == statuses
+    assert not manager.is_flapping(10)
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+
+from config.constants import BotConstants
+from core.history_writer import MAX_LINE, HistoryWriter
+from tests.helpers import FakeChannel
+
+@pytest.fixture
+def writer(bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "HISTORY_FLUSH_DELAY", 0.01)
+    bot.history_channel_id = 40
+    history_channel = FakeChannel(bot.user, channel_id=40, name="history")
+    bot.get_channel = lambda channel_id: history_channel if channel_id == 40 else None
+    bot.message_manager = SimpleNamespace(webhooks=SimpleNamespace(send=AsyncMock()))
+    return HistoryWriter(bot)
+
+def submit_all(writer, entries):
+    """Reicht alle Einträge ein und wartet, bis der Writer die Warteschlange geleert hat"""
+    async def scenario():
+        for embed, line, category in entries:
+            writer.submit(embed, line, category)
+        await writer._task
+    asyncio.run(scenario())
+
+def sent_messages(bot):
+    return [call.kwargs["embeds"] for call in bot.message_manager.webhooks.send.await_args_list]
+
+def test_single_entry_is_sent_as_its_own_embed(bot, writer):
+    embed = discord.Embed(title="Status Update")
+    submit_all(writer, [(embed, "Server 1: online", "status")])
+    assert sent_messages(bot) == [[embed]]
+
+def test_burst_is_combined_into_one_digest(bot, writer):
+    lines = [f"Server {index}: offline" for index in range(5)]
+    submit_all(writer, [(discord.Embed(), line, "status") for line in lines])
+
+    [embeds] = sent_messages(bot)
+    assert len(embeds) == 1
+    assert embeds[0].title == "Status Change Log"
+    assert embeds[0].description.splitlines() == lines
+
+def test_long_lines_are_truncated(bot, writer):
+    submit_all(writer, [(discord.Embed(), "x" * 1000, "status"), (discord.Embed(), "kurz", "status")])
+    first, second = sent_messages(bot)[0][0].description.splitlines()
+    assert len(first) == MAX_LINE and first.endswith("…")
+    assert second == "kurz"
+
+def test_overflow_is_reported_as_summary(bot, writer, monkeypatch):
+    monkeypatch.setattr(BotConstants, "HISTORY_QUEUE_MAX", 2)
+    categories = ["status", "status", "status", "muster", "status"]
+    submit_all(writer, [(discord.Embed(), f"Eintrag {index}", category) for index, category in enumerate(categories)])
+
+    [embeds] = sent_messages(bot)
+    assert embeds[0].description.splitlines() == ["Eintrag 0", "Eintrag 1"]
+    [field] = embeds[-1].fields
+    assert field.name == "⚠️ Überlast"
+    assert field.value == "3 weitere Einträge nicht einzeln protokolliert (status: 2, muster: 1)"
+
+def test_large_backlog_is_split_into_pages_and_messages(bot, writer):
+    submit_all(writer, [(discord.Embed(), f"{index:03d}" + "y" * (MAX_LINE - 4), "status") for index in range(25)])
+
+    messages = sent_messages(bot)
+    for embeds in messages:
+        assert len(embeds) <= 10
+        assert all(len(embed.description) <= 4096 for embed in embeds)
+        assert sum(len(embed) for embed in embeds) <= 6000
+    lines = [line for embeds in messages for embed in embeds for line in embed.description.splitlines()]
+    # Alle Einträge kommen in Reihenfolge an, verteilt auf mehrere Nachrichten
+    assert [line[:3] for line in lines] == [f"{index:03d}" for index in range(25)]
+    assert len(messages) == 2 and len(messages[0]) == 2
+
+def test_missing_history_channel_discards_queue(bot, writer):
+    bot.history_channel_id = 41
+    submit_all(writer, [(discord.Embed(), "a", "status"), (discord.Embed(), "b", "status")])
+    assert sent_messages(bot) == []
+    assert not writer._queue
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from tests.helpers import applied_statuses
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch):
+    monkeypatch.setattr(BotConstants, "INGEST_WINDOW", 0.01)
+
+def log_message(content: str, channel_id: int = 10, guild_id: int = 1):
+    return SimpleNamespace(content=content, channel=SimpleNamespace(id=channel_id), guild=SimpleNamespace(id=guild_id))
+
+def test_burst_results_in_one_update_with_last_match(status_bot):
+    manager = status_bot.status_manager
+
+    async def scenario():
+        await manager.process_message(log_message("Bot startup"))
+        for index in range(30):
+            await manager.process_message(log_message(f"Exception in worker {index}"))
+        await manager.process_message(log_message("Ending PokeTrade"))
+        await manager.process_message(log_message("trade queue empty"))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert applied_statuses(status_bot) == [BotStatus.OFFLINE]
+    assert manager.get_status(10) == BotStatus.OFFLINE
+    assert manager.channels[10].flush_task is None
+
+def test_lines_arriving_during_an_update_form_the_next_batch(status_bot):
+    manager = status_bot.status_manager
+    release = asyncio.Event()
+    batches = []
+
+    async def slow_message(*args):
+        batches.append(len(batches))
+        if len(batches) == 1:
+            await release.wait()
+        return SimpleNamespace(id=1)
+
+    status_bot.message_manager.update_status_message.side_effect = slow_message
+
+    async def scenario():
+        await manager.process_message(log_message("Bot startup"))
+        await asyncio.sleep(0.03)
+        flush_task = manager.channels[10].flush_task
+        # Das erste Update hängt; neue Zeilen starten keine zweite Auswertung
+        await manager.process_message(log_message("Timeout"))
+        await manager.process_message(log_message("Ending PokeTrade"))
+        assert manager.channels[10].flush_task is flush_task
+        release.set()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert applied_statuses(status_bot) == [BotStatus.ONLINE, BotStatus.OFFLINE]
+
+def test_overflowing_batch_keeps_newest_lines(status_bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "INGEST_MAX_BATCH", 3)
+    manager = status_bot.status_manager
+
+    async def scenario():
+        await manager.process_message(log_message("Ending PokeTrade"))
+        for _ in range(3):
+            await manager.process_message(log_message("trade queue empty"))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert applied_statuses(status_bot) == []
+
+def test_unmonitored_messages_are_ignored(status_bot):
+    manager = status_bot.status_manager
+
+    async def scenario():
+        await manager.process_message(log_message("Ending PokeTrade", channel_id=11))
+        await manager.process_message(log_message("Ending PokeTrade", guild_id=2))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert manager.channels == {}
+    assert applied_statuses(status_bot) == []
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from utils.interarrival_stats import InterArrivalStats, P2Quantile
+
+def exact_quantile(values, quantile):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+def test_empty_and_warm_up():
+    sketch = P2Quantile(0.5)
+    assert sketch.value() is None
+    for value in (5.0, 1.0, 3.0):
+        sketch.add(value)
+    # Vor der Initialisierung direkt aus den sortierten Werten
+    assert sketch.value() == 3.0
+    assert sketch.count == 3
+
+@pytest.mark.parametrize("quantile", [0.5, 0.9, 0.95])
+@pytest.mark.parametrize("distribution", ["uniform", "exponential"])
+def test_estimate_close_to_exact_quantile(quantile, distribution):
+    rng = random.Random(7)
+    if distribution == "uniform":
+        values = [rng.uniform(0, 100) for _ in range(20000)]
+    else:
+        values = [rng.expovariate(1 / 30) for _ in range(20000)]
+    sketch = P2Quantile(quantile)
+    for value in values:
+        sketch.add(value)
+    exact = exact_quantile(values, quantile)
+    assert sketch.value() == pytest.approx(exact, rel=0.05)
+    assert sketch.count == len(values)
+
+def test_markers_stay_sorted():
+    rng = random.Random(3)
+    sketch = P2Quantile(0.9)
+    for _ in range(5000):
+        sketch.add(rng.choice([1.0, 1.0, 2.0, 60.0, rng.uniform(0, 600)]))
+        assert sketch.heights == sorted(sketch.heights)
+
+def test_threshold():
+    stats = InterArrivalStats(quantile=0.9, alpha=0.5)
+    for _ in range(4):
+        stats.add(10.0)
+    assert stats.threshold(factor=3, min_samples=5, lower=60, upper=3600) is None
+    stats.add(10.0)
+    assert stats.count == 5
+    # 3 * 10s liegt unter der Untergrenze
+    assert stats.threshold(factor=3, min_samples=5, lower=60, upper=3600) == 60
+    for _ in range(50):
+        stats.add(100.0)
+    assert stats.threshold(factor=3, min_samples=5, lower=60, upper=3600) == pytest.approx(300.0)
+    assert stats.threshold(factor=100, min_samples=5, lower=60, upper=3600) == 3600
+
+def test_ewma_reacts_to_slower_rate():
+    stats = InterArrivalStats(quantile=0.9, alpha=0.5)
+    stats.add(10.0)
+    assert stats.ewma == 10.0
+    stats.add(30.0)
+    assert stats.ewma == 20.0
@@ -0,0 +1,45 @@
+from bot_status import BotStatus
+from utils.pattern_stats import PatternStats
+from utils.status_patterns import StatusPatterns
+
+def test_identical_lines_are_evaluated_once():
+    patterns = StatusPatterns()
+    for _ in range(5):
+        assert patterns.check_patterns("  Bot startup  ") == BotStatus.ONLINE
+    # Unterschiedliche Schreibweise ergibt nach strip/lower dieselbe Zeile
+    patterns.check_patterns("BOT STARTUP")
+    info = patterns.cache_info()
+    assert (info["misses"], info["hits"], info["size"]) == (1, 5, 1)
+
+def test_misses_are_cached_too():
+    patterns = StatusPatterns()
+    assert patterns.match("trade queue empty") is None
+    assert patterns.match("trade queue empty") is None
+    assert patterns.cache_info()["hits"] == 1
+
+def test_cache_is_bounded():
+    patterns = StatusPatterns(line_cache_size=3)
+    for index in range(10):
+        patterns.match(f"line {index}")
+    assert patterns.cache_info()["size"] == 3
+    assert patterns.cache_info()["max_size"] == 3
+
+def test_recompiling_drops_cached_results():
+    patterns = StatusPatterns()
+    assert patterns.match("custom ready") is None
+    patterns.online.append("custom ready")
+    patterns.compile_patterns()
+    assert patterns.cache_info()["size"] == 0
+    assert patterns.match("custom ready") == (BotStatus.ONLINE, "custom ready")
+
+def test_cached_hits_still_count_in_stats():
+    stats = PatternStats()
+    patterns = StatusPatterns(stats=stats)
+    for _ in range(3):
+        patterns.match("Failed to connect")
+    assert stats.hits(BotStatus.PROBLEM, "Failed to connect") == 3
+
+def test_normalized_input_skips_strip_and_lower():
+    patterns = StatusPatterns()
+    assert patterns.match("bot startup", normalized=True) == (BotStatus.ONLINE, "Bot startup")
+    assert patterns.match("Bot startup", normalized=True) is None
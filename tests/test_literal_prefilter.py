@@ -0,0 +1,93 @@
+import random
+import re
+
+import pytest
+
+from utils import literal_prefilter
+from utils.literal_prefilter import LiteralPrefilter, extract_literal
+from utils.pattern_safety import fold_pattern
+from utils.status_patterns import StatusPatterns
+
+@pytest.fixture(params=["aho-corasick", "regex"])
+def backend(request, monkeypatch):
+    """Führt jeden Test mit beiden Verfahren aus (Regex-Fallback ohne pyahocorasick)"""
+    if request.param == "aho-corasick":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(literal_prefilter, "ahocorasick", None)
+    return request.param
+
+def reference_match(patterns: StatusPatterns, content: str):
+    """Ursprüngliche Auswertung ohne Vorfilter und Cache: ein re.search pro Muster in Prioritätsreihenfolge"""
+    text = content.strip().lower()
+    for category, status in StatusPatterns._CATEGORIES:
+        for pattern in getattr(patterns, category):
+            if re.search(fold_pattern(pattern), text):
+                return status, pattern
+    return None
+
+def build_corpus(patterns: StatusPatterns, count: int, seed: int = 1):
+    """Log-Zeilen mit eingestreuten Schlüsselwörtern, Teilwörtern und wechselnder Schreibweise"""
+    rng = random.Random(seed)
+    keywords = [pattern.replace(r'\b', '') for pattern in patterns.offline + patterns.error + patterns.online]
+    keywords += ["disconnected", "reconnecting", "timeouts", "exceptional", "starting", "lobby"]
+    filler = ["trade", "queue", "user", "checking", "offset", "sending", "pokemon", "raid", "done"]
+    lines = []
+    for _ in range(count):
+        words = rng.choices(filler, k=rng.randint(1, 8))
+        if rng.random() < 0.3:
+            keyword = rng.choice(keywords)
+            keyword = rng.choice([keyword, keyword.upper(), keyword.title()])
+            words.insert(rng.randint(0, len(words)), keyword)
+        lines.append(" ".join(words))
+    return lines
+
+def test_extract_literal():
+    assert extract_literal("ending poketrade") == "ending poketrade"
+    assert extract_literal(r"\bconnected\b") == "connected"
+    assert extract_literal(r"failed to (connect|establish)") == "failed to "
+    assert extract_literal(r"a.b") is None
+    assert extract_literal(r"(unclosed") is None
+
+def test_candidates(backend):
+    prefilter = LiteralPrefilter(["ending poketrade", r"\bconnected\b", r"error \d+"])
+    assert prefilter.backend == backend
+    assert prefilter.candidates("ending poketrade now") == {0}
+    assert prefilter.candidates("disconnected, error 5") == {1, 2}
+    assert prefilter.candidates("nothing to see") == frozenset()
+
+def test_candidates_always_include_patterns_without_literal(backend):
+    prefilter = LiteralPrefilter([r"\d+\s\w+", "timeout"])
+    assert prefilter.always == {0}
+    assert prefilter.candidates("all good") == {0}
+    assert prefilter.candidates("timeout") == {0, 1}
+    assert prefilter.matching_lines(["all good"]) is None
+
+def test_matching_lines(backend):
+    prefilter = LiteralPrefilter(["timeout", "exception"])
+    lines = ["ok", "read timeout", "", "ok", "exception in thread", "timeouttimeout"]
+    assert prefilter.matching_lines(lines) == {1, 4, 5}
+    assert prefilter.matching_lines([]) == set()
+    assert prefilter.matching_lines(["ok", "fine"]) == set()
+
+def test_prefilter_agrees_with_regex_on_cold_cache(backend):
+    """Vorfilter samt Zeilen-Cache liefert dieselben Treffer wie die reine Regex-Auswertung"""
+    reference = StatusPatterns()
+    lines = build_corpus(reference, 3000)
+    # Neues Musterset: der Zeilen-Cache ist leer, jede Zeile läuft durch den Vorfilter
+    patterns = StatusPatterns()
+    assert patterns.cache_info()["size"] == 0
+    for line in lines:
+        assert patterns.match(line) == reference_match(reference, line), line
+
+def test_classify_many_agrees_with_regex(backend):
+    reference = StatusPatterns()
+    lines = build_corpus(reference, 2000, seed=2)
+    messages = [(index % 7, line) for index, line in enumerate(lines)]
+
+    expected = {}
+    for channel, line in messages:
+        result = reference_match(reference, line)
+        if result is not None:
+            expected[channel] = result[0]
+    assert StatusPatterns().classify_many(messages, chunk_size=16) == expected
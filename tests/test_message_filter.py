@@ -0,0 +1,46 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from discord.ext import commands
+
+from core.bot_core import StatusBot
+
+def make_bot(prefix):
+    bot = SimpleNamespace(
+        command_prefix=prefix,
+        process_commands=AsyncMock(),
+        status_manager=SimpleNamespace(process_message=AsyncMock()),
+        monitored_channels=frozenset({10}),
+        accepted_messages=0,
+        dropped_messages=0,
+        user=SimpleNamespace(id=1),
+    )
+    bot.get_prefix = lambda message: commands.Bot.get_prefix(bot, message)
+    return bot
+
+def receive(bot, content: str, channel_id: int):
+    message = SimpleNamespace(content=content, channel=SimpleNamespace(id=channel_id))
+    asyncio.run(StatusBot.on_message(bot, message))
+    return message
+
+def test_unmonitored_channels_are_dropped():
+    bot = make_bot("!")
+    receive(bot, "Connected", 99)
+    receive(bot, "Connected", 10)
+    assert (bot.dropped_messages, bot.accepted_messages) == (1, 1)
+    assert bot.status_manager.process_message.await_count == 1
+    bot.process_commands.assert_not_awaited()
+
+@pytest.mark.parametrize("prefix", [
+    "!",
+    ["?", "!"],
+    lambda bot, message: ["$", "!"],
+    commands.when_mentioned_or("!"),
+])
+def test_commands_are_detected_for_every_prefix_form(prefix):
+    bot = make_bot(prefix)
+    receive(bot, "!help", 99)
+    receive(bot, "status text", 99)
+    assert bot.process_commands.await_count == 1
@@ -0,0 +1,40 @@
+from utils.message_normalizer import MessageNormalizer
+from utils.status_patterns import StatusPatterns
+
+def normalize(content: str, max_length: int = 500) -> str:
+    return MessageNormalizer(max_length).normalize(content)
+
+def test_empty():
+    assert normalize("") == ""
+    assert normalize("   \n ") == ""
+
+def test_lowercase_and_whitespace():
+    assert normalize("  Starting   main\tPokeTradeBot \n") == "starting main poketradebot"
+
+def test_ansi_and_code_fences():
+    assert normalize("```ansi\n\x1b[31mCritical error\x1b[0m\n```") == "critical error"
+    assert normalize("`Timeout` reached") == "timeout reached"
+
+def test_timestamps():
+    assert normalize("2024-06-01 12:00:00.123 Bot startup") == "bot startup"
+    assert normalize("2024-06-01T12:00:00Z Bot startup") == "bot startup"
+    assert normalize("[12:00:05] Connected") == "connected"
+    assert normalize("Connected <t:1717243200:R>") == "connected"
+    # Zahlen ohne Zeitstempel-Form bleiben erhalten
+    assert normalize("Error 2024-06") == "error 2024-06"
+
+def test_quotes_and_markdown():
+    assert normalize("> **Ending** PokeTrade\n> __now__") == "ending poketrade now"
+    assert normalize("||secret|| ~~old~~") == "secret old"
+
+def test_truncates_after_cleanup():
+    assert normalize("**" + "a" * 20, max_length=10) == "a" * 10
+
+def test_keeps_characters_that_change_under_casefold():
+    # str.lower wie bei den Mustern, casefold würde ß zu ss machen
+    assert normalize("Straße") == "straße"
+
+def test_normalized_text_matches_like_raw_text():
+    patterns = StatusPatterns()
+    raw = "[12:00:05] **Ending PokeTrade** loop"
+    assert patterns.check_patterns(normalize(raw), normalized=True) == patterns.check_patterns(raw)
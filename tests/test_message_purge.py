@@ -0,0 +1,69 @@
+import asyncio
+
+import discord
+import pytest
+
+from config.constants import BotConstants
+from tests.helpers import FakeChannel
+
+@pytest.fixture
+def channel(bot):
+    return FakeChannel(bot.user)
+
+def embed():
+    return discord.Embed(title="Bot Status Update")
+
+def test_every_sent_message_is_tracked(message_manager, channel):
+    async def scenario():
+        first = await message_manager.send_with_retry(channel, embed(), None)
+        second = await message_manager.send_with_retry(channel, embed(), None)
+        assert message_manager.posted_ids[str(channel.id)] == [first.id, second.id]
+
+        deleted = await message_manager.purge_bot_messages(channel)
+        assert [message.id for message in deleted] == [first.id, second.id]
+        assert channel.deleted == [first.id, second.id]
+        assert message_manager.posted_ids[str(channel.id)] == []
+
+    asyncio.run(scenario())
+
+def test_purge_uses_record_instead_of_history(message_manager, channel):
+    async def scenario():
+        sent = await message_manager.send_with_retry(channel, embed(), None)
+        # Fremde Nachricht und eine nicht aufgezeichnete Bot-Nachricht im Verlauf
+        channel.history_messages.append(channel.message(author=object()))
+        channel.history_messages.append(channel.message())
+        await message_manager.purge_bot_messages(channel)
+        assert channel.deleted == [sent.id]
+
+    asyncio.run(scenario())
+
+def test_empty_record_falls_back_to_history_scan(message_manager, channel, monkeypatch):
+    monkeypatch.setattr(BotConstants, "RETRY_DELAY", 0)
+
+    async def scenario():
+        await message_manager.send_with_retry(channel, embed(), None)
+        await message_manager.purge_bot_messages(channel)
+        channel.deleted.clear()
+
+        # Senden schlägt fehl, die Nachricht wird nicht aufgezeichnet; später gepostete Bot-Nachricht
+        channel.fail_send = True
+        assert await message_manager.send_with_retry(channel, embed(), None, retries=1) is None
+        stray = channel.message()
+        foreign = channel.message(author=object())
+        channel.history_messages.extend([stray, foreign])
+
+        await message_manager.purge_bot_messages(channel)
+        assert stray.id in channel.deleted
+        assert foreign.id not in channel.deleted
+
+    asyncio.run(scenario())
+
+def test_replace_status_message_tracks_and_stores_id(message_manager, channel):
+    async def scenario():
+        old = await message_manager.send_with_retry(channel, embed(), None)
+        message = await message_manager._replace_status_message(channel, embed(), None)
+        assert channel.deleted == [old.id]
+        assert message_manager.posted_ids[str(channel.id)] == [message.id]
+        assert message_manager.message_ids[str(channel.id)] == message.id
+
+    asyncio.run(scenario())
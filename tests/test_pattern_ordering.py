@@ -0,0 +1,78 @@
+import asyncio
+
+from bot_status import BotStatus
+from utils.pattern_stats import PatternStats
+from utils.status_patterns import StatusPatterns
+
+def order(patterns: StatusPatterns):
+    return [pattern for _, _, pattern in patterns._compiled]
+
+def test_reorder_within_tier_keeps_priority():
+    stats = PatternStats()
+    patterns = StatusPatterns(stats=stats)
+    assert not patterns.reorder_patterns()
+
+    for _ in range(10):
+        stats.record_hit(BotStatus.ONLINE, "Connecting to lobby")
+    stats.record_hit(BotStatus.OFFLINE, "Ending RotatingRaidBotSV")
+    assert patterns.reorder_patterns()
+    assert not patterns.reorder_patterns()
+
+    compiled = order(patterns)
+    assert compiled[0] == "Ending RotatingRaidBotSV"
+    # Online bleibt die niedrigste Stufe, trotz der meisten Treffer
+    online_start = len(patterns.offline) + len(patterns.error)
+    assert compiled[online_start] == "Connecting to lobby"
+    # Gleichstand behält die deklarierte Reihenfolge
+    assert compiled[1:len(patterns.offline)] == [p for p in patterns.offline if p != "Ending RotatingRaidBotSV"]
+    assert patterns.match("Connecting to lobby, then Ending PokeTrade")[0] == BotStatus.OFFLINE
+
+def test_frequent_pattern_decides_within_tier():
+    stats = PatternStats()
+    patterns = StatusPatterns(stats=stats)
+    line = "Starting main PokeTradeBot"
+    assert patterns.match(line) == (BotStatus.ONLINE, "Starting main PokeTradeBot")
+
+    for _ in range(5):
+        stats.record_hit(BotStatus.ONLINE, "Starting main")
+    patterns.reorder_patterns()
+    # Neue Zeilen entscheidet jetzt das häufigere Muster; der Status ist derselbe
+    assert patterns.match(line + " again") == (BotStatus.ONLINE, "Starting main")
+
+def test_cost_is_recorded_only_for_real_evaluations():
+    stats = PatternStats()
+    patterns = StatusPatterns(stats=stats)
+    for _ in range(3):
+        patterns.match("Timeout while reading")
+    [(key, hits, mean_seconds)] = stats.top(1)
+    assert (key, hits) == ("problem:Timeout", 3)
+    assert stats.entries[key][1] == 1
+    assert mean_seconds >= 0
+
+def test_stats_round_trip():
+    stats = PatternStats()
+    stats.record_hit(BotStatus.ONLINE, "Connected")
+    stats.record_cost(BotStatus.ONLINE, "Connected", 0.25)
+    assert stats.dirty
+
+    loaded = PatternStats()
+    loaded.load(stats.to_dict())
+    assert loaded.entries == stats.entries
+    assert not loaded.dirty
+
+def test_maintenance_reorders_compiled_and_sandbox_sets(pattern_manager):
+    manager = pattern_manager
+    manager.add_pattern("1", "online", "custom ready", channel_id="10")
+    key = manager._key_for("1", "10")
+    custom = manager.get_patterns("1", "10")
+    assert manager._sandbox_key(key)[2][-1] == "custom ready"
+
+    for _ in range(3):
+        manager.stats.record_hit(BotStatus.ONLINE, "custom ready")
+    asyncio.run(manager.maintain_patterns())
+
+    assert order(custom)[-len(custom.online)] == "custom ready"
+    assert manager._sandbox_key(key)[2][0] == "custom ready"
+    assert not manager.stats.dirty
+    saved = manager.bot.data_manager.load_json("pattern_stats.json")
+    assert saved["online:custom ready"]["hits"] == 3
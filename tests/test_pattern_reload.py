@@ -0,0 +1,64 @@
+import asyncio
+import json
+import os
+
+from bot_status import BotStatus
+
+def write_patterns(manager, data, bump: int = 1):
+    """Schreibt die Musterdatei und verschiebt die Änderungszeit, damit die Signatur sicher wechselt"""
+    manager.patterns_file.parent.mkdir(parents=True, exist_ok=True)
+    content = data if isinstance(data, str) else json.dumps(data)
+    manager.patterns_file.write_text(content, encoding="utf-8")
+    stat = manager.patterns_file.stat()
+    os.utime(manager.patterns_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+def test_missing_file_is_created_from_builtin_patterns(pattern_manager):
+    pattern_manager.load_data()
+    saved = json.loads(pattern_manager.patterns_file.read_text(encoding="utf-8"))
+    assert saved == pattern_manager.bot.patterns.to_dict()
+    assert pattern_manager.patterns_version == 0
+
+def test_changed_file_is_swapped_in(pattern_manager):
+    pattern_manager.load_data()
+    old = pattern_manager.bot.patterns
+    pattern_manager.add_pattern("1", "error", "guild error")
+    guild_matcher = pattern_manager.get_patterns("1", "10")
+
+    write_patterns(pattern_manager, {"online": ["fresh start"]})
+    asyncio.run(pattern_manager.watch_pattern_file())
+
+    new = pattern_manager.bot.patterns
+    assert new is not old
+    assert pattern_manager.patterns_version == 1
+    assert new.stats is pattern_manager.stats
+    assert new.check_patterns("Fresh Start") == BotStatus.ONLINE
+    assert new.check_patterns("Bot startup") is None
+    # Fehlende Kategorien übernehmen die eingebauten Muster
+    assert new.check_patterns("Ending PokeTrade") == BotStatus.OFFLINE
+
+    # Guild-Sets erben die neuen Standard-Muster und werden neu kompiliert
+    matcher = pattern_manager.get_patterns("1", "10")
+    assert matcher is not guild_matcher
+    assert matcher.check_patterns("fresh start") == BotStatus.ONLINE
+
+    # Ohne weitere Änderung passiert nichts
+    asyncio.run(pattern_manager.watch_pattern_file())
+    assert pattern_manager.patterns_version == 1
+
+def test_invalid_file_keeps_current_patterns(pattern_manager):
+    pattern_manager.load_data()
+    current = pattern_manager.bot.patterns
+
+    for bump, content in enumerate(['{"online": ["(unclosed"]}', '{"online": [1, 2]}', "not json", '{"error": ["(a+)+$"]}'], start=1):
+        write_patterns(pattern_manager, content, bump)
+        asyncio.run(pattern_manager.watch_pattern_file())
+        assert pattern_manager.bot.patterns is current, content
+        assert pattern_manager.patterns_version == 0
+        # Die ungültige Datei wird nicht bei jedem Durchlauf erneut geprüft
+        assert pattern_manager._patterns_signature == pattern_manager._file_signature()
+
+def test_existing_file_is_loaded_on_start(pattern_manager):
+    write_patterns(pattern_manager, {"offline": ["going down"]})
+    pattern_manager.load_data()
+    assert pattern_manager.patterns_version == 1
+    assert pattern_manager.bot.patterns.check_patterns("Going Down") == BotStatus.OFFLINE
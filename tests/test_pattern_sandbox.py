@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from core import pattern_sandbox
+from core.pattern_sandbox import PatternSandbox, PatternSandboxError, PatternTimeout
+
+KEY = (("ending poketrade",), ("custom failure",), ("custom ready",))
+
+def test_sandbox_sends_patterns_once_per_worker():
+    async def scenario():
+        sandbox = PatternSandbox(timeout=5.0)
+        try:
+            status, pattern, _ = await sandbox.classify(KEY, "Custom Failure in module")
+            assert (status, pattern) == (BotStatus.PROBLEM, "custom failure")
+            worker = sandbox._workers[0]
+            assert worker.known == {sandbox._set_id(KEY)}
+
+            # Hauptprozess hält eine ID für bekannt, die der Worker nicht (mehr) hat:
+            # der Worker meldet das, und die Muster werden erneut mitgeschickt
+            sandbox._set_ids[KEY] = 100
+            worker.known.add(100)
+            status, _, _ = await sandbox.classify(KEY, "custom ready")
+            assert status == BotStatus.ONLINE
+
+            results = await sandbox.classify_many(KEY, [(1, "custom ready"), (1, "ending poketrade"), (2, "noise")], 5.0)
+            assert results == {1: BotStatus.OFFLINE}
+        finally:
+            sandbox.reset()
+
+    asyncio.run(scenario())
+
+def test_startup_failure_is_not_a_timeout(monkeypatch):
+    async def failing_get_pool(self):
+        raise PatternSandboxError("kein Prozess")
+
+    monkeypatch.setattr(pattern_sandbox._SandboxWorker, "get_pool", failing_get_pool)
+
+    async def scenario():
+        sandbox = PatternSandbox(timeout=5.0)
+        with pytest.raises(PatternSandboxError):
+            await sandbox.classify(KEY, "custom ready")
+        # Der Worker steht danach wieder zur Verfügung
+        assert sandbox._idle_workers().qsize() == 1
+
+    asyncio.run(scenario())
+
+def test_manager_falls_back_once_on_sandbox_error(pattern_manager, monkeypatch):
+    monkeypatch.setattr(BotConstants, "PATTERN_SANDBOX", True)
+    pattern_manager.add_pattern("1", "online", "custom ready", channel_id="10")
+
+    async def broken(*args, **kwargs):
+        raise PatternSandboxError("kein Prozess")
+
+    monkeypatch.setattr(pattern_manager.sandbox, "classify", broken)
+    monkeypatch.setattr(pattern_manager.sandbox, "classify_many", broken)
+
+    async def scenario():
+        # Standard-Muster für diesen Aufruf, das eigene Muster trifft also nicht
+        assert await pattern_manager.classify("1", "10", "custom ready") is None
+        assert await pattern_manager.classify("1", "10", "Bot startup") == BotStatus.ONLINE
+        assert await pattern_manager.classify_history("1", "10", [(10, "ending poketrade")]) == {10: BotStatus.OFFLINE}
+
+    asyncio.run(scenario())
+    assert not pattern_manager.is_quarantined("1", "10")
+
+def test_manager_quarantines_on_timeout(pattern_manager, monkeypatch):
+    monkeypatch.setattr(BotConstants, "PATTERN_SANDBOX", True)
+    pattern_manager.add_pattern("1", "online", "custom ready", channel_id="10")
+
+    async def slow(*args, **kwargs):
+        raise PatternTimeout("zu langsam")
+
+    monkeypatch.setattr(pattern_manager.sandbox, "classify", slow)
+    assert asyncio.run(pattern_manager.classify("1", "10", "Bot startup")) == BotStatus.ONLINE
+    assert pattern_manager.is_quarantined("1", "10")
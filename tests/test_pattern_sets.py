@@ -0,0 +1,88 @@
+from bot_status import BotStatus
+from core.pattern_manager import PatternManager
+
+def test_resolution_order_per_category(pattern_manager):
+    defaults = pattern_manager.bot.patterns
+    pattern_manager.guild_patterns = {"1": {"online": ["guild up"], "error": ["guild error"]}}
+    pattern_manager.channel_patterns = {"10": {"online": ["channel up"]}}
+
+    resolved = pattern_manager.resolve("1", "10")
+    assert resolved["online"] == ["channel up"]
+    assert resolved["error"] == ["guild error"]
+    assert resolved["offline"] == defaults.offline
+
+    # Anderer Channel derselben Guild erbt nur von der Guild
+    assert pattern_manager.resolve("1", "11")["online"] == ["guild up"]
+    # Fremde Guild: Standard-Muster
+    assert pattern_manager.resolve("2", "20") == defaults.to_dict()
+
+def test_channels_without_overrides_use_default_matcher(pattern_manager):
+    assert pattern_manager.get_patterns("1", "10") is pattern_manager.bot.patterns
+    assert pattern_manager.get_cache_info()["compiled"] == 0
+
+def test_add_pattern_copies_inherited_category(pattern_manager):
+    defaults = pattern_manager.bot.patterns
+    assert pattern_manager.add_pattern("1", "error", "guild error")
+    assert not pattern_manager.add_pattern("1", "error", "guild error")
+    assert pattern_manager.guild_patterns["1"] == {"error": defaults.error + ["guild error"]}
+
+    assert pattern_manager.add_pattern("1", "error", "channel error", channel_id="10")
+    assert pattern_manager.resolve("1", "10")["error"] == defaults.error + ["guild error", "channel error"]
+
+    matcher = pattern_manager.get_patterns("1", "10")
+    assert matcher.check_patterns("Channel Error while trading") == BotStatus.PROBLEM
+    # Die übrigen Kategorien bleiben aktiv
+    assert matcher.check_patterns("Bot startup") == BotStatus.ONLINE
+
+def test_remove_and_reset(pattern_manager):
+    assert not pattern_manager.remove_pattern("1", "online", "not there")
+    assert pattern_manager.remove_pattern("1", "online", "Bot startup")
+    assert "Bot startup" not in pattern_manager.resolve("1", "10")["online"]
+    assert pattern_manager.get_patterns("1", "10").check_patterns("Bot startup") is None
+
+    assert pattern_manager.reset_patterns("1")
+    assert not pattern_manager.reset_patterns("1")
+    assert pattern_manager.get_patterns("1", "10") is pattern_manager.bot.patterns
+
+def test_identical_sets_share_one_matcher(pattern_manager):
+    pattern_manager.add_pattern("1", "online", "custom ready", channel_id="10")
+    pattern_manager.add_pattern("1", "online", "custom ready", channel_id="11")
+    assert pattern_manager.get_patterns("1", "10") is pattern_manager.get_patterns("1", "11")
+    assert pattern_manager.get_cache_info()["compiled"] == 1
+
+def test_matcher_cache_evicts_least_recently_used(pattern_manager):
+    pattern_manager.cache_size = 2
+    for channel_id in ("10", "11", "12"):
+        pattern_manager.add_pattern("1", "online", f"ready {channel_id}", channel_id=channel_id)
+
+    first = pattern_manager.get_patterns("1", "10")
+    second = pattern_manager.get_patterns("1", "11")
+    # 10 wieder verwenden, danach verdrängt 12 den Eintrag von 11
+    assert pattern_manager.get_patterns("1", "10") is first
+    pattern_manager.get_patterns("1", "12")
+    assert pattern_manager.get_cache_info()["compiled"] == 2
+    assert pattern_manager.get_patterns("1", "10") is first
+    assert pattern_manager.get_patterns("1", "11") is not second
+
+def test_configuration_change_invalidates_channel_keys(pattern_manager):
+    pattern_manager.add_pattern("1", "online", "first", channel_id="10")
+    before = pattern_manager.get_patterns("1", "10")
+    pattern_manager.add_pattern("1", "online", "second", channel_id="10")
+    after = pattern_manager.get_patterns("1", "10")
+    assert after is not before
+    assert after.check_patterns("second") == BotStatus.ONLINE
+
+def test_configuration_survives_reload(pattern_manager, bot):
+    pattern_manager.add_pattern("1", "offline", "guild down")
+    pattern_manager.add_pattern("1", "online", "channel up", channel_id="10")
+
+    reloaded = PatternManager(bot)
+    reloaded.load_data()
+    assert reloaded.resolve("1", "10") == pattern_manager.resolve("1", "10")
+    assert reloaded.get_patterns("1", "10").check_patterns("Guild Down") == BotStatus.OFFLINE
+
+def test_remove_channel_drops_override(pattern_manager):
+    pattern_manager.add_pattern("1", "online", "channel up", channel_id="10")
+    pattern_manager.remove_channel("10")
+    assert "10" not in pattern_manager.channel_patterns
+    assert pattern_manager.get_patterns("1", "10") is pattern_manager.bot.patterns
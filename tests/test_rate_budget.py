@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from core.rate_budget import RateBudget
+
+LIMITS = {"rename": (2, 600.0)}
+
+def test_next_allowed_sliding_window():
+    budget = RateBudget(LIMITS, "Test")
+    assert budget.next_allowed("rename", 1, now=100.0) == 100.0
+    budget.record("rename", 1, now=100.0)
+    assert budget.next_allowed("rename", 1, now=101.0) == 101.0
+    budget.record("rename", 1, now=200.0)
+    # Limit erreicht: frei, sobald der älteste Aufruf aus dem Fenster fällt
+    assert budget.next_allowed("rename", 1, now=300.0) == 700.0
+    budget.record("rename", 1, now=700.0)
+    assert budget.next_allowed("rename", 1, now=700.0) == 800.0
+    # Andere Channels haben ein eigenes Budget
+    assert budget.next_allowed("rename", 2, now=300.0) == 300.0
+
+def test_penalize_keeps_longest_block():
+    budget = RateBudget(LIMITS, "Test")
+    budget.penalize("rename", 1, 50.0, now=100.0)
+    budget.penalize("rename", 1, 10.0, now=100.0)
+    assert budget.next_allowed("rename", 1, now=100.0) == 150.0
+    assert budget.next_allowed("rename", 1, now=200.0) == 200.0
+
+def test_plan_prefers_main_then_helper():
+    main = RateBudget(LIMITS, "Main")
+    helper = RateBudget(LIMITS, "Helper")
+    now = time.time()
+    assert main.plan("rename", 1, helper)[0] == "main"
+
+    main.record("rename", 1, now=now)
+    main.record("rename", 1, now=now)
+    assert main.plan("rename", 1, helper)[0] == "helper"
+    action, at = main.plan("rename", 1)
+    assert action == "defer"
+    assert at >= now + 600.0 - 1
+
+    helper.penalize("rename", 1, 60.0, now=now)
+    action, at = main.plan("rename", 1, helper)
+    # Beide gesperrt: warten bis zur frühesten Kapazität (hier der Helfer)
+    assert action == "defer"
+    assert now + 59 <= at <= now + 61
+
+def test_defer_runs_only_latest_change():
+    async def scenario():
+        budget = RateBudget(LIMITS, "Test")
+        applied = []
+
+        def change(name):
+            async def apply():
+                applied.append(name)
+            return apply
+
+        at = time.time() + 0.02
+        assert budget.defer("rename", 1, at, change("first")) is False
+        assert budget.defer("rename", 1, at, change("second")) is True
+        assert budget.has_deferred("rename", 1)
+        assert budget.pending_count() == 1
+        await asyncio.sleep(0.05)
+        assert applied == ["second"]
+        assert not budget.has_deferred("rename", 1)
+
+        # Neue Änderung nach dem Ablauf startet einen neuen Timer
+        assert budget.defer("rename", 1, time.time(), change("third")) is False
+        await asyncio.sleep(0.01)
+        assert applied == ["second", "third"]
+
+    asyncio.run(scenario())
+
+def test_cancel_deferred():
+    async def scenario():
+        budget = RateBudget(LIMITS, "Test")
+        applied = []
+
+        async def apply():
+            applied.append(True)
+
+        budget.defer("rename", 1, time.time() + 0.01, apply)
+        budget.cancel_deferred("rename", 1)
+        await asyncio.sleep(0.03)
+        assert applied == []
+        assert budget.pending_count() == 0
+
+    asyncio.run(scenario())
+
+def test_failing_deferred_change_is_logged():
+    async def scenario():
+        budget = RateBudget(LIMITS, "Test")
+
+        async def apply():
+            raise RuntimeError("kaputt")
+
+        budget.defer("rename", 1, time.time(), apply)
+        await asyncio.sleep(0.01)
+        assert budget.pending_count() == 0
+
+    asyncio.run(scenario())
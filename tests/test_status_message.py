@@ -0,0 +1,79 @@
+import asyncio
+
+import discord
+import pytest
+
+from tests.helpers import FakeChannel
+
+@pytest.fixture
+def channel(bot):
+    return FakeChannel(bot.user)
+
+@pytest.fixture
+def gifs(tmp_path):
+    paths = {}
+    for name in ("online.gif", "offline.gif"):
+        path = tmp_path / name
+        path.write_bytes(b"GIF89a")
+        paths[name] = str(path)
+    return paths
+
+def embed(gif_name: str) -> discord.Embed:
+    return discord.Embed(title="Bot Status Update").set_image(url=f"attachment://{gif_name}")
+
+def test_first_update_sends_and_stores_message(message_manager, channel, gifs):
+    message = asyncio.run(message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"]))
+    assert [sent.id for sent in channel.sent] == [message.id]
+    assert "file" in channel.sent[0].kwargs
+    assert message_manager.message_ids[str(channel.id)] == message.id
+
+def test_updates_edit_in_place_and_upload_only_changed_gif(message_manager, channel, gifs):
+    async def scenario():
+        message = await message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"])
+
+        # Gleiches Bild: ein PATCH ohne Anhänge, der vorhandene Anhang bleibt bestehen
+        await message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"])
+        # Anderes Bild: wird einmal hochgeladen
+        await message_manager.update_status_message(channel, embed("offline.gif"), gifs["offline.gif"])
+        await message_manager.update_status_message(channel, embed("offline.gif"), gifs["offline.gif"])
+
+        assert len(channel.sent) == 1
+        assert [message_id for message_id, _ in channel.edits] == [message.id] * 3
+        same, changed, same_again = (kwargs for _, kwargs in channel.edits)
+        assert "attachments" not in same
+        assert [file.filename for file in changed["attachments"]] == ["offline.gif"]
+        assert "attachments" not in same_again
+        assert channel.deleted == []
+
+    asyncio.run(scenario())
+
+def test_deleted_message_falls_back_to_purge_and_resend(message_manager, channel, gifs):
+    async def scenario():
+        old = await message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"])
+        channel.missing.add(old.id)
+
+        new = await message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"])
+        assert new.id != old.id
+        # Nach dem Neusenden hängt das GIF wieder an der neuen Nachricht
+        assert "file" in channel.sent[-1].kwargs
+        assert old.id in channel.deleted
+        assert message_manager.message_ids[str(channel.id)] == new.id
+        assert message_manager.posted_ids[str(channel.id)] == [new.id]
+
+    asyncio.run(scenario())
+
+def test_asset_url_replaces_attachment(message_manager, channel, gifs, monkeypatch):
+    async def asset_url(path):
+        return "https://cdn.example/online.gif"
+
+    async def scenario():
+        await message_manager.update_status_message(channel, embed("online.gif"), gifs["online.gif"])
+        monkeypatch.setattr(message_manager.assets, "get_url", asset_url)
+        status_embed = embed("online.gif")
+        await message_manager.update_status_message(channel, status_embed, gifs["online.gif"])
+
+        _, kwargs = channel.edits[-1]
+        assert kwargs["attachments"] == []
+        assert status_embed.image.url == "https://cdn.example/online.gif"
+
+    asyncio.run(scenario())
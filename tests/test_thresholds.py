@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from bot_status import BotStatus
+from config.constants import BotConstants
+from core.channel_manager import ChannelManager
+from tests.helpers import applied_statuses
+from utils.interarrival_stats import InterArrivalStats
+
+DEFAULTS = (BotConstants.INACTIVITY_THRESHOLD, BotConstants.ACTIVITY_CHECK_THRESHOLD)
+
+def test_set_and_reset_thresholds(status_bot):
+    channels = status_bot.channel_manager
+    assert channels.get_thresholds(10) == DEFAULTS
+    assert channels.set_channel_thresholds("1", "10", inactivity=60) == (60, DEFAULTS[1])
+    assert channels.set_channel_thresholds("1", "10", recovery=30) == (60, 30)
+    assert channels.get_inactivity_override(10) == 60
+
+    # 0 setzt einen Wert auf den Standard zurück, None lässt ihn unverändert
+    assert channels.set_channel_thresholds("1", "10", inactivity=0) == (DEFAULTS[0], 30)
+    assert channels.get_inactivity_override(10) is None
+    assert channels.set_channel_thresholds("1", "10", recovery=0) == DEFAULTS
+    assert not channels.has_custom_thresholds("1", "10")
+    assert channels.channel_thresholds == {}
+
+def test_thresholds_survive_reload_and_pair_removal(status_bot):
+    status_bot.channel_manager.set_channel_thresholds("1", "10", inactivity=60, recovery=30)
+
+    reloaded = ChannelManager(status_bot)
+    reloaded.load_data()
+    assert reloaded.get_thresholds(10) == (60, 30)
+
+    reloaded.remove_channel_pair("1", "10")
+    assert reloaded.get_thresholds(10) == DEFAULTS
+    assert status_bot.data_manager.load_json("channel_thresholds.json") == {}
+
+def test_effective_inactivity_threshold_precedence(status_bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "LEARNED_THRESHOLD_MIN_SAMPLES", 5)
+    monkeypatch.setattr(BotConstants, "LEARNED_THRESHOLD_MIN", 1)
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    assert manager.get_inactivity_threshold(10) == DEFAULTS[0]
+
+    # Gelernte Schwelle, sobald genug Abstände vorliegen
+    state.arrivals = InterArrivalStats(0.9, 0.5)
+    for _ in range(5):
+        state.arrivals.add(20.0)
+    assert manager.get_inactivity_threshold(10) == BotConstants.LEARNED_THRESHOLD_FACTOR * 20.0
+
+    # Eigene Schwelle hat Vorrang
+    status_bot.channel_manager.set_channel_thresholds("1", "10", inactivity=300)
+    assert manager.get_inactivity_threshold(10) == 300
+
+def test_custom_inactivity_threshold_triggers_problem(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+    state.last_message_time = time.time() - 100
+
+    # Globale Schwelle: noch nicht inaktiv, die Frist bleibt bestehen
+    deadline = asyncio.run(manager._on_deadline(10))
+    assert deadline == state.last_message_time + DEFAULTS[0]
+    assert applied_statuses(status_bot) == []
+
+    status_bot.channel_manager.set_channel_thresholds("1", "10", inactivity=60)
+    asyncio.run(manager._on_deadline(10))
+    assert applied_statuses(status_bot) == [BotStatus.PROBLEM]
+    assert state.status == BotStatus.PROBLEM
+
+def test_custom_recovery_threshold_restores_online(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.PROBLEM
+    now = time.time()
+    state.activity_start = now - 50
+    state.last_message_time = now - 1
+
+    asyncio.run(manager._on_deadline(10))
+    assert applied_statuses(status_bot) == []
+
+    status_bot.channel_manager.set_channel_thresholds("1", "10", recovery=30)
+    asyncio.run(manager._on_deadline(10))
+    assert applied_statuses(status_bot) == [BotStatus.ONLINE]
+
+def test_excluded_channel_gets_no_deadline(status_bot):
+    manager = status_bot.status_manager
+    state = manager.get_state(10)
+    state.status = BotStatus.ONLINE
+    state.last_message_time = time.time() - 10_000
+    status_bot.channel_manager.excluded_channels.add("10")
+    assert asyncio.run(manager._on_deadline(10)) is None
+    assert applied_statuses(status_bot) == []
@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+
+from config.constants import BotConstants
+from core.webhook_transport import WebhookTransport
+from tests.helpers import FakeChannel, http_error
+
+def make_webhook(webhook_id: int, name: str = BotConstants.WEBHOOK_NAME, token="token"):
+    webhook = SimpleNamespace(id=webhook_id, name=name, token=token)
+    webhook.send = AsyncMock(return_value=SimpleNamespace(id=500, webhook_id=webhook_id))
+    webhook.edit_message = AsyncMock(return_value=SimpleNamespace(id=500, webhook_id=webhook_id))
+    return webhook
+
+class WebhookChannel(FakeChannel):
+    """FakeChannel mit Webhook-Verwaltung; create_error simuliert fehlende Berechtigung o.ä."""
+
+    def __init__(self, author):
+        super().__init__(author)
+        self.existing = []
+        self.lookups = 0
+        self.create_error = None
+
+    async def webhooks(self):
+        self.lookups += 1
+        return list(self.existing)
+
+    async def create_webhook(self, name, reason=None):
+        if self.create_error:
+            raise self.create_error
+        webhook = make_webhook(900 + len(self.existing), name=name)
+        self.existing.append(webhook)
+        return webhook
+
+@pytest.fixture
+def transport(bot, monkeypatch):
+    monkeypatch.setattr(BotConstants, "USE_WEBHOOKS", True)
+    bot.user.display_avatar = SimpleNamespace(url="https://cdn.discordapp.com/avatar.png")
+    return WebhookTransport(bot)
+
+@pytest.fixture
+def channel(bot):
+    return WebhookChannel(bot.user)
+
+def test_disabled_transport_sends_directly(transport, channel, monkeypatch):
+    monkeypatch.setattr(BotConstants, "USE_WEBHOOKS", False)
+    asyncio.run(transport.send(channel, content="hallo"))
+    assert [message.kwargs for message in channel.sent] == [{"content": "hallo"}]
+    assert channel.lookups == 0
+
+def test_existing_bot_webhook_is_reused(transport, channel):
+    foreign = make_webhook(1, name="Fremder Webhook")
+    tokenless = make_webhook(2, token=None)
+    own = make_webhook(3)
+    channel.existing = [foreign, tokenless, own]
+
+    async def scenario():
+        await transport.send(channel, content="eins")
+        await transport.send(channel, content="zwei")
+
+    asyncio.run(scenario())
+    assert own.send.await_count == 2
+    assert own.send.await_args.kwargs["username"] == "StatusBot"
+    assert foreign.send.await_count == tokenless.send.await_count == 0
+    assert channel.lookups == 1 and channel.sent == []
+
+def test_missing_webhook_is_created(transport, channel):
+    message = asyncio.run(transport.send(channel, content="hallo"))
+    [created] = channel.existing
+    assert created.name == BotConstants.WEBHOOK_NAME
+    assert message.webhook_id == created.id
+    assert transport.owns(SimpleNamespace(channel=channel, webhook_id=created.id))
+    assert not transport.owns(SimpleNamespace(channel=channel, webhook_id=None))
+
+def test_forbidden_is_remembered(transport, channel):
+    channel.create_error = http_error(discord.Forbidden, 403, 50013)
+
+    async def scenario():
+        await transport.send(channel, content="eins")
+        await transport.send(channel, content="zwei")
+
+    asyncio.run(scenario())
+    assert len(channel.sent) == 2
+    assert channel.lookups == 1
+
+def test_transient_error_is_retried(transport, channel):
+    channel.create_error = http_error(status=500)
+    asyncio.run(transport.send(channel, content="eins"))
+    channel.create_error = None
+    asyncio.run(transport.send(channel, content="zwei"))
+    assert [message.kwargs["content"] for message in channel.sent] == ["eins"]
+    assert channel.lookups == 2 and len(channel.existing) == 1
+
+def test_deleted_webhook_falls_back_and_is_recreated(transport, channel):
+    webhook = make_webhook(3)
+    webhook.send.side_effect = http_error(discord.NotFound, 404, 10015)
+    channel.existing = [webhook]
+
+    asyncio.run(transport.send(channel, content="eins"))
+    assert [message.kwargs["content"] for message in channel.sent] == ["eins"]
+
+    channel.existing = []
+    asyncio.run(transport.send(channel, content="zwei"))
+    assert channel.lookups == 2
+    assert channel.existing[0].send.await_count == 1
+
+def test_edit_of_own_message_falls_back_without_forgetting(transport, channel):
+    webhook = make_webhook(3)
+    webhook.edit_message.side_effect = http_error(discord.NotFound, 404, 10008)
+    channel.existing = [webhook]
+
+    asyncio.run(transport.edit(channel, 77, content="neu"))
+    assert channel.edits == [(77, {"content": "neu"})]
+    # Der Webhook selbst existiert noch und bleibt gemerkt
+    assert transport.owns(SimpleNamespace(channel=channel, webhook_id=3))
+
+def test_edit_with_deleted_webhook_forgets_it(transport, channel):
+    webhook = make_webhook(3)
+    webhook.edit_message.side_effect = http_error(discord.NotFound, 404, 10015)
+    channel.existing = [webhook]
+
+    asyncio.run(transport.edit(channel, 77, content="neu"))
+    assert channel.edits == [(77, {"content": "neu"})]
+    assert not transport.owns(SimpleNamespace(channel=channel, webhook_id=3))
+
+def test_edit_of_deleted_message_raises(transport, channel, monkeypatch):
+    monkeypatch.setattr(BotConstants, "USE_WEBHOOKS", False)
+    channel.missing.add(77)
+    with pytest.raises(discord.NotFound):
+        asyncio.run(transport.edit(channel, 77, content="neu"))
@@ -0,0 +1,112 @@
+from bisect import bisect_right, insort
+from typing import List, Optional
+
+class P2Quantile:
+    """
+    Streaming-Schätzer für ein Quantil nach dem P²-Verfahren (Jain & Chlamtac, 1985).
+
+    Hält unabhängig von der Anzahl der Werte nur fünf Marker (Höhen und Positionen),
+    die bei jedem neuen Wert per parabolischer Interpolation nachgeführt werden.
+    """
+
+    __slots__ = ('quantile', 'heights', 'positions', 'desired', 'increments', 'count')
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5.0]
+        self.increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+        self.count = 0
+
+    def add(self, value: float):
+        """Nimmt einen Wert auf"""
+        self.count += 1
+        heights = self.heights
+        if len(heights) < 5:
+            insort(heights, value)
+            return
+
+        # Zelle bestimmen, in die der Wert fällt; Randmarker bei Bedarf verschieben
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect_right(heights, value) - 1
+
+        positions = self.positions
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            self.desired[index] += self.increments[index]
+
+        # Mittlere Marker nachführen, wenn sie mehr als eine Position vom Soll abweichen
+        for index in (1, 2, 3):
+            offset = self.desired[index] - positions[index]
+            if ((offset >= 1 and positions[index + 1] - positions[index] > 1) or
+                    (offset <= -1 and positions[index - 1] - positions[index] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = self._linear(index, step)
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (positions[index] - positions[index - 1] + step) * (heights[index + 1] - heights[index])
+            / (positions[index + 1] - positions[index])
+            + (positions[index + 1] - positions[index] - step) * (heights[index] - heights[index - 1])
+            / (positions[index] - positions[index - 1])
+        )
+
+    def _linear(self, index: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        return heights[index] + step * (heights[index + step] - heights[index]) / (positions[index + step] - positions[index])
+
+    def value(self) -> Optional[float]:
+        """Gibt die aktuelle Schätzung zurück (None ohne Werte)"""
+        if not self.heights:
+            return None
+        if self.count < 5:
+            # Bis zur Initialisierung der Marker direkt aus den sortierten Werten
+            return self.heights[min(len(self.heights) - 1, int(self.quantile * len(self.heights)))]
+        return self.heights[2]
+
+class InterArrivalStats:
+    """
+    Zusammenfassung der Abstände zwischen Log-Nachrichten eines Channels.
+
+    Kombiniert einen exponentiell gleitenden Mittelwert (reagiert schnell auf einen
+    langsameren Takt) mit einem P²-Quantil (bildet seltene, aber normale Pausen ab).
+    Der Speicherbedarf ist konstant.
+    """
+
+    __slots__ = ('alpha', 'ewma', 'sketch')
+
+    def __init__(self, quantile: float, alpha: float):
+        self.alpha = alpha
+        self.ewma = 0.0
+        self.sketch = P2Quantile(quantile)
+
+    @property
+    def count(self) -> int:
+        return self.sketch.count
+
+    def add(self, gap: float):
+        """Nimmt den Abstand zur vorherigen Nachricht auf (Sekunden)"""
+        self.ewma = gap if not self.sketch.count else self.ewma + self.alpha * (gap - self.ewma)
+        self.sketch.add(gap)
+
+    def threshold(self, factor: float, min_samples: int, lower: float, upper: float) -> Optional[float]:
+        """
+        Gelernte Inaktivitätsschwelle: Vielfaches des größeren Werts aus Quantil und Mittelwert,
+        begrenzt auf [lower, upper]. None, solange weniger als min_samples Abstände vorliegen.
+        """
+        if self.sketch.count < min_samples:
+            return None
+        return min(upper, max(lower, factor * max(self.sketch.value(), self.ewma)))
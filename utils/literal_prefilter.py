@@ -0,0 +1,153 @@
+import re
+import bisect
+import logging
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger('StatusBot')
+
+# Kürzere Literale filtern kaum etwas heraus, solche Muster werden immer geprüft
+MIN_LITERAL_LENGTH = 2
+
+# Trennzeichen für die Stapelsuche; kommt in Literalen nicht vor
+_LINE_SEPARATOR = "\x00"
+
+def extract_literal(pattern: str) -> Optional[str]:
+    """
+    Ermittelt das längste Literal, das in jedem Treffer des Musters vorkommen muss.
+
+    Returns:
+        Optional[str]: Das Literal oder None, wenn kein verwertbares Literal existiert
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+
+    best = ""
+    current = []
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        # Wortgrenzen (\b) und Anker verbrauchen keine Zeichen und unterbrechen das Literal nicht
+        if op is sre_parse.AT:
+            continue
+        if len(current) > len(best):
+            best = ''.join(current)
+        current = []
+    if len(current) > len(best):
+        best = ''.join(current)
+
+    return best if len(best) >= MIN_LITERAL_LENGTH else None
+
+class LiteralPrefilter:
+    """
+    Vorfilter für Statusmuster: findet in einem Durchlauf alle Muster, deren
+    Pflicht-Literal in der Nachricht vorkommt.
+
+    Nutzt einen Aho-Corasick-Automaten (pyahocorasick), falls installiert. Ohne das
+    Paket wird eine kompilierte Literal-Alternation verwendet, die ebenfalls in C läuft;
+    ein Automat in reinem Python wäre langsamer als die Regex-Auswertung selbst.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        Args:
+            patterns: Bereits in Kleinbuchstaben umgewandelte Muster in Prioritätsreihenfolge
+        """
+        self._literal_indices: Dict[str, List[int]] = {}
+        always = []
+        for index, pattern in enumerate(patterns):
+            literal = extract_literal(pattern)
+            if literal is None:
+                always.append(index)
+            else:
+                self._literal_indices.setdefault(literal, []).append(index)
+
+        # Muster ohne Literal müssen bei jeder Nachricht ausgewertet werden
+        self.always: FrozenSet[int] = frozenset(always)
+        self._automaton = None
+        self._literal_regex = None
+
+        if not self._literal_indices:
+            return
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for literal, indices in self._literal_indices.items():
+                self._automaton.add_word(literal, tuple(indices))
+            self._automaton.make_automaton()
+        else:
+            literals = sorted(self._literal_indices, key=len, reverse=True)
+            self._literal_regex = re.compile('|'.join(map(re.escape, literals)))
+
+    @property
+    def backend(self) -> str:
+        """Name des verwendeten Verfahrens (für Logs und Benchmarks)"""
+        if self._automaton is not None:
+            return "aho-corasick"
+        if self._literal_regex is not None:
+            return "regex"
+        return "none"
+
+    def candidates(self, text: str) -> FrozenSet[int]:
+        """Gibt die Indizes aller Muster zurück, die für den (kleingeschriebenen) Text in Frage kommen"""
+        if self._automaton is not None:
+            found = None
+            for _, indices in self._automaton.iter(text):
+                if found is None:
+                    found = set(self.always)
+                found.update(indices)
+            return frozenset(found) if found is not None else self.always
+
+        if self._literal_regex is not None and self._literal_regex.search(text):
+            found = set(self.always)
+            for literal, indices in self._literal_indices.items():
+                if literal in text:
+                    found.update(indices)
+            return frozenset(found)
+
+        return self.always
+
+    def matching_lines(self, texts: Sequence[str]) -> Optional[Set[int]]:
+        """
+        Stapelsuche: findet in einem Durchlauf über alle (kleingeschriebenen) Texte
+        diejenigen, die mindestens ein Literal enthalten.
+
+        Returns:
+            Optional[Set[int]]: Indizes der Kandidaten-Texte, None wenn jeder Text geprüft
+            werden muss (es gibt Muster ohne Literal)
+        """
+        if self.always:
+            return None
+        if not texts:
+            return set()
+
+        joined = _LINE_SEPARATOR.join(texts)
+        if self._automaton is not None:
+            # iter() liefert die Endposition des Treffers
+            positions = [end for end, _ in self._automaton.iter(joined)]
+        elif self._literal_regex is not None:
+            positions = [match.start() for match in self._literal_regex.finditer(joined)]
+        else:
+            return set()
+        if not positions:
+            return set()
+
+        # Trefferpositionen im Gesamttext den einzelnen Texten zuordnen
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        return {bisect.bisect_right(starts, position) - 1 for position in positions}
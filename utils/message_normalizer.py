@@ -0,0 +1,80 @@
+import re
+import logging
+
+logger = logging.getLogger('StatusBot')
+
+# Alle Ausdrücke beginnen mit einem festen Zeichen, damit die Regex-Engine nur an
+# diesen Stellen ansetzt; zusätzlich läuft jeder Schritt nur, wenn das Zeichen vorkommt.
+
+# ANSI-Farbcodes (z.B. aus ```ansi-Blöcken oder weitergeleiteten Konsolen-Logs)
+_ANSI = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+# Code-Block-Zäune; eine Sprachangabe zählt nur, wenn danach ein Zeilenumbruch folgt
+_FENCE = re.compile(r'```(?:[\w+-]*\n)?')
+# Datum mit Uhrzeit ab dem ersten Bindestrich, die Jahreszahl davor wird separat entfernt
+_ISO_TIMESTAMP = re.compile(r'-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?')
+# Uhrzeit in eckigen Klammern, z.B. [12:00:00]
+_BRACKET_TIME = re.compile(r'\[\d{1,2}:\d\d(?::\d\d(?:[.,]\d+)?)?\]')
+# Discord-Zeitstempel, z.B. <t:1717243200:R>
+_DISCORD_TIMESTAMP = re.compile(r'<t:\d+(?::[a-zA-Z])?>')
+# Zitat-Präfixe ab der zweiten Zeile (die erste Zeile wird per lstrip behandelt)
+_QUOTE = re.compile(r'\n>+ ?')
+# Markdown-Hervorhebungen
+_MARKDOWN_MARKERS = ('**', '__', '~~', '||')
+
+def _strip_iso_timestamps(text: str) -> str:
+    """Entfernt Zeitstempel wie 2024-06-01 12:00:00.123 samt Jahreszahl"""
+    parts = []
+    last = 0
+    for match in _ISO_TIMESTAMP.finditer(text):
+        start = match.start()
+        if start >= 4 and text[start - 4:start].isdigit():
+            start -= 4
+        parts.append(text[last:start])
+        parts.append(' ')
+        last = match.end()
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+class MessageNormalizer:
+    """
+    Bereitet Log-Nachrichten einmalig für die Mustererkennung auf.
+
+    Entfernt Formatierung, die für die Statuserkennung keine Rolle spielt (ANSI-Codes,
+    Code-Block-Zäune, Zeitstempel, Markdown), fasst Leerraum zusammen, wandelt in
+    Kleinbuchstaben um und kürzt auf eine Maximallänge. Das Ergebnis kann direkt an
+    StatusPatterns.match(..., normalized=True) übergeben werden.
+    """
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+
+    def normalize(self, content: str) -> str:
+        """Gibt den normalisierten Text einer Nachricht zurück"""
+        if not content:
+            return ""
+
+        text = content
+        if '\x1b' in text:
+            text = _ANSI.sub('', text)
+        if '`' in text:
+            text = _FENCE.sub(' ', text).replace('`', '')
+        if ':' in text:
+            if '-' in text:
+                text = _strip_iso_timestamps(text)
+            if '[' in text:
+                text = _BRACKET_TIME.sub(' ', text)
+            if '<t:' in text:
+                text = _DISCORD_TIMESTAMP.sub(' ', text)
+        if '>' in text:
+            text = _QUOTE.sub('\n', text).lstrip('> ')
+        for marker in _MARKDOWN_MARKERS:
+            if marker in text:
+                text = text.replace(marker, '')
+
+        # Leerraum zusammenfassen; split() ohne Argument entfernt auch Ränder
+        text = ' '.join(text.split())
+        # Gleiche Umwandlung wie bei den Mustern selbst (str.lower, nicht casefold),
+        # sonst würden Muster mit Sonderzeichen wie ß nicht mehr treffen
+        return text[:self.max_length].lower()
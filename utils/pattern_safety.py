@@ -0,0 +1,176 @@
+import re
+import time
+import asyncio
+import logging
+import multiprocessing
+from typing import List, Optional
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger('StatusBot')
+
+_REPEAT_OPS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+def fold_pattern(pattern: str) -> str:
+    """Wandelt ein Muster in Kleinbuchstaben um, ohne Escape-Sequenzen wie \\B oder \\S zu verändern"""
+    folded = []
+    escaped = False
+    for char in pattern:
+        folded.append(char if escaped else char.lower())
+        escaped = not escaped and char == '\\'
+    return ''.join(folded)
+
+def _is_variable(op, value) -> bool:
+    """Prüft, ob ein Wiederholungsoperator eine variable Anzahl an Durchläufen erlaubt"""
+    return op in _REPEAT_OPS and value[0] != value[1]
+
+def _children(op, value) -> List:
+    """Gibt die Unterausdrücke eines geparsten Knotens zurück"""
+    if op in _REPEAT_OPS:
+        return [value[2]]
+    if op is sre_parse.SUBPATTERN:
+        return [value[-1]]
+    if op is sre_parse.BRANCH:
+        return list(value[1])
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [value[1]]
+    return []
+
+def _contains_variable_repeat(parsed) -> bool:
+    for op, value in parsed:
+        if _is_variable(op, value):
+            return True
+        if any(_contains_variable_repeat(child) for child in _children(op, value)):
+            return True
+    return False
+
+def _first_chars(parsed) -> Optional[set]:
+    """Mögliche erste Zeichen eines Ausdrucks, None wenn beliebig (Zeichenklasse, Punkt, ...)"""
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            return {value}
+        if op is sre_parse.AT:
+            continue
+        if op is sre_parse.SUBPATTERN:
+            return _first_chars(value[-1])
+        return None
+    return set()
+
+def _has_ambiguous_branch(parsed) -> bool:
+    """Prüft, ob sich Alternativen einer Verzweigung im ersten Zeichen überschneiden können"""
+    for op, value in parsed:
+        if op is sre_parse.SUBPATTERN:
+            return _has_ambiguous_branch(value[-1])
+        if op is sre_parse.BRANCH:
+            seen = set()
+            for branch in value[1]:
+                chars = _first_chars(branch)
+                if chars is None or chars & seen:
+                    return True
+                seen |= chars
+        return False
+    return False
+
+def _find_problem(parsed) -> Optional[str]:
+    for op, value in parsed:
+        if op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+            return "Rückverweise auf Gruppen sind nicht erlaubt"
+        if _is_variable(op, value):
+            body = value[2]
+            if _contains_variable_repeat(body):
+                return "Verschachtelte Wiederholungen (z.B. (a+)+) sind nicht erlaubt"
+            if _has_ambiguous_branch(body):
+                return "Wiederholte Alternativen mit gleichem Anfang (z.B. (a|ab)+) sind nicht erlaubt"
+        for child in _children(op, value):
+            problem = _find_problem(child)
+            if problem:
+                return problem
+    return None
+
+def check_pattern(pattern: str, max_length: int) -> Optional[str]:
+    """
+    Statische Prüfung eines Musters auf Konstrukte mit katastrophalem Backtracking.
+
+    Returns:
+        Optional[str]: Fehlerbeschreibung oder None, wenn das Muster zulässig ist
+    """
+    if not pattern:
+        return "Leeres Muster"
+    if len(pattern) > max_length:
+        return f"Muster ist zu lang (maximal {max_length} Zeichen)"
+
+    try:
+        # Geprüft wird genau das Muster, das später kompiliert wird
+        parsed = sre_parse.parse(fold_pattern(pattern))
+    except re.error as e:
+        return f"Ungültiger regulärer Ausdruck: {e}"
+
+    return _find_problem(parsed)
+
+def build_worst_case_corpus(pattern: str, length: int) -> List[str]:
+    """Erzeugt Eingaben, die Backtracking im Muster möglichst stark auslösen"""
+    pattern = fold_pattern(pattern)
+    chars = {char for char in pattern if char.isalnum() or char in " _-.:"} | {"a", " ", "0"}
+    # Lange Wiederholungen einzelner Zeichen bzw. Wortfragmente, die am Ende scheitern
+    corpus = [char * length + "!" for char in sorted(chars)]
+    for fragment in set(re.findall(r"[a-z0-9 ]{2,}", pattern)):
+        corpus.append(fragment * (length // len(fragment)) + "!")
+    return corpus
+
+def _benchmark_worker(pattern: str, length: int, results):
+    """Läuft in einem eigenen Prozess: misst die Auswertungszeit auf dem Worst-Case-Korpus"""
+    compiled = re.compile(fold_pattern(pattern))
+    corpus = build_worst_case_corpus(pattern, length)
+    start = time.perf_counter()
+    for text in corpus:
+        compiled.search(text)
+    results.put(time.perf_counter() - start)
+
+def benchmark_pattern(pattern: str, length: int, budget: float, hard_timeout: float) -> Optional[str]:
+    """
+    Misst ein Muster in einem separaten Prozess, der bei Überschreitung beendet wird.
+    Die Regex-Engine gibt den GIL nicht frei, daher reicht ein Thread nicht aus.
+
+    Returns:
+        Optional[str]: Fehlerbeschreibung oder None, wenn das Muster im Budget bleibt
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_benchmark_worker, args=(pattern, length, results), daemon=True)
+    process.start()
+    process.join(hard_timeout)
+
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return f"Auswertung dauerte länger als {hard_timeout:.0f}s und wurde abgebrochen"
+
+    try:
+        duration = results.get(timeout=1)
+    except Exception:
+        return "Benchmark des Musters ist fehlgeschlagen"
+
+    if duration > budget:
+        return f"Auswertung zu langsam ({duration * 1000:.0f} ms, Budget {budget * 1000:.0f} ms)"
+    return None
+
+async def admit_pattern(pattern: str, max_length: int, input_length: int, budget: float, hard_timeout: float) -> Optional[str]:
+    """
+    Prüft ein neues Muster statisch und per Worst-Case-Benchmark, ohne den Event-Loop zu blockieren.
+
+    Returns:
+        Optional[str]: Ablehnungsgrund oder None, wenn das Muster zugelassen wird
+    """
+    problem = check_pattern(pattern, max_length)
+    if problem:
+        logger.warning(f"Muster '{pattern}' abgelehnt: {problem}")
+        return problem
+
+    loop = asyncio.get_running_loop()
+    problem = await loop.run_in_executor(None, benchmark_pattern, pattern, input_length, budget, hard_timeout)
+    if problem:
+        logger.warning(f"Muster '{pattern}' abgelehnt: {problem}")
+    return problem
@@ -0,0 +1,64 @@
+from typing import Dict, List, Tuple
+from bot_status import BotStatus
+
+class PatternStats:
+    """
+    Trefferzähler und Auswertungskosten pro Statusmuster.
+
+    Treffer werden bei jeder Klassifizierung gezählt (auch aus dem Zeilen-Cache),
+    die Kosten nur, wenn die Muster tatsächlich ausgewertet wurden.
+    """
+
+    def __init__(self):
+        # Schlüssel: "<status>:<muster>" -> [Treffer, Auswertungen, Sekunden]
+        self.entries: Dict[str, List[float]] = {}
+        self.dirty = False
+
+    @staticmethod
+    def key(status: BotStatus, pattern: str) -> str:
+        return f"{status.value}:{pattern}"
+
+    def _entry(self, status: BotStatus, pattern: str) -> List[float]:
+        key = self.key(status, pattern)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, 0, 0.0]
+        return entry
+
+    def record_hit(self, status: BotStatus, pattern: str):
+        """Zählt einen Treffer für ein Muster"""
+        self._entry(status, pattern)[0] += 1
+        self.dirty = True
+
+    def record_cost(self, status: BotStatus, pattern: str, seconds: float):
+        """Erfasst die Dauer einer Auswertung, die mit diesem Muster endete"""
+        entry = self._entry(status, pattern)
+        entry[1] += 1
+        entry[2] += seconds
+        self.dirty = True
+
+    def hits(self, status: BotStatus, pattern: str) -> int:
+        entry = self.entries.get(self.key(status, pattern))
+        return int(entry[0]) if entry else 0
+
+    def top(self, limit: int = 20) -> List[Tuple[str, int, float]]:
+        """Gibt (Schlüssel, Treffer, mittlere Kosten in Sekunden) der häufigsten Muster zurück"""
+        ranked = sorted(self.entries.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            (key, int(hits), seconds / evaluations if evaluations else 0.0)
+            for key, (hits, evaluations, seconds) in ranked[:limit]
+        ]
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            key: {"hits": int(hits), "evaluations": int(evaluations), "seconds": seconds}
+            for key, (hits, evaluations, seconds) in self.entries.items()
+        }
+
+    def load(self, data: Dict[str, Dict[str, float]]):
+        """Übernimmt gespeicherte Statistiken"""
+        self.entries = {
+            key: [int(values.get("hits", 0)), int(values.get("evaluations", 0)), float(values.get("seconds", 0.0))]
+            for key, values in data.items()
+        }
+        self.dirty = False
@@ -1,8 +1,16 @@
 import re
-from typing import List, Optional
+import functools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import ClassVar, Dict, Hashable, Iterable, List, Optional, Pattern, Tuple
 from dataclasses import dataclass, field
 import logging
 from bot_status import BotStatus
+from config.constants import BotConstants
+from utils.literal_prefilter import LiteralPrefilter
+from utils.pattern_safety import fold_pattern
+from utils.pattern_stats import PatternStats
 
 logger = logging.getLogger('StatusBot')
 
@@ -38,6 +46,24 @@ class StatusPatterns:
         r'Critical error',
     ])
 
+    # Anzahl zwischengespeicherter Klassifizierungen identischer Log-Zeilen
+    line_cache_size: int = BotConstants.PATTERN_LINE_CACHE_SIZE
+
+    # Gemeinsame Trefferstatistik (wird vom PatternManager gesetzt)
+    stats: Optional[PatternStats] = field(default=None, compare=False, repr=False)
+
+    # Reihenfolge der Kategorien entspricht ihrer Priorität
+    _CATEGORIES: ClassVar[Tuple[Tuple[str, BotStatus], ...]] = (
+        ('offline', BotStatus.OFFLINE),
+        ('error', BotStatus.PROBLEM),
+        ('online', BotStatus.ONLINE),
+    )
+    _LABELS: ClassVar[Dict[BotStatus, str]] = {
+        BotStatus.OFFLINE: "Offline",
+        BotStatus.PROBLEM: "Fehler",
+        BotStatus.ONLINE: "Online",
+    }
+
     def get_status_emoji(self, status: BotStatus) -> str:
         """Gibt das entsprechende Emoji für einen Status zurück"""
         if status == BotStatus.ONLINE:
@@ -56,29 +82,225 @@ class StatusPatterns:
         # Entferne alle bekannten Status-Emojis und den Separator
         return re.sub(r'^[✅❌❗🟦]+︱', '', channel_name)
 
-    def check_patterns(self, content: str) -> Optional[BotStatus]:
-        """Verbesserte Mustererkennung mit detailliertem Logging"""
+    def __post_init__(self):
+        self.compile_patterns()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[str]]) -> "StatusPatterns":
+        """
+        Erstellt ein Musterset aus einer Konfiguration {"offline": [...], "error": [...], "online": [...]}.
+        Fehlende Kategorien übernehmen die eingebauten Standard-Muster.
+
+        Raises:
+            ValueError: Wenn eine Kategorie keine Liste von Zeichenketten ist
+            re.error: Wenn ein Muster kein gültiger regulärer Ausdruck ist
+        """
+        values = {}
+        for category, _ in cls._CATEGORIES:
+            if category not in data:
+                continue
+            patterns = data[category]
+            if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+                raise ValueError(f"Kategorie '{category}' muss eine Liste von Zeichenketten sein")
+            values[category] = list(patterns)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Gibt die Muster als Konfiguration zurück (Gegenstück zu from_dict)"""
+        return {category: list(getattr(self, category)) for category, _ in self._CATEGORIES}
+
+    def compile_patterns(self):
+        """Kompiliert alle Muster vor (muss nach Änderungen an den Listen aufgerufen werden)"""
+        self._regexes: Dict[Tuple[BotStatus, str], Pattern] = {}
+        for category, status in self._CATEGORIES:
+            for pattern in getattr(self, category):
+                self._regexes[(status, pattern)] = re.compile(fold_pattern(pattern))
+
+        self._compiled: List[Tuple[Pattern, BotStatus, str]] = []
+        self._apply_order(force=True)
+
+        # Bots wiederholen dieselben Zeilen ständig; gleiche Zeilen werden nur einmal
+        # ausgewertet. Der Cache gehört zu den kompilierten Mustern und wird mit ihnen ersetzt.
+        self._cached_match = functools.lru_cache(maxsize=self.line_cache_size)(self._match_text)
+
+    def _apply_order(self, force: bool = False) -> bool:
+        """Ordnet die Muster nach Priorität und innerhalb jeder Stufe nach Trefferhäufigkeit"""
+        ordered = []
+        for category, status in self._CATEGORIES:
+            patterns = getattr(self, category)
+            if self.stats is not None:
+                patterns = sorted(patterns, key=lambda pattern: -self.stats.hits(status, pattern))
+            ordered.extend((self._regexes[(status, pattern)], status, pattern) for pattern in patterns)
+
+        if not force and ordered == self._compiled:
+            return False
+
+        self._compiled = ordered
+        # Literal-Vorfilter: verwirft Nachrichten ohne Schlüsselwort in einem Durchlauf
+        self._prefilter = LiteralPrefilter([compiled.pattern for compiled, _, _ in self._compiled])
+        return True
+
+    def reorder_patterns(self) -> bool:
+        """
+        Sortiert die Muster innerhalb jeder Prioritätsstufe nach den gesammelten Treffern neu.
+
+        Returns:
+            bool: True wenn sich die Reihenfolge geändert hat
+        """
+        if self.stats is None:
+            return False
+        return self._apply_order()
+
+    def match(self, content: str, normalized: bool = False) -> Optional[Tuple[BotStatus, str]]:
+        """
+        Klassifiziert eine Nachricht und gibt (Status, Muster) zurück.
+
+        Mit normalized=True wird der Text unverändert übernommen (bereits vom
+        MessageNormalizer bereinigt und kleingeschrieben).
+        """
         if not content:
             return None
-            
-        content = content.lower()
-        logger.debug(f"Prüfe Muster für Nachricht: {content}")
-
-        # Prüfe Muster mit detaillierterem Logging
-        for pattern in self.offline:
-            if re.search(pattern.lower(), content, re.IGNORECASE):
-                logger.info(f"Offline-Muster '{pattern}' erkannt in Nachricht: {content[:100]}")
-                return BotStatus.OFFLINE
-
-        for pattern in self.error:
-            if re.search(pattern.lower(), content, re.IGNORECASE):
-                logger.info(f"Fehler-Muster '{pattern}' erkannt in Nachricht: {content[:100]}")
-                return BotStatus.PROBLEM
-
-        for pattern in self.online:
-            if re.search(pattern.lower(), content, re.IGNORECASE):
-                logger.info(f"Online-Muster '{pattern}' erkannt in Nachricht: {content[:100]}")
-                return BotStatus.ONLINE
-
-        logger.debug(f"Kein Muster gefunden für Nachricht: {content[:100]}")
+
+        result = self._cached_match(content if normalized else content.strip().lower())
+        if result is not None and self.stats is not None:
+            self.stats.record_hit(*result)
+        return result
+
+    def cache_info(self) -> Dict[str, int]:
+        """Gibt Treffer- und Fehlzugriffszähler des Zeilen-Caches zurück"""
+        info = self._cached_match.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    def _match_text(self, text: str) -> Optional[Tuple[BotStatus, str]]:
+        """Klassifiziert einen bereits normalisierten (kleingeschriebenen) Text"""
+        start = time.perf_counter()
+        candidates = self._prefilter.candidates(text)
+        if not candidates:
+            return None
+
+        # Nur Kandidaten auswerten; die Indizes sind nach Priorität sortiert,
+        # daher entscheidet der erste echte Treffer
+        for index in sorted(candidates):
+            compiled, status, pattern = self._compiled[index]
+            if compiled.search(text):
+                if self.stats is not None:
+                    self.stats.record_cost(status, pattern, time.perf_counter() - start)
+                return status, pattern
+        return None
+
+    def classify_many(
+        self,
+        messages: Iterable[Tuple[Hashable, str]],
+        chunk_size: int = BotConstants.PATTERN_BATCH_CHUNK_SIZE,
+        processes: Optional[int] = None
+    ) -> Dict[Hashable, BotStatus]:
+        """
+        Stapelklassifizierung für Backfill und das Nachspielen exportierter Logs.
+
+        Jede erkannte Nachricht setzt den Status neu, maßgeblich ist also der letzte Treffer
+        pro Channel. Die Zeilen werden daher von hinten in Blöcken durchsucht; der
+        Literal-Vorfilter läuft über den ganzen Block, und die Suche endet beim ersten Treffer.
+
+        Args:
+            messages: (Channel, Inhalt)-Paare in chronologischer Reihenfolge
+            chunk_size: Zeilen pro Block
+            processes: Worker-Prozesse für sehr große Eingaben (None = im aktuellen Prozess)
+
+        Returns:
+            Dict[Hashable, BotStatus]: Status pro Channel; Channels ohne Treffer fehlen
+        """
+        lines_by_channel: Dict[Hashable, List[str]] = {}
+        total = 0
+        for channel, content in messages:
+            if content:
+                lines_by_channel.setdefault(channel, []).append(content)
+                total += 1
+
+        if (processes and processes > 1 and len(lines_by_channel) > 1
+                and total >= BotConstants.PATTERN_BATCH_PROCESS_THRESHOLD):
+            return self._classify_many_parallel(lines_by_channel, chunk_size, processes)
+
+        results = {}
+        for channel, lines in lines_by_channel.items():
+            status = self._last_status(lines, chunk_size)
+            if status is not None:
+                results[channel] = status
+        return results
+
+    def _last_status(self, lines: List[str], chunk_size: int) -> Optional[BotStatus]:
+        """Gibt den Status des letzten Treffers in einer chronologischen Zeilenfolge zurück"""
+        seen: Dict[str, Optional[Tuple[BotStatus, str]]] = {}
+        for end in range(len(lines), 0, -chunk_size):
+            chunk = [line.strip().lower() for line in lines[max(0, end - chunk_size):end]]
+            candidates = self._prefilter.matching_lines(chunk)
+            if candidates is None:
+                indices = range(len(chunk) - 1, -1, -1)
+            else:
+                indices = sorted(candidates, reverse=True)
+
+            for index in indices:
+                text = chunk[index]
+                if text not in seen:
+                    seen[text] = self._match_text(text)
+                if seen[text] is not None:
+                    return seen[text][0]
         return None
+
+    def _classify_many_parallel(
+        self,
+        lines_by_channel: Dict[Hashable, List[str]],
+        chunk_size: int,
+        processes: int
+    ) -> Dict[Hashable, BotStatus]:
+        """Verteilt die Channels nach Zeilenzahl auf Worker-Prozesse"""
+        groups: List[Dict[Hashable, List[str]]] = [{} for _ in range(processes)]
+        sizes = [0] * processes
+        for channel, lines in sorted(lines_by_channel.items(), key=lambda item: -len(item[1])):
+            target = sizes.index(min(sizes))
+            groups[target][channel] = lines
+            sizes[target] += len(lines)
+
+        config = self.to_dict()
+        results: Dict[Hashable, BotStatus] = {}
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            futures = [
+                executor.submit(_classify_channels_in_worker, config, group, chunk_size)
+                for group in groups if group
+            ]
+            for future in futures:
+                results.update(future.result())
+        return results
+
+    def check_patterns(self, content: str, normalized: bool = False) -> Optional[BotStatus]:
+        """Mustererkennung mit Literal-Vorfilter (Priorität: Offline > Fehler > Online)"""
+        if not content:
+            return None
+
+        result = self.match(content, normalized)
+        if result is None:
+            logger.debug(f"Kein Muster gefunden für Nachricht: {content[:100]}")
+            return None
+
+        status, pattern = result
+        logger.debug(f"{self._LABELS[status]}-Muster '{pattern}' erkannt in Nachricht: {content[:100]}")
+        return status
+
+def _classify_channels_in_worker(
+    config: Dict[str, List[str]],
+    lines_by_channel: Dict[Hashable, List[str]],
+    chunk_size: int
+) -> Dict[Hashable, BotStatus]:
+    """Läuft im Worker-Prozess: Stapelklassifizierung für eine Gruppe von Channels"""
+    matcher = StatusPatterns.from_dict(config)
+    results = {}
+    for channel, lines in lines_by_channel.items():
+        status = matcher._last_status(lines, chunk_size)
+        if status is not None:
+            results[channel] = status
+    return results
@@ -0,0 +1,51 @@
+from typing import Dict, List, Tuple
+
+class TransitionStats:
+    """
+    Laufzeiten der Status-Übergänge.
+
+    Pro Übergang werden die Wandzeit der parallel ausgeführten Schritte und die Summe
+    der Einzeldauern erfasst; die Summe entspricht der Dauer bei serieller Ausführung.
+    """
+
+    OUTCOMES = ("ok", "timeout", "error")
+
+    def __init__(self):
+        self.transitions = 0
+        self.wall_seconds = 0.0
+        self.serial_seconds = 0.0
+        self.max_wall_seconds = 0.0
+        # Schritt -> [Ausführungen, Sekunden, Timeouts, Fehler]
+        self.effects: Dict[str, List[float]] = {}
+
+    def record_effect(self, name: str, seconds: float, outcome: str):
+        """Erfasst die Dauer und das Ergebnis eines einzelnen Schritts"""
+        entry = self.effects.get(name)
+        if entry is None:
+            entry = self.effects[name] = [0, 0.0, 0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        if outcome == "timeout":
+            entry[2] += 1
+        elif outcome == "error":
+            entry[3] += 1
+
+    def record_transition(self, wall_seconds: float, serial_seconds: float):
+        """Erfasst einen vollständigen Übergang"""
+        self.transitions += 1
+        self.wall_seconds += wall_seconds
+        self.serial_seconds += serial_seconds
+        self.max_wall_seconds = max(self.max_wall_seconds, wall_seconds)
+
+    def averages(self) -> Tuple[float, float]:
+        """Mittlere Wandzeit und mittlere serielle Summe pro Übergang (Sekunden)"""
+        if not self.transitions:
+            return 0.0, 0.0
+        return self.wall_seconds / self.transitions, self.serial_seconds / self.transitions
+
+    def effect_summary(self) -> List[Tuple[str, int, float, int, int]]:
+        """Gibt (Schritt, Ausführungen, mittlere Sekunden, Timeouts, Fehler) zurück"""
+        return [
+            (name, int(runs), seconds / runs if runs else 0.0, int(timeouts), int(errors))
+            for name, (runs, seconds, timeouts, errors) in self.effects.items()
+        ]